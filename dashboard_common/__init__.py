@@ -0,0 +1,12 @@
+"""
+Modules shared by the TEM IPA and Rockfish dashboards (and the portal)
+
+    metrics   - per-page and per-function timing, Prometheus export
+    profiling - on-demand cProfile/tracemalloc profile of one rerun
+    snapshot  - process-wide, read-only versioned data snapshots
+    display   - Arrow display tables cached per data version
+
+The package lives at the repository root; each app's package (tem_ipa,
+rockfish) puts the root on sys.path when it is imported, so the apps still
+run with `streamlit run src/app.py` from their own directory.
+"""
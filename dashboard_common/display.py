@@ -0,0 +1,72 @@
+"""
+Arrow display tables cached per data version
+
+`st.dataframe` converts a pandas frame to Arrow on every rerun, after the
+page has rebuilt the display-formatted frame (renamed columns, formatted
+numbers and dates). For tables that only change with the data, both steps
+are wasted whenever an unrelated widget changes.
+
+`table(snapshot, name, build, *filters)` runs `build()` once per
+(name, filters) and data version and keeps the result as a pyarrow Table,
+which `st.dataframe` accepts as is. The cache is a derived structure of the
+snapshot, so a new data version starts empty, and the portal's cache budget
+(or SnapshotStore.invalidate) can drop it like any other derived cache.
+Each version keeps at most DISPLAY_CACHE_ENTRIES tables, least recently used
+first out, so filters with many values (dates, ranges) cannot grow it
+without bound.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+
+DISPLAY_CACHE_ENTRIES = 64
+
+
+def to_arrow(df):
+    """Arrow table of a display frame (index dropped, like hide_index)"""
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+class DisplayCache:
+    """LRU of Arrow display tables for one data version"""
+
+    def __init__(self, max_entries=DISPLAY_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            table = self.tables.get(key)
+            if table is not None:
+                self.tables.move_to_end(key)
+                return table
+
+        # Built outside the lock: concurrent misses may build twice, but
+        # never block each other's hits
+        table = to_arrow(build())
+        with self._lock:
+            self.tables[key] = table
+            self.tables.move_to_end(key)
+            while len(self.tables) > self.max_entries:
+                self.tables.popitem(last=False)
+        return table
+
+
+def table(snapshot, name, build, *filters):
+    """
+    Display table for a data version, built and converted to Arrow once
+
+    Args:
+        snapshot: the data version the table is built from
+        name: table name, unique per page table
+        build: returns the display-formatted DataFrame
+        filters: widget values the table depends on (hashable)
+
+    Returns:
+        pyarrow.Table for st.dataframe
+    """
+    cache = snapshot.derive('display_tables', lambda snap: DisplayCache())
+    return cache.get((name, *filters), build)
@@ -0,0 +1,199 @@
+"""
+Lightweight timing instrumentation for the dashboards
+Latency histograms and call counts exported in Prometheus text format
+
+Enable by pointing DASHBOARD_METRICS_FILE at a writable path, e.g.
+    DASHBOARD_METRICS_FILE=/tmp/tem_ipa.prom streamlit run src/app.py
+The file is rewritten at the end of every script run and can be scraped by
+the node_exporter textfile collector. When the variable is unset, `timed`
+returns the original function and `timer` does nothing.
+
+Each app names its metrics with `set_prefix` at the top of a script run
+(tem_ipa, rockfish). Observations are recorded under the prefix of the
+thread that makes them, so when the portal hosts both apps in one process,
+their metrics stay apart in the same file.
+"""
+
+import os
+import threading
+import time
+from functools import wraps
+
+METRICS_FILE = os.environ.get('DASHBOARD_METRICS_FILE')
+METRICS_ENABLED = bool(METRICS_FILE)
+
+# Prefix for observations made outside an app's script run
+DEFAULT_PREFIX = 'dashboard'
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Streamlit runs each session in its own thread, so the registry is shared
+_lock = threading.Lock()
+_histograms = {}    # (prefix, name) -> histogram
+_local = threading.local()
+
+
+def set_prefix(prefix):
+    """Record this thread's observations under the app's metric prefix"""
+    _local.prefix = prefix
+
+
+def observe(name, seconds):
+    """Record one observation (in seconds) for the named operation"""
+    key = (getattr(_local, 'prefix', DEFAULT_PREFIX), name)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0}
+            _histograms[key] = hist
+
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist['buckets'][i] += 1
+                break
+        hist['sum'] += seconds
+        hist['count'] += 1
+
+
+class Timer:
+    """
+    Times a block of code. Usable as a context manager, or started and
+    stopped explicitly when the block spans a whole page branch
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.start_time = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self.start_time is not None:
+            observe(self.name, time.perf_counter() - self.start_time)
+            self.start_time = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class _NullTimer:
+    """Stand-in used when metrics are disabled"""
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """Context manager timing a block under the given name"""
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return Timer(name)
+
+
+def start_page(page):
+    """
+    Start timing this thread's page branch as `page:<page>`
+
+    The app stops it with end_page from the finally block around the page,
+    so the sample is kept when the page raises or ends the run early.
+    """
+    _local.page_timer = timer(f"page:{page}").start()
+
+
+def end_page():
+    """Stop this thread's page timer, if one is running"""
+    page_timer = getattr(_local, 'page_timer', None)
+    _local.page_timer = None
+    if page_timer is not None:
+        page_timer.stop()
+
+
+def timed(name=None):
+    """Decorator recording latency and call count of a function"""
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+
+        metric_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(metric_name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def export_prometheus():
+    """Render all recorded metrics in Prometheus text exposition format"""
+    with _lock:
+        snapshot = {
+            key: {'buckets': list(h['buckets']), 'sum': h['sum'], 'count': h['count']}
+            for key, h in _histograms.items()
+        }
+
+    lines = []
+    for prefix in sorted({prefix for prefix, _name in snapshot}):
+        names = sorted(name for key_prefix, name in snapshot if key_prefix == prefix)
+        latency = f'{prefix}_latency_seconds'
+        calls = f'{prefix}_calls_total'
+
+        lines.append(f'# HELP {latency} Latency of instrumented dashboard operations')
+        lines.append(f'# TYPE {latency} histogram')
+        for name in names:
+            hist = snapshot[(prefix, name)]
+            label = _escape(name)
+            cumulative = 0
+            for bound, count in zip(BUCKETS, hist['buckets']):
+                cumulative += count
+                lines.append(f'{latency}_bucket{{name="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{latency}_bucket{{name="{label}",le="+Inf"}} {hist["count"]}')
+            lines.append(f'{latency}_sum{{name="{label}"}} {hist["sum"]:.6f}')
+            lines.append(f'{latency}_count{{name="{label}"}} {hist["count"]}')
+
+        lines.append(f'# HELP {calls} Number of calls to instrumented dashboard operations')
+        lines.append(f'# TYPE {calls} counter')
+        for name in names:
+            lines.append(f'{calls}{{name="{_escape(name)}"}} {snapshot[(prefix, name)]["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics_file(path=None):
+    """Atomically rewrite the metrics file (no-op when metrics are disabled)"""
+    path = path or METRICS_FILE
+    if not METRICS_ENABLED or not path:
+        return
+
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(export_prometheus())
+    os.replace(tmp_path, path)
@@ -0,0 +1,150 @@
+"""
+On-demand profiler for a single dashboard rerun
+Wraps one script run in cProfile + tracemalloc and renders the results
+
+Enable for a rerun with the `?profile=1` query parameter, or with the
+admin-only "Profile reruns" toggle in the sidebar. The raw .prof file can be
+downloaded and opened with `snakeviz run.prof`.
+"""
+
+import cProfile
+import os
+import pstats
+import tempfile
+import threading
+import tracemalloc
+from datetime import datetime
+
+import streamlit as st
+
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+
+# tracemalloc is process-wide, so concurrent profiled sessions share it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def _query_param(name):
+    if hasattr(st, 'query_params'):
+        return st.query_params.get(name, '')
+    # Streamlit < 1.30
+    return st.experimental_get_query_params().get(name, [''])[0]
+
+
+def profiling_requested():
+    """True if this rerun should be profiled (query param or admin toggle)"""
+    if st.session_state.get('profile_reruns', False):
+        return True
+    return str(_query_param('profile')).lower() in ('1', 'true', 'yes')
+
+
+class RunProfiler:
+    """Collects CPU and allocation profiles for one script run"""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.snapshot = None
+        self.error = None
+        self.started_at = datetime.now()
+        self.running = False
+
+    def start(self):
+        global _tracemalloc_users
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            _tracemalloc_users += 1
+        self.running = True
+
+        try:
+            self.profiler.enable()
+        except ValueError as e:
+            # Another profiler is already active in this interpreter
+            self.error = str(e)
+        return self
+
+    def stop(self):
+        """Stop profiling (once; later calls do nothing)"""
+        global _tracemalloc_users
+        if not self.running:
+            return
+        self.running = False
+        if self.error is None:
+            self.profiler.disable()
+
+        with _tracemalloc_lock:
+            if tracemalloc.is_tracing():
+                self.snapshot = tracemalloc.take_snapshot()
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0:
+                tracemalloc.stop()
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        """Functions ordered by cumulative time"""
+        stats = pstats.Stats(self.profiler)
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+            rows.append({
+                'Function': func,
+                'Location': f"{os.path.basename(filename)}:{line}",
+                'Calls': nc,
+                'Total (s)': round(tt, 4),
+                'Cumulative (s)': round(ct, 4),
+            })
+        rows.sort(key=lambda r: r['Cumulative (s)'], reverse=True)
+        return rows[:limit]
+
+    def top_allocations(self, limit=TOP_ALLOCATIONS):
+        """Allocation sites ordered by retained size"""
+        if self.snapshot is None:
+            return []
+
+        snapshot = self.snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+        rows = []
+        for stat in snapshot.statistics('lineno')[:limit]:
+            frame = stat.traceback[0]
+            rows.append({
+                'Location': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                'Size (KiB)': round(stat.size / 1024, 1),
+                'Blocks': stat.count,
+            })
+        return rows
+
+    def prof_bytes(self):
+        """Raw pstats dump, loadable by snakeviz"""
+        fd, path = tempfile.mkstemp(suffix='.prof')
+        os.close(fd)
+        try:
+            self.profiler.dump_stats(path)
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def render(self, app_name):
+        """Show the profile in an expander at the bottom of the page"""
+        import pandas as pd
+
+        with st.expander("🔬 Profile of this rerun", expanded=True):
+            if self.error:
+                st.warning(f"CPU profiling unavailable for this rerun: {self.error}")
+            else:
+                st.markdown("**Top functions by cumulative time**")
+                st.dataframe(pd.DataFrame(self.top_functions()), use_container_width=True, hide_index=True)
+
+            st.markdown("**Top allocation sites** (process-wide while this rerun was traced)")
+            st.dataframe(pd.DataFrame(self.top_allocations()), use_container_width=True, hide_index=True)
+
+            if not self.error:
+                timestamp = self.started_at.strftime('%Y%m%d-%H%M%S')
+                st.download_button(
+                    "📥 Download .prof (open with snakeviz)",
+                    data=self.prof_bytes(),
+                    file_name=f"{app_name}-{timestamp}.prof",
+                    mime="application/octet-stream"
+                )
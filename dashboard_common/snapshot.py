@@ -0,0 +1,246 @@
+"""
+Process-wide, read-only data snapshots shared by every Streamlit session
+
+A SnapshotStore holds the current version of the dashboard tables. Every
+session reads the same frames - nothing is copied or unpickled per rerun.
+Publishing new data builds a fresh Snapshot and swaps it in atomically;
+sessions still rendering the old version keep it alive until they finish,
+and Python's reference counting frees it afterwards. `invalidate` drops the
+current version so the next run reloads the tables from the loader (e.g.
+when new landings arrive), and `memory_report` accounts for what sharing
+saves over a private copy per rerun.
+
+Snapshots protect themselves without changing pandas options for the
+process: column buffers are read-only and tables are handed out as shallow
+copies. A session can add or replace columns on its copy, while an in-place
+write to a shared column raises ValueError instead of changing the frame
+other sessions see.
+"""
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (installed with streamlit)
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = None
+
+
+def freeze_frame(df):
+    """Return a copy of df whose column buffers are read-only (strings Arrow-backed)"""
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if STRING_DTYPE and series.dtype == object and pd.api.types.infer_dtype(series, skipna=False) == 'string':
+            columns[col] = series.astype(STRING_DTYPE).array
+            continue
+
+        values = series.array
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy(copy=True)
+            values.flags.writeable = False
+        columns[col] = values
+
+    return pd.DataFrame(columns, index=df.index.copy(), copy=False)
+
+
+def deep_bytes(value, _seen=None):
+    """
+    Approximate memory footprint of a derived value: DataFrames, arrays and
+    the containers and plain objects (e.g. an index class) holding them
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        try:
+            usage = value.memory_usage(deep=True)
+        except ValueError:
+            # pandas cannot walk read-only object arrays (e.g. an Index over
+            # a frozen column); count their pointers only
+            usage = value.memory_usage(deep=False)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(deep_bytes(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(deep_bytes(item, seen) for item in value)
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        # e.g. pyarrow Tables (display.py)
+        return nbytes
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return deep_bytes(vars(value), seen)
+    return 0
+
+
+class Snapshot:
+    """One immutable version of the dashboard tables"""
+
+    def __init__(self, version, tables, derived=None):
+        self.version = version
+        self._tables = tables
+        self._derived = dict(derived or {})
+        self._derived_lock = threading.Lock()
+        self._key_locks = {}    # derived key -> lock held while that key builds
+
+    def __getitem__(self, name):
+        # Shallow copy: shares the read-only buffers, but a session adding or
+        # replacing columns cannot change the frame other sessions see
+        return self._tables[name].copy(deep=False)
+
+    def __contains__(self, name):
+        return name in self._tables
+
+    def keys(self):
+        return self._tables.keys()
+
+    def derive(self, key, builder):
+        """
+        Memoize a structure computed from this version (index, rollup, ...).
+        Built at most once per version and shared by all sessions. Each key
+        builds under its own lock, so a slow build only holds up callers of
+        the same key.
+        """
+        value = self._derived.get(key)
+        if value is not None:
+            return value
+
+        with self._derived_lock:
+            key_lock = self._key_locks.setdefault(key, threading.RLock())
+        with key_lock:
+            value = self._derived.get(key)
+            if value is None:
+                value = builder(self)
+                with self._derived_lock:
+                    self._derived[key] = value
+        return value
+
+    def memory_bytes(self):
+        """Deep memory footprint of the tables in this version"""
+        return sum(deep_bytes(df) for df in self._tables.values())
+
+    def derived_bytes(self):
+        """Approximate footprint of the memoized derived structures"""
+        with self._derived_lock:
+            derived = dict(self._derived)
+        return deep_bytes(derived, {id(df) for df in self._tables.values()})
+
+    def clear_derived(self):
+        """Drop the memoized derived structures (rebuilt on next use)"""
+        with self._derived_lock:
+            self._derived = {}
+
+
+class SnapshotStore:
+    """Holds the current Snapshot and publishes new versions atomically"""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._current = None
+        self._version = 0
+        self._live = weakref.WeakValueDictionary()
+        self._local = threading.local()
+        self._pins = {}     # thread ident -> pinned version, for runs in flight
+
+    def current(self):
+        """The snapshot pinned by this script run, else the latest version"""
+        pinned = getattr(self._local, 'snapshot', None)
+        if pinned is not None:
+            return pinned
+        return self.latest()
+
+    def latest(self):
+        """The latest published snapshot (loaded on first use)"""
+        snapshot = self._current
+        if snapshot is None:
+            with self._lock:
+                if self._current is None:
+                    self._publish_locked(self._loader())
+                snapshot = self._current
+        return snapshot
+
+    def pin(self):
+        """
+        Pin the latest snapshot to the calling thread, so one script run reads
+        a single consistent version even if new data is published meanwhile
+        """
+        self._local.snapshot = None
+        self._local.snapshot = self.latest()
+
+        alive = {thread.ident for thread in threading.enumerate()}
+        with self._lock:
+            self._pins = {ident: version for ident, version in self._pins.items() if ident in alive}
+            self._pins[threading.get_ident()] = self._local.snapshot.version
+        return self._local.snapshot
+
+    def publish(self, tables, derived=None):
+        """Atomically replace the current snapshot with a new version"""
+        with self._lock:
+            snapshot = self._publish_locked(tables, derived)
+
+        # The publishing run reads its own write; other runs see it next rerun
+        if getattr(self._local, 'snapshot', None) is not None:
+            self._local.snapshot = snapshot
+        return snapshot
+
+    def _publish_locked(self, tables, derived=None):
+        frozen = {name: freeze_frame(df) for name, df in tables.items()}
+        self._version += 1
+        snapshot = Snapshot(self._version, frozen, derived)
+        self._current = snapshot
+        self._live[snapshot.version] = snapshot
+        return snapshot
+
+    def invalidate(self):
+        """
+        Drop the current version; the next run loads a fresh one from the
+        loader. Runs already pinned to the old version finish on it.
+        """
+        with self._lock:
+            self._current = None
+
+    def live_versions(self):
+        """Versions still referenced by the store or by an in-flight rerun"""
+        return sorted(self._live.keys())
+
+    def memory_report(self):
+        """
+        Memory held by the shared snapshots, and what per-run private copies
+        (one unpickled set of tables per rerun, as with st.cache_data) would
+        cost for the runs currently in flight
+
+        Returns:
+            dict with version, live_versions, table_bytes (current version),
+            live_bytes (all live versions), derived (memoized keys),
+            derived_bytes (their approximate footprint),
+            runs_in_flight, copy_bytes (private copies for those runs) and
+            saved_bytes (copy_bytes minus the one shared current version)
+        """
+        current = self.latest()
+        live = dict(self._live.items())
+        alive = {thread.ident for thread in threading.enumerate()}
+        runs = sum(ident in alive for ident in list(self._pins))
+
+        table_bytes = current.memory_bytes()
+        live_bytes = sum(snapshot.memory_bytes() for snapshot in live.values())
+        copy_bytes = table_bytes * max(runs, 1)
+        return {
+            'version': current.version,
+            'live_versions': sorted(live),
+            'table_bytes': table_bytes,
+            'live_bytes': live_bytes,
+            'derived': sorted(current._derived),
+            'derived_bytes': current.derived_bytes(),
+            'runs_in_flight': runs,
+            'copy_bytes': copy_bytes,
+            'saved_bytes': copy_bytes - table_bytes
+        }
@@ -0,0 +1,98 @@
+"""
+Fishermen First program portal
+Hosts the TEM IPA and CGOA Rockfish dashboards in one Streamlit server
+
+    streamlit run portal/src/app.py
+
+Each program's app.main() runs as a page (see programs.py), and they share:
+    - the Streamlit session, so one login covers both programs
+    - one process: Python, pandas and plotly are imported once, and each
+      program's data is loaded once on first use
+    - a vessel dimension matching vessels across programs (vessels.py)
+    - one memory budget for derived caches (budget.py)
+"""
+
+import streamlit as st
+
+from budget import CacheBudget
+from programs import PROGRAMS
+
+st.set_page_config(
+    page_title="Fishermen First Programs",
+    page_icon="🐟",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Same admin list as the programs
+ADMIN_USERS = {'fishermen_first'}
+
+
+@st.cache_resource
+def get_budget():
+    """One cache budget for the whole server"""
+    return CacheBudget(PROGRAMS)
+
+
+def program_page(program):
+    """Page callable that runs a program's dashboard, then enforces the cache budget"""
+    def run():
+        try:
+            program.main()
+        finally:
+            get_budget().enforce()
+    run.__name__ = f'run_{program.key}'
+    return run
+
+
+def home():
+    st.title("🐟 Fishermen First Programs")
+    st.markdown("One sign-in for every program dashboard")
+    st.markdown("---")
+
+    for program in PROGRAMS.values():
+        st.page_link(pages[program.key], label=f"**{program.title}**", icon=program.icon)
+
+    if not st.session_state.get('authenticated'):
+        st.info("Open a program and log in; the session is shared by all programs.")
+        return
+
+    import vessels
+
+    st.markdown("---")
+    st.subheader(f"Welcome, {st.session_state.user_name}!")
+
+    st.markdown("### 🚢 Shared Vessel Dimension")
+    dimension = vessels.vessel_dimension(PROGRAMS)
+    both = (dimension['programs'] == 'TEM IPA, Rockfish').sum()
+    st.caption(f"{len(dimension)} vessels, {both} fishing in both programs")
+    st.dataframe(dimension, use_container_width=True, hide_index=True)
+
+    if st.session_state.username in ADMIN_USERS:
+        budget = get_budget()
+        reports = budget.usage()
+        mb = 1024 * 1024
+        st.markdown("### 🧠 Shared Cache Budget")
+        st.caption(
+            f"{budget.total_bytes(reports) / mb:,.1f} MB of {budget.max_bytes / mb:,.0f} MB in use · "
+            f"{budget.evictions} derived-cache evictions"
+        )
+        st.dataframe([
+            {
+                'Program': PROGRAMS[key].title,
+                'Data Version': report['version'],
+                'Tables (MB)': round(report['live_bytes'] / mb, 2),
+                'Derived (MB)': round(report['derived_bytes'] / mb, 2),
+                'Derived Caches': ', '.join(report['derived'])
+            }
+            for key, report in reports.items()
+        ], use_container_width=True, hide_index=True)
+
+
+pages = {
+    program.key: st.Page(program_page(program), title=program.title, icon=program.icon, url_path=program.key)
+    for program in PROGRAMS.values()
+}
+
+navigation = st.navigation([st.Page(home, title="Home", icon="🏠", default=True), *pages.values()])
+navigation.run()
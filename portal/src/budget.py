@@ -0,0 +1,61 @@
+"""
+Shared memory budget for the hosted programs' data caches
+
+Both programs keep their tables in a SnapshotStore and memoize derived
+structures (rollups, indexes, forecasts, simulations) per data version. The
+tables are the programs' state and are never evicted; derived structures can
+always be rebuilt. After every page run the portal measures both stores and,
+while the total is over budget, drops the derived structures of the
+least recently used program first.
+
+Set the budget with PORTAL_CACHE_MB (default 512).
+"""
+
+import os
+import threading
+
+CACHE_BUDGET_MB = float(os.environ.get('PORTAL_CACHE_MB', 512))
+
+
+class CacheBudget:
+    """Evicts derived caches across programs to stay under one memory budget"""
+
+    def __init__(self, programs, max_bytes=CACHE_BUDGET_MB * 1024 * 1024):
+        self.programs = programs
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def usage(self):
+        """
+        Per-program memory of the loaded stores
+
+        Returns:
+            {program key: memory_report() dict} for programs whose data is loaded
+        """
+        reports = {}
+        for key, program in self.programs.items():
+            store = program.store()
+            if store is not None:
+                reports[key] = store.memory_report()
+        return reports
+
+    def total_bytes(self, reports=None):
+        reports = self.usage() if reports is None else reports
+        return sum(report['live_bytes'] + report['derived_bytes'] for report in reports.values())
+
+    def enforce(self):
+        """Drop derived caches, least recently used program first, until under budget"""
+        with self._lock:
+            reports = self.usage()
+            total = self.total_bytes(reports)
+            by_age = sorted(reports, key=lambda key: self.programs[key].last_used)
+            for key in by_age:
+                if total <= self.max_bytes:
+                    break
+                freed = reports[key]['derived_bytes']
+                if freed:
+                    self.programs[key].store().latest().clear_derived()
+                    self.evictions += 1
+                    total -= freed
+            return total
@@ -0,0 +1,67 @@
+"""
+Program hosting for the single-process portal
+
+Each program (TEM IPA, Rockfish) is a package in its app's `src/` directory
+(tem_ipa, rockfish) whose `app.main()` runs one script run of the dashboard;
+the standalone `src/app.py` scripts call the same function. Both `src/`
+directories are on sys.path, so the packages import normally, and spawn
+worker processes can unpickle functions from them (e.g. simulation.py's
+pool). The modules both apps use (metrics, profiling, snapshot, display) live
+in the dashboard_common package at the repository root.
+
+Modules are imported once per process, so each program's data store (and its
+derived caches) exists once and is shared by every session, like in the
+standalone apps.
+"""
+
+import importlib
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+class Program:
+    """One hosted dashboard: its package, modules and data store"""
+
+    def __init__(self, key, title, icon, package, store_name):
+        self.key = key
+        self.title = title
+        self.icon = icon
+        self.package = package
+        self.store_name = store_name
+        self.last_used = 0.0
+
+    def module(self, name):
+        """The program's module `name` (imported on first use)"""
+        return importlib.import_module(f'{self.package}.{name}')
+
+    def loaded(self, name):
+        """The module if it has been imported, else None (does not import it)"""
+        return sys.modules.get(f'{self.package}.{name}')
+
+    def store(self):
+        """The program's SnapshotStore, or None before its data module loads"""
+        demo_data = self.loaded('demo_data')
+        return getattr(demo_data, self.store_name, None) if demo_data is not None else None
+
+    def main(self):
+        """Run the program's dashboard for this rerun (a Streamlit page)"""
+        self.last_used = time.monotonic()
+        self.module('app').main()
+
+
+def _program(key, title, icon, directory, package, store_name):
+    src_dir = os.path.join(REPO_ROOT, directory, 'src')
+    if src_dir not in sys.path:
+        sys.path.append(src_dir)
+    return Program(key, title, icon, package, store_name)
+
+
+PROGRAMS = {
+    'tem': _program('tem', 'TEM IPA', '🐟', 'tem-ipa', 'tem_ipa', 'TRIP_STORE'),
+    'rockfish': _program('rockfish', 'CGOA Rockfish', '🎣', 'rockfish', 'rockfish', 'DATA_STORE'),
+}
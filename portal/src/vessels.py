@@ -0,0 +1,62 @@
+"""
+Shared vessel dimension across the hosted programs
+
+The programs identify vessels by their own IDs (TEM: AK-xxxx, Rockfish:
+V-xxx). Vessels that fish in both programs are matched on vessel name into
+one dimension row. The portal-wide vessel_key is derived from the name, so
+it stays the same as vessels join or leave either program.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+DIMENSION_COLUMNS = ['vessel_key', 'vessel_name', 'tem_vessel_id', 'rockfish_vessel_id', 'programs']
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def _program_vessels(programs):
+    tem = programs['tem'].module('demo_data')
+    rockfish = programs['rockfish'].module('demo_data')
+    tem_vessels = pd.DataFrame(tem.VESSELS)[['vessel_id', 'vessel_name']]
+    rockfish_snapshot = rockfish.DATA_STORE.current()
+    rockfish_vessels = rockfish_snapshot['vessels'][['vessel_id', 'vessel_name', 'cooperative_name']]
+    return tem_vessels, rockfish_vessels, rockfish_snapshot.version
+
+
+def vessel_dimension(programs):
+    """
+    One row per distinct vessel across both programs
+
+    Returns:
+        DataFrame (DIMENSION_COLUMNS plus cooperative_name), vessels in both
+        programs first
+    """
+    tem_vessels, rockfish_vessels, version = _program_vessels(programs)
+    with _lock:
+        cached = _cache.get(version)
+        if cached is not None:
+            return cached.copy(deep=False)
+
+        dimension = pd.merge(
+            tem_vessels.rename(columns={'vessel_id': 'tem_vessel_id'}),
+            rockfish_vessels.rename(columns={'vessel_id': 'rockfish_vessel_id'}).astype({'vessel_name': object}),
+            on='vessel_name', how='outer'
+        )
+        in_tem = dimension['tem_vessel_id'].notna()
+        in_rockfish = dimension['rockfish_vessel_id'].notna()
+        dimension['programs'] = np.select(
+            [in_tem & in_rockfish, in_tem], ['TEM IPA, Rockfish', 'TEM IPA'], default='Rockfish'
+        )
+        dimension.insert(0, 'vessel_key', dimension['vessel_name'].str.upper().str.replace(r'[^A-Z0-9]+', '-', regex=True))
+
+        dimension = (dimension.assign(_both=~(in_tem & in_rockfish))
+                     .sort_values(['_both', 'vessel_name'])
+                     .drop(columns='_both')
+                     .reset_index(drop=True))[DIMENSION_COLUMNS + ['cooperative_name']]
+        _cache.clear()      # only the latest Rockfish version is kept
+        _cache[version] = dimension
+        return dimension.copy(deep=False)
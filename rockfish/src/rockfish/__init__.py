@@ -0,0 +1,24 @@
+"""
+CGOA Rockfish Program Analytics Dashboard
+
+    app          - the Streamlit dashboard (main() runs one script run)
+    demo_data    - demo program data and the process-wide data store
+    ingest       - fish ticket ingestion, harvest-to-date and PSC totals
+    ledger       - quota ledger (as-of balances)
+    transfers    - batch quota transfer validation, netting and recommendations
+    cube         - rollup cube for the Board Report and Dashboard KPIs
+    timeseries   - daily harvest and PSC series per vessel
+    psc          - PSC rates, ranking and hotspot weeks
+    forecast     - PSC cap exhaustion forecasts
+    alerts       - rule-driven alerts
+    vessel_index - filter, sort and page index for the Vessels page
+    board_report - Board Report charts and the offline report bundle
+"""
+
+import os
+import sys
+
+# dashboard_common (shared with the other app) lives at the repository root
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
@@ -0,0 +1,188 @@
+"""
+Rule-driven alerts for the Rockfish Program
+
+Every rule is evaluated for the whole fleet at once with array operations:
+
+    quota     - vessel over its quota (high) or above 95% of it (medium)
+    chinook,  - vessel PSC at or above its share of the program cap (high),
+    halibut     or above PSC_WARNING_PCT of it (medium); shares follow CQ
+                allocation, as in forecast.py
+    late      - fish tickets for weeks ending on or before the as-of date
+                submitted (or still missing) more than LATE_SUBMISSION_DAYS
+                after the week ended (low), one alert per vessel
+
+Alert IDs are `<rule>-<vessel_id>`, so the same condition keeps the same ID
+across data versions (and moves between severities in place). Where a vessel
+triggers a rule at several severities, only the most severe alert is kept;
+`combine_alerts` applies the same dedupe when merging in the PSC cap forecast
+alerts. A page of alerts renders as one HTML block (`alert_cards_html`).
+"""
+
+import html
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+from rockfish.forecast import PSC_CAPS, PSC_LABELS
+
+SEVERITIES = ['high', 'medium', 'low']
+SEVERITY_BADGES = {'high': 'red', 'medium': 'orange', 'low': 'yellow'}
+
+PSC_WARNING_PCT = 90
+LATE_SUBMISSION_DAYS = 3
+
+ALERT_PAGE_SIZE = 20
+
+ALERT_COLUMNS = [
+    'alert_id', 'rule', 'alert_type', 'severity', 'vessel_id', 'vessel_name',
+    'cooperative_name', 'message', 'badge_color'
+]
+
+
+def _rule_alerts(vessels_df, mask, rule, alert_type, severity, messages):
+    """Alert rows for the vessels where mask holds (messages: aligned Series)"""
+    hits = vessels_df[mask]
+    return pd.DataFrame({
+        'alert_id': rule + '-' + hits['vessel_id'].astype(str),
+        'rule': rule,
+        'alert_type': alert_type,
+        'severity': severity,
+        'vessel_id': hits['vessel_id'],
+        'vessel_name': hits['vessel_name'],
+        'cooperative_name': hits['cooperative_name'],
+        'message': messages[mask],
+        'badge_color': SEVERITY_BADGES[severity]
+    })
+
+
+def _late_submissions(weekly_df, as_of):
+    """Per-vessel count and latest week of late or missing fish tickets"""
+    due = weekly_df[weekly_df['week_ending'] <= as_of]
+    received = due['submitted_date'].where(due['submitted_date'] <= as_of)
+    days_late = ((received.fillna(as_of) - due['week_ending']).dt.days - LATE_SUBMISSION_DAYS)
+    late = due.assign(days_late=days_late, missing=received.isna())[days_late > 0]
+    return late.sort_values('week_ending').groupby('vessel_id').agg(
+        late_weeks=('week_ending', 'size'),
+        last_week=('week_ending', 'last'),
+        last_days_late=('days_late', 'last'),
+        last_missing=('missing', 'last')
+    )
+
+
+@timed()
+def generate_alerts(vessels_df, weekly_df, as_of):
+    """
+    Evaluate the quota, PSC and late-submission rules for every vessel
+
+    Args:
+        vessels_df: vessels table (with quota_balance_mt and status)
+        weekly_df: weekly harvest table with submitted_date
+        as_of: date the late-submission rule is evaluated on
+
+    Returns:
+        DataFrame (ALERT_COLUMNS), most severe first
+    """
+    as_of = pd.Timestamp(as_of)
+    vessels_df = vessels_df.reset_index(drop=True)
+    status = vessels_df['status']
+    balance = vessels_df['quota_balance_mt']
+    parts = [
+        _rule_alerts(vessels_df, status == 'Overage', 'quota', 'Overage', 'high',
+                     balance.abs().map('{:.1f} mt quota overage'.format)),
+        _rule_alerts(vessels_df, status == 'Near Overage', 'quota', 'At Risk', 'medium',
+                     balance.map('Quota overage risk ({:.1f} mt remaining)'.format)),
+    ]
+
+    share = vessels_df['cq_allocation_mt'] / vessels_df['cq_allocation_mt'].sum()
+    for species, cap in PSC_CAPS.items():
+        column = species.replace('_psc', '_psc_count')
+        vessel_cap = share * cap
+        used_pct = vessels_df[column] / vessel_cap * 100
+        messages = (vessels_df[column].map('{:,}'.format) + ' of ' + vessel_cap.map('{:,.0f}'.format)
+                    + f' {PSC_LABELS[species]} PSC share (' + used_pct.map('{:.0f}'.format) + '%)')
+        rule = PSC_LABELS[species].lower()
+        parts += [
+            _rule_alerts(vessels_df, used_pct >= 100, rule, f'{PSC_LABELS[species]} Cap', 'high', messages),
+            _rule_alerts(vessels_df, used_pct.between(PSC_WARNING_PCT, 100, inclusive='left'), rule,
+                         f'{PSC_LABELS[species]} Warning', 'medium', messages),
+        ]
+
+    if 'submitted_date' in weekly_df:
+        late = _late_submissions(weekly_df, as_of)
+        week = 'week ending ' + late['last_week'].dt.strftime('%b %d')
+        days = late['last_days_late'].astype(str) + np.where(late['last_days_late'] == 1, ' day', ' days')
+        messages = ('Fish ticket for ' + week + ' not yet submitted (' + days + ' overdue)').where(
+            late['last_missing'], 'Late fish ticket for ' + week + ' (' + days + ' late)')
+        messages = messages + np.where(late['late_weeks'] > 1,
+                                       ', ' + late['late_weeks'].astype(str) + ' late weeks this season', '')
+        parts.append(_rule_alerts(vessels_df, vessels_df['vessel_id'].isin(late.index), 'late', 'Pending', 'low',
+                                  vessels_df['vessel_id'].map(messages)))
+
+    return _rank([part for part in parts if len(part)])
+
+
+def _rank(parts):
+    """
+    Concatenate alert frames, keep the most severe alert per rule and vessel
+    (earlier frames win ties) and order most severe first
+    """
+    if not parts:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    alerts = pd.concat([part.assign(_source=i) for i, part in enumerate(parts)], ignore_index=True)
+    alerts['_order'] = alerts['severity'].map({severity: i for i, severity in enumerate(SEVERITIES)})
+    alerts = (alerts.sort_values(['_order', '_source'], kind='stable')
+              .drop_duplicates(['rule', 'vessel_id'])
+              .sort_values(['_order', 'rule', 'vessel_name'], kind='stable')
+              .reset_index(drop=True))
+    return alerts[ALERT_COLUMNS]
+
+
+def forecast_alert_rows(psc_alerts):
+    """PSC cap forecast alerts (forecast.forecast_alerts) in the alert table layout"""
+    status_severity = {'exceeded': 'high', 'projected': 'medium', 'at risk': 'low'}
+    status_types = {'exceeded': 'PSC Cap Reached', 'projected': 'PSC Forecast', 'at risk': 'PSC Watch'}
+
+    labels = psc_alerts['species'].map(PSC_LABELS)
+    usage = (psc_alerts['cumulative'].map('{:,.0f}'.format) + ' of ' + psc_alerts['cap'].map('{:,.0f}'.format)
+             + ' ' + labels + ' cap')
+    late = psc_alerts['hit_date_late'].dt.strftime('%b %d').fillna('after season close')
+    expected = psc_alerts['hit_date'].dt.strftime('%b %d').fillna('not expected')
+    projected = (usage + ' - projected cap date ' + expected + ' (80% band '
+                 + psc_alerts['hit_date_early'].dt.strftime('%b %d') + ' to ' + late + ')')
+    severity = psc_alerts['status'].map(status_severity)
+
+    return pd.DataFrame({
+        'alert_id': 'psc-' + psc_alerts['species'] + '-' + psc_alerts['group_id'].astype(str),
+        'rule': labels.str.lower(),
+        'alert_type': psc_alerts['status'].map(status_types),
+        'severity': severity,
+        'vessel_id': psc_alerts['group_id'],
+        'vessel_name': psc_alerts['group_name'] + ' (' + psc_alerts['level'] + ')',
+        'cooperative_name': psc_alerts['group_name'].where(psc_alerts['level'] == 'Cooperative', ''),
+        'message': projected.where(psc_alerts['status'] != 'exceeded', usage + ' - cap reached'),
+        'badge_color': severity.map(SEVERITY_BADGES)
+    }, index=psc_alerts.index)[ALERT_COLUMNS].reset_index(drop=True)
+
+
+def combine_alerts(alerts_df, psc_alerts):
+    """
+    Rule alerts plus PSC forecast alerts; a vessel's forecast is dropped when
+    its PSC rule alert for the species is at least as severe
+    """
+    return _rank([part for part in (alerts_df, forecast_alert_rows(psc_alerts)) if len(part)])
+
+
+def alert_cards_html(alerts_df):
+    """One HTML block for a page of alerts (rendered with a single st.markdown)"""
+    if alerts_df.empty:
+        return ''
+    names = alerts_df['vessel_name'].astype(str).map(html.escape)
+    messages = alerts_df['message'].astype(str).map(html.escape)
+    badges = alerts_df['badge_color']
+    cards = ('<div class="alert-card alert-' + badges + '"><strong>' + names + '</strong><br>' + messages
+             + '<span class="status-badge badge-' + badges + '" style="float: right;">'
+             + alerts_df['alert_type'].astype(str) + '</span></div>')
+    return '\n'.join(cards)
@@ -0,0 +1,853 @@
+"""
+CGOA Rockfish Program Analytics Dashboard
+Demo platform for Fisherman First LLC proposal
+
+main() runs the dashboard for one script run; src/app.py runs it
+standalone and the portal hosts it as a page.
+"""
+
+import streamlit as st
+from datetime import datetime, timedelta
+
+from dashboard_common import metrics, profiling
+
+# ============================================================================
+# AUTHENTICATION
+# ============================================================================
+# Demo credentials for interview committee
+# In production, this would use database with proper password hashing
+
+# Demo user credentials
+DEMO_USERS = {
+    'demo': {'password': 'demo123', 'name': 'Demo User'},
+    'ipa_manager': {'password': 'demo2026', 'name': 'IPA Manager'},
+    'fishermen_first': {'password': 'ff2026', 'name': 'Fishermen First'}
+}
+
+# Users who may profile reruns and reload the shared data from the sidebar
+ADMIN_USERS = {'fishermen_first'}
+
+# Login function
+def login(username, password):
+    if username in DEMO_USERS and DEMO_USERS[username]['password'] == password:
+        st.session_state.authenticated = True
+        st.session_state.user_name = DEMO_USERS[username]['name']
+        st.session_state.username = username
+        return True
+    return False
+
+# Logout function
+def logout():
+    st.session_state.authenticated = False
+    st.session_state.user_name = None
+    st.session_state.username = None
+
+# Login page, shown until the session is authenticated
+def login_page():
+    st.title("🐟 CGOA Rockfish Analytics Dashboard")
+    st.markdown("**2026 Rockfish Program Manager**")
+    st.markdown("---")
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+
+    with col2:
+        st.subheader("🔐 Login")
+
+        with st.form("login_form"):
+            username = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            submit = st.form_submit_button("Login", type="primary", use_container_width=True)
+
+            if submit:
+                if login(username, password):
+                    st.success("Login successful!")
+                    st.rerun()
+                else:
+                    st.error("Invalid username or password")
+
+# Sidebar and the selected page, once logged in
+def render_dashboard():
+    # Heavy imports are deferred until after login so the login page renders fast
+    # (plotly is imported by the Board Report page only)
+    import pandas as pd
+    from rockfish import demo_data
+    from dashboard_common import display
+    from rockfish.transfers import INTER_COOP_CAP_PCT, validate_transfers
+    from rockfish.forecast import PSC_CAPS, PSC_LABELS, forecast_alerts
+    from rockfish.alerts import ALERT_PAGE_SIZE, SEVERITIES, alert_cards_html, combine_alerts
+    from rockfish.psc import RATE_WINDOWS
+
+    # Custom CSS
+    st.markdown("""
+    <style>
+    .main-header {
+        font-size: 2rem;
+        font-weight: 600;
+        color: #0E7490;
+        margin-bottom: 0.5rem;
+    }
+    .sub-header {
+        font-size: 1rem;
+        color: #64748B;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background-color: #0E7490;
+        padding: 1.5rem;
+        border-radius: 0.5rem;
+        color: white;
+    }
+    .metric-label {
+        font-size: 0.875rem;
+        font-weight: 500;
+        opacity: 0.9;
+    }
+    .metric-value {
+        font-size: 1.875rem;
+        font-weight: 700;
+        margin-top: 0.5rem;
+    }
+    .alert-card {
+        padding: 1rem;
+        border-radius: 0.375rem;
+        margin-bottom: 0.75rem;
+        border-left: 4px solid;
+    }
+    .alert-red {
+        background-color: #FEE2E2;
+        border-color: #DC2626;
+    }
+    .alert-orange {
+        background-color: #FED7AA;
+        border-color: #EA580C;
+    }
+    .alert-yellow {
+        background-color: #FEF3C7;
+        border-color: #CA8A04;
+    }
+    .status-badge {
+        padding: 0.25rem 0.75rem;
+        border-radius: 9999px;
+        font-size: 0.875rem;
+        font-weight: 500;
+        display: inline-block;
+    }
+    .badge-green {
+        background-color: #D1FAE5;
+        color: #065F46;
+    }
+    .badge-orange {
+        background-color: #FED7AA;
+        color: #9A3412;
+    }
+    .badge-red {
+        background-color: #FEE2E2;
+        color: #991B1B;
+    }
+    .badge-yellow {
+        background-color: #FEF3C7;
+        color: #854D0E;
+    }
+    </style>
+""", unsafe_allow_html=True)
+
+    # Load demo data: one read-only snapshot shared by every session, so reruns
+    # do not unpickle a private copy of each table (see snapshot.py)
+    def get_data():
+        return demo_data.DATA_STORE.pin()
+
+    data = get_data()
+
+    # Sidebar navigation
+    st.sidebar.markdown(f"### Welcome, {st.session_state.user_name}!")
+    if st.sidebar.button("🚪 Logout", use_container_width=True):
+        logout()
+        st.rerun()
+
+    if st.session_state.username in ADMIN_USERS:
+        st.sidebar.toggle("🔬 Profile reruns", key="profile_reruns",
+                          help="Profile each rerun with cProfile + tracemalloc (results at the bottom of the page)")
+
+        with st.sidebar.expander("🧠 Shared data"):
+            report = demo_data.DATA_STORE.memory_report()
+            mb = 1024 * 1024
+            st.markdown(
+                f"**Version:** {report['version']} (live: {', '.join(map(str, report['live_versions']))})  \n"
+                f"**Tables:** {report['table_bytes'] / mb:,.2f} MB shared by every session "
+                f"({report['live_bytes'] / mb:,.2f} MB held across live versions)  \n"
+                f"**Runs in flight:** {report['runs_in_flight']}  \n"
+                f"**Saved vs. per-run copies:** {report['saved_bytes'] / mb:,.2f} MB "
+                f"({report['table_bytes'] / mb:,.2f} MB per extra session)  \n"
+                f"**Derived:** {', '.join(report['derived']) or 'none'}"
+            )
+            if st.button("🔄 Reload data", help="Invalidate the shared tables and reload them (e.g. after new landings)"):
+                demo_data.DATA_STORE.invalidate()
+                st.rerun()
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 🐟 CGOA Rockfish Analytics")
+    st.sidebar.markdown("*Demo Platform*")
+    st.sidebar.markdown("---")
+
+    page = st.sidebar.radio(
+        "Navigation",
+        ["📊 Dashboard", "🚢 Vessels", "🏛️ Board Report", "🔄 Transfers", "📤 Fish Tickets"],
+        label_visibility="collapsed"
+    )
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("**2026 Rockfish Program Overview**")
+    st.sidebar.markdown("**Season:** April 1 - November 15")
+    st.sidebar.markdown("**Cooperatives:** 4")
+    st.sidebar.markdown("**Active Vessels:** 22")
+
+    # Demo banner
+    st.markdown("""
+<div style="background-color: #fff4e6; padding: 15px; border-radius: 5px; border-left: 5px solid #ff9800; margin-bottom: 20px;">
+    <strong>⚠️ DEMONSTRATION VERSION</strong><br/>
+    This is a proof-of-concept with test data. Production system will include live eLandings integration,
+    secure authentication, database persistence, and complete quota management features.
+</div>
+""", unsafe_allow_html=True)
+
+    # Time the selected page branch (no-op unless DASHBOARD_METRICS_FILE is set)
+    metrics.start_page(page)
+
+    # ============================================================================
+    # DASHBOARD PAGE
+    # ============================================================================
+    if page == "📊 Dashboard":
+        st.markdown('<div class="main-header">Rockfish Analytics Dashboard</div>', unsafe_allow_html=True)
+        st.markdown('<div class="sub-header">2026 Rockfish Program Overview</div>', unsafe_allow_html=True)
+
+        # Calculate metrics
+        vessels_df = data['vessels']
+        coops_df = data['cooperatives']
+        weekly_df = data['weekly_harvest']
+
+        fleet = demo_data.get_cube().fleet()
+
+        total_allocated = fleet['cq_allocation_mt']
+        total_harvested = fleet['harvest_to_date_mt']
+        harvest_pct = (total_harvested / total_allocated) * 100
+
+        total_chinook = int(fleet['chinook_psc_count'])
+        chinook_cap = PSC_CAPS['chinook_psc']
+        chinook_pct = (total_chinook / chinook_cap) * 100
+
+        total_halibut = int(fleet['halibut_psc_count'])
+        halibut_cap = PSC_CAPS['halibut_psc']
+        halibut_pct = (total_halibut / halibut_cap) * 100
+
+        # Top metrics
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">Total Cooperative Quota (Allocated / Harvested)</div>
+            <div class="metric-value">100% / {harvest_pct:.0f}%</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">Chinook PSC Cap (PSC)</div>
+            <div class="metric-value">{total_chinook:,} / {chinook_cap:,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        with col3:
+            st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">Halibut PSC Used</div>
+            <div class="metric-value">{halibut_pct:.0f}%</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("---")
+
+        # Active Alerts: quota/PSC/late-submission rules plus PSC cap forecasts
+        # (projected from recent weekly rates), rendered one page at a time
+        st.subheader("Active Alerts")
+        as_of, psc_forecast = demo_data.get_psc_forecast()
+        alerts_df = combine_alerts(data['alerts'], forecast_alerts(psc_forecast))
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            severity_filter = st.multiselect(
+                "Severity",
+                options=SEVERITIES,
+                default=SEVERITIES,
+                format_func=str.title
+            )
+        shown = alerts_df[alerts_df['severity'].isin(severity_filter)]
+        page_count = max((len(shown) - 1) // ALERT_PAGE_SIZE + 1, 1)
+        with col2:
+            alert_page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="alert_page")
+
+        start = (alert_page - 1) * ALERT_PAGE_SIZE
+        st.markdown(alert_cards_html(shown.iloc[start:start + ALERT_PAGE_SIZE]), unsafe_allow_html=True)
+
+        st.caption(
+            f"{len(shown)} of {len(alerts_df)} alerts · page {alert_page} of {page_count}. "
+            f"PSC forecast as of {as_of:%b %d, %Y} from the last few fishing weeks' rates; "
+            f"cooperative and vessel caps are shares of the program caps by CQ allocation"
+        )
+
+    # ============================================================================
+    # VESSELS PAGE
+    # ============================================================================
+    elif page == "🚢 Vessels":
+        st.markdown('<div class="main-header">Vessel Performance Overview</div>', unsafe_allow_html=True)
+        st.markdown('<div class="sub-header">2026 Rockfish Program Vessel Analytics</div>', unsafe_allow_html=True)
+
+        from rockfish.vessel_index import DISPLAY_COLUMNS, PAGE_SIZES, style_page
+
+        index = demo_data.get_vessel_index()
+
+        # Filters
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            selected_coop = st.multiselect(
+                "Filter by Cooperative",
+                options=index.cooperatives,
+                default=index.cooperatives
+            )
+        with col2:
+            status_filter = st.multiselect(
+                "Filter by Status",
+                options=index.statuses,
+                default=index.statuses
+            )
+
+        # Sorting and paging
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+        with col1:
+            sort_by = st.selectbox(
+                "Sort by",
+                options=list(DISPLAY_COLUMNS),
+                format_func=DISPLAY_COLUMNS.get
+            )
+        with col2:
+            sort_order = st.selectbox("Order", options=["Ascending", "Descending"])
+        with col3:
+            page_size = st.selectbox("Rows per page", options=PAGE_SIZES)
+
+        # Filter, sort and slice the page against the precomputed index
+        keep = index.filter(selected_coop, status_filter)
+        page_count = max((int(keep.sum()) - 1) // page_size + 1, 1)
+        with col4:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+
+        page_df, total_rows, summary = index.query(
+            selected_coop, status_filter, sort_by, sort_order == "Ascending", page_number - 1, page_size
+        )
+
+        st.markdown("### Fleet Performance Summary")
+
+        st.dataframe(style_page(page_df), use_container_width=True, height=600, hide_index=True)
+        st.caption(f"Page {page_number} of {page_count} · {total_rows:,} matching vessels")
+
+        # Summary stats
+        st.markdown("---")
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Total Vessels", summary['vessels'])
+        with col2:
+            st.metric("In Compliance", summary['in_compliance'])
+        with col3:
+            st.metric("With Overages", summary['overage'])
+        with col4:
+            st.metric("Total Chinook PSC", f"{summary['chinook_psc']:,}")
+
+    # ============================================================================
+    # BOARD REPORT PAGE
+    # ============================================================================
+    elif page == "🏛️ Board Report":
+        st.markdown('<div class="main-header">Board Summary Report – 2026 Rockfish Program</div>', unsafe_allow_html=True)
+        st.markdown('<div class="sub-header">Comprehensive fleet performance and program analytics</div>', unsafe_allow_html=True)
+
+        from rockfish import board_report
+
+        # Calculate metrics (lookups into the per-version rollup cube)
+        cube = demo_data.get_cube()
+        kpis = board_report.board_kpis(cube)
+
+        # Top KPI cards
+        for col, (label, value) in zip(st.columns(4), board_report.kpi_cards(kpis)):
+            with col:
+                st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">{label}</div>
+                <div class="metric-value">{value}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        st.markdown("---")
+
+        # PSC Summary and Program Compliance
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("### PSC Summary")
+            st.dataframe(board_report.psc_summary_table(kpis), hide_index=True, use_container_width=True)
+
+        with col2:
+            st.markdown("### Program Compliance")
+            st.dataframe(board_report.compliance_table(kpis), hide_index=True, use_container_width=True)
+
+        st.markdown("---")
+
+        # Charts
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("### Quota Usage by Cooperative (%)")
+            fig_coop = board_report.coop_usage_figure(board_report.coop_usage(cube))
+            st.plotly_chart(fig_coop, use_container_width=True)
+
+        with col2:
+            st.markdown("### PSC Usage Trend (Chinook)")
+            weekly_chinook = demo_data.get_harvest_series().trend('chinook_psc')
+            fig_psc = board_report.psc_trend_figure(weekly_chinook, kpis['chinook_cap'])
+            st.plotly_chart(fig_psc, use_container_width=True)
+
+        st.markdown("---")
+
+        # Which vessels and weeks drive bycatch (per-version rate grids, see psc.py)
+        st.markdown("### PSC Rates by Vessel")
+        psc_rates = demo_data.get_psc_rates()
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            species = st.radio("Species", options=list(PSC_LABELS), format_func=PSC_LABELS.get,
+                               horizontal=True, key="psc_rate_species")
+        with col2:
+            level = st.radio("Level", options=['vessel', 'cooperative'], format_func=str.title,
+                             horizontal=True, key="psc_rate_level")
+        with col3:
+            window = st.selectbox("Heatmap / hotspot window", options=[1, *RATE_WINDOWS],
+                                  format_func=lambda weeks: f"{weeks} week{'s' if weeks > 1 else ''}",
+                                  key="psc_rate_window")
+
+        ranking = psc_rates.ranking(species, level)
+
+        def ranking_table():
+            labels = ['Vessel', 'Cooperative'] if level == 'vessel' else ['Cooperative']
+            ranking_display = ranking.drop(columns='vessel_id', errors='ignore').round(1)
+            ranking_display.columns = labels + [
+                'Harvest (mt)', PSC_LABELS[species], 'Rate (per 1,000 mt)',
+                *[f'{weeks}-Week Rate' for weeks in RATE_WINDOWS], 'Percentile', 'Rank'
+            ]
+            return ranking_display
+
+        st.caption("Rates are PSC per 1,000 mt harvested; rolling rates cover the last weeks of the season. "
+                   "Click a column header to sort.")
+        st.dataframe(display.table(data, 'psc_ranking', ranking_table, species, level),
+                     use_container_width=True, hide_index=True, height=300)
+
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            st.markdown(f"#### Weekly {PSC_LABELS[species]} Rate")
+            heatmap = psc_rates.heatmap(species, window, level, top=25)
+            st.plotly_chart(board_report.psc_heatmap_figure(heatmap, PSC_LABELS[species]), use_container_width=True)
+            if level == 'vessel' and len(ranking) > len(heatmap):
+                st.caption(f"Top {len(heatmap)} of {len(ranking)} vessels by season rate")
+
+        with col2:
+            st.markdown("#### Hotspot Weeks")
+
+            def hotspots_table():
+                hotspots = psc_rates.hotspots(species, window)
+                return pd.DataFrame({
+                    'Vessel': hotspots['vessel_name'],
+                    'Week Ending': hotspots['week_ending'].dt.strftime('%Y-%m-%d'),
+                    'Harvest (mt)': hotspots['harvest_mt'],
+                    PSC_LABELS[species]: hotspots['psc'],
+                    'Rate': hotspots['rate'].round(1)
+                })
+
+            st.dataframe(display.table(data, 'psc_hotspots', hotspots_table, species, window),
+                         use_container_width=True, hide_index=True)
+
+    # ============================================================================
+    # TRANSFERS PAGE
+    # ============================================================================
+    elif page == "🔄 Transfers":
+        st.markdown('<div class="main-header">Quota Transfer Management</div>', unsafe_allow_html=True)
+        st.markdown('<div class="sub-header">Record and track quota transfers between vessels</div>', unsafe_allow_html=True)
+
+        # Transfer Entry Form
+        st.markdown("### Enter New Transfer")
+
+        vessels_df = data['vessels']
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            from_vessel = st.selectbox(
+                "From Vessel",
+                options=vessels_df['vessel_name'].tolist(),
+                key="from_vessel"
+            )
+
+        with col2:
+            to_vessel = st.selectbox(
+                "To Vessel",
+                options=[v for v in vessels_df['vessel_name'].tolist() if v != from_vessel],
+                key="to_vessel"
+            )
+
+        from_vessel_id = vessels_df.loc[vessels_df['vessel_name'] == from_vessel, 'vessel_id'].iloc[0]
+        to_vessel_id = vessels_df.loc[vessels_df['vessel_name'] == to_vessel, 'vessel_id'].iloc[0]
+        ledger = demo_data.get_ledger()
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            amount = st.number_input("Amount (mt)", min_value=0.0, max_value=1000.0, value=100.0, step=10.0)
+
+        with col2:
+            transfer_date = st.date_input(
+                "Transfer Date",
+                value=min(max(datetime.now().date(), ledger.start.date()), ledger.end.date()),
+                min_value=ledger.start.date(),
+                max_value=ledger.end.date()
+            )
+
+        with col3:
+            st.markdown("<br>", unsafe_allow_html=True)
+            record_clicked = st.button("Record Transfer", type="primary", use_container_width=True)
+
+        st.caption(
+            f"{from_vessel} balance on {transfer_date:%b %d, %Y}: "
+            f"**{ledger.balance(from_vessel_id, transfer_date):,.1f} mt**"
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            notes = st.text_area("Notes (optional)", placeholder="E.g., Pre-season quota optimization")
+
+        if record_clicked:
+            try:
+                snapshot = demo_data.record_transfer(from_vessel_id, to_vessel_id, amount, transfer_date, notes)
+                data = snapshot
+                ledger = demo_data.get_ledger(snapshot)
+                st.success(
+                    f"✅ Transfer recorded: {amount} mt from {from_vessel} to {to_vessel} "
+                    f"(data version {snapshot.version})"
+                )
+            except ValueError as e:
+                st.error(f"❌ {e}")
+
+        st.markdown("---")
+
+        # Batch transfers: validated together, netted and posted atomically
+        st.markdown("### Batch Transfers")
+        st.markdown(
+            f"Paste or edit a batch (e.g. pre-season). Offsetting transfers between the same vessels "
+            f"on the same day are netted; the batch is posted only if every row passes. Inter-cooperative "
+            f"transfers are capped at {INTER_COOP_CAP_PCT}% of a cooperative's allocation (net, per season)."
+        )
+        vessel_ids = vessels_df['vessel_id'].tolist()
+        batch = st.data_editor(
+            pd.DataFrame({
+                'from_vessel_id': vessel_ids[:2],
+                'to_vessel_id': vessel_ids[1:3],
+                'amount_mt': [50.0, 25.0],
+                'transfer_date': [ledger.start.date() + timedelta(days=60)] * 2,
+                'notes': ['Pre-season quota optimization'] * 2
+            }),
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={
+                'from_vessel_id': st.column_config.SelectboxColumn("From Vessel", options=vessel_ids, required=True),
+                'to_vessel_id': st.column_config.SelectboxColumn("To Vessel", options=vessel_ids, required=True),
+                'amount_mt': st.column_config.NumberColumn("Amount (mt)", min_value=0.0, step=10.0, required=True),
+                'transfer_date': st.column_config.DateColumn("Transfer Date", required=True),
+                'notes': st.column_config.TextColumn("Notes")
+            },
+            key="batch_transfers"
+        )
+
+        col1, col2, _ = st.columns([1, 1, 2])
+        with col1:
+            validate_clicked = st.button("Validate Batch", use_container_width=True)
+        with col2:
+            apply_clicked = st.button("Apply Batch", type="primary", use_container_width=True)
+
+        if validate_clicked or apply_clicked:
+            batch = batch.dropna(subset=['from_vessel_id', 'to_vessel_id']).reset_index(drop=True)
+            if apply_clicked:
+                snapshot, report, netted = demo_data.record_transfers(batch)
+            else:
+                snapshot = None
+                report, netted = validate_transfers(
+                    batch, data['vessels'], demo_data.get_ledger(), data['transfers']
+                )
+
+            failed = report[report['error'] != '']
+            if len(failed):
+                st.error(f"❌ {len(failed)} of {len(report)} rows failed validation - nothing was posted")
+                st.dataframe(failed, use_container_width=True, hide_index=True)
+            elif snapshot is not None:
+                data = snapshot
+                ledger = demo_data.get_ledger(snapshot)
+                st.success(
+                    f"✅ Posted {len(netted)} netted transfers from {len(report)} rows "
+                    f"(data version {snapshot.version})"
+                )
+            elif apply_clicked:
+                st.warning(f"⚠️ The {len(report)} rows net to zero - nothing was posted")
+            else:
+                st.success(f"✅ All {len(report)} rows valid - {len(netted)} transfers after netting")
+
+            if len(netted) and not len(failed):
+                st.dataframe(netted.drop(columns='source_rows'), use_container_width=True, hide_index=True)
+
+        st.markdown("---")
+
+        # Suggested transfers that clear projected (season-end) overages
+        st.markdown("### Recommended Transfers")
+        st.markdown(
+            "Vessels projected to end the season short of quota are matched to vessels with spare balance, "
+            "within their cooperative first, then across cooperatives within the inter-cooperative cap."
+        )
+        buffer_pct = st.select_slider(
+            "Target season-end balance (% of quota held)",
+            options=[0, 1, 2, 5, 10],
+            value=0,
+            help="0 clears overages; 5 also clears Near Overage vessels",
+            key="recommend_buffer"
+        )
+        recommend_date, recommended, shortfall = demo_data.get_transfer_recommendations(buffer_pct)
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Suggested Transfers", len(recommended))
+        with col2:
+            st.metric("Volume", f"{recommended['amount_mt'].sum():,.1f} mt")
+        with col3:
+            st.metric("Inter-Cooperative", int((recommended['scope'] == 'Inter-cooperative').sum()))
+
+        if shortfall.empty:
+            st.caption(f"Transfers dated {recommend_date:%b %d, %Y}; every vessel reaches the target.")
+        else:
+            st.warning(
+                f"⚠️ {len(shortfall)} vessels stay {shortfall.sum():,.1f} mt short: not enough spare quota "
+                f"within the cooperative rules"
+            )
+
+        if len(recommended):
+            names = vessels_df.set_index('vessel_id')['vessel_name']
+            recommended_display = pd.DataFrame({
+                'From Vessel': recommended['from_vessel_id'].map(names),
+                'To Vessel': recommended['to_vessel_id'].map(names),
+                'Amount (mt)': recommended['amount_mt'],
+                'Scope': recommended['scope']
+            })
+            st.dataframe(recommended_display, use_container_width=True, hide_index=True, height=250)
+
+            if st.button("Apply Recommendations", type="primary", key="apply_recommendations"):
+                snapshot, report, netted = demo_data.record_transfers(recommended.drop(columns='scope'))
+                if snapshot is None:
+                    failed = report[report['error'] != '']
+                    st.error(f"❌ {len(failed)} suggested transfers failed validation - nothing was posted")
+                    st.dataframe(failed, use_container_width=True, hide_index=True)
+                else:
+                    data = snapshot
+                    ledger = demo_data.get_ledger(snapshot)
+                    st.success(f"✅ Posted {len(netted)} transfers (data version {snapshot.version})")
+
+        st.markdown("---")
+
+        # As-of-date balances from the ledger
+        st.markdown("### Quota Balances As Of")
+        as_of = st.date_input(
+            "Balance date",
+            value=ledger.end.date(),
+            min_value=ledger.start.date(),
+            max_value=ledger.end.date(),
+            key="balance_as_of"
+        )
+
+        def balances_table():
+            balances = demo_data.get_ledger(data).fleet_balances(as_of).merge(
+                data['vessels'][['vessel_id', 'vessel_name', 'cooperative_name']], on='vessel_id'
+            )
+            balances_display = balances[['vessel_name', 'cooperative_name', 'allocation_mt', 'net_transfers_mt',
+                                         'harvest_mt', 'balance_mt']].round(1)
+            balances_display.columns = ['Vessel', 'Cooperative', 'Allocation (mt)', 'Net Transfers (mt)',
+                                        'Harvest (mt)', 'Balance (mt)']
+            return balances_display
+
+        st.dataframe(display.table(data, 'balances', balances_table, as_of),
+                     use_container_width=True, hide_index=True, height=300)
+
+        st.markdown("---")
+
+        # Transfer History
+        st.markdown("### Transfer History")
+
+        transfers_df = data['transfers']
+
+        def transfers_table():
+            display_transfers = transfers_df[['transfer_date', 'from_vessel_name', 'to_vessel_name',
+                                              'amount_mt', 'notes']].copy()
+            display_transfers.columns = ['Date', 'From Vessel', 'To Vessel', 'Amount (mt)', 'Notes']
+            display_transfers['Date'] = pd.to_datetime(display_transfers['Date']).dt.strftime('%Y-%m-%d')
+            return display_transfers
+
+        st.dataframe(display.table(data, 'transfer_history', transfers_table),
+                     use_container_width=True, hide_index=True, height=400)
+
+        # Summary
+        st.markdown("---")
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("Total Transfers", len(transfers_df))
+        with col2:
+            total_transferred = transfers_df['amount_mt'].sum()
+            st.metric("Total Volume Transferred", f"{total_transferred:,.0f} mt")
+        with col3:
+            inter_coop_transfers = len(transfers_df[
+                transfers_df['from_cooperative'] != transfers_df['to_cooperative']
+            ])
+            st.metric("Inter-Cooperative Transfers", inter_coop_transfers)
+
+    # ============================================================================
+    # FISH TICKETS PAGE
+    # ============================================================================
+    elif page == "📤 Fish Tickets":
+        st.markdown('<div class="main-header">Fish Ticket Import</div>', unsafe_allow_html=True)
+        st.markdown(
+            '<div class="sub-header">Post landed fish tickets to harvest-to-date, PSC counts and vessel status</div>',
+            unsafe_allow_html=True
+        )
+
+        uploaded_file = st.file_uploader(
+            "Choose a fish ticket CSV",
+            type=['csv'],
+            help="eLandings fish ticket export, one row per landing"
+        )
+
+        if uploaded_file:
+            st.markdown("### Data Preview (first 10 rows)")
+            try:
+                st.dataframe(pd.read_csv(uploaded_file, nrows=10), use_container_width=True, hide_index=True)
+            except (ValueError, pd.errors.ParserError) as e:
+                st.error(f"❌ Error reading file: {e}")
+            uploaded_file.seek(0)
+
+            if st.button("Import Tickets", type="primary"):
+                with st.spinner("Posting tickets..."):
+                    snapshot, accepted, skipped, error = demo_data.ingest_fish_ticket_csv(uploaded_file)
+                if snapshot is not None:
+                    data = snapshot
+                if error is None:
+                    st.success(f"✅ Posted {accepted:,} tickets ({skipped:,} already posted, skipped)")
+                else:
+                    st.error(f"❌ Import stopped at {error}. Nothing from there on was posted.")
+                    if accepted or skipped:
+                        st.warning(
+                            f"⚠️ Earlier rows were posted: {accepted:,} tickets ({skipped:,} already posted, "
+                            "skipped). Fix the file and import it again; posted tickets will be skipped."
+                        )
+        else:
+            st.info("📁 No file uploaded yet. Upload a CSV, or post a batch from the sample feed below.")
+
+            with st.expander("ℹ️ Expected File Format"):
+                st.markdown("""
+            **Required columns:**
+            - `ticket_id` - Fish ticket number (tickets already posted are skipped)
+            - `vessel_id` - Vessel identifier (e.g., V-001)
+            - `landing_date` - Date of landing (YYYY-MM-DD), within an A or B season fishing week
+            - `harvest_mt` - Rockfish landed (metric tons)
+
+            **Optional columns:**
+            - `chinook_psc` - Chinook salmon PSC count
+            - `halibut_psc` - Halibut PSC count
+            """)
+
+        col1, col2, _ = st.columns([1, 1, 2])
+        with col1:
+            st.download_button(
+                "📥 Sample Ticket CSV",
+                data=demo_data.sample_fish_tickets().to_csv(index=False),
+                file_name="rockfish_fish_tickets_sample.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+        with col2:
+            if st.button("Post Sample Batch", use_container_width=True):
+                snapshot, accepted = demo_data.ingest_fish_tickets(demo_data.sample_fish_tickets())
+                data = snapshot or data
+                st.success(f"✅ Posted {len(accepted)} sample tickets (data version {data.version})")
+
+        st.markdown("---")
+
+        # Running totals (patched per batch, see ingest.py)
+        st.markdown("### Running Totals by Cooperative")
+        totals = demo_data.get_harvest_totals(data)
+        cooperatives_display = totals.cooperatives().round(1)
+        cooperatives_display.columns = ['Cooperative', 'Harvest (mt)', 'Chinook PSC', 'Halibut PSC', 'Quota (mt)',
+                                        'Balance (mt)', 'Status']
+        st.dataframe(cooperatives_display, use_container_width=True, hide_index=True)
+
+        tickets_df = data['fish_tickets']
+        st.markdown(f"### Posted Tickets ({len(tickets_df):,})")
+        if tickets_df.empty:
+            st.caption("No fish tickets posted yet in this session's data version.")
+        else:
+            def recent_tickets():
+                return tickets_df.tail(100).iloc[::-1][['ticket_id', 'vessel_name', 'cooperative_name', 'landing_date',
+                                                        'week_ending', 'harvest_mt', 'chinook_psc', 'halibut_psc']]
+
+            st.dataframe(display.table(data, 'recent_tickets', recent_tickets),
+                         use_container_width=True, hide_index=True, height=300)
+
+    # Footer
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("*Demo Platform for Fisherman First LLC*")
+    st.sidebar.markdown("*CGOA Rockfish Program Manager Proposal*")
+
+
+def main():
+    """
+    One script run of the dashboard: the login page until the session is
+    authenticated, then the sidebar and selected page
+
+    The page runs inside try/finally, so the profiler is stopped and the page
+    timing recorded even when a page raises or ends the run early (st.rerun,
+    st.stop).
+    """
+    # Timings recorded by this script run are exported as rockfish_*
+    metrics.set_prefix('rockfish')
+
+    # Initialize session state
+    if 'authenticated' not in st.session_state:
+        st.session_state.authenticated = False
+        st.session_state.user_name = None
+        st.session_state.username = None
+
+    if not st.session_state.authenticated:
+        login_page()
+        return
+
+    # Profile this whole rerun if requested (?profile=1 or the admin sidebar toggle)
+    run_profiler = profiling.RunProfiler().start() if profiling.profiling_requested() else None
+    try:
+        render_dashboard()
+    finally:
+        metrics.end_page()
+        metrics.write_metrics_file()
+        if run_profiler:
+            run_profiler.stop()
+
+    if run_profiler:
+        run_profiler.render('rockfish')
+
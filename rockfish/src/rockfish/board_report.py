@@ -0,0 +1,425 @@
+"""
+Board Report computations and the offline report bundle
+
+The Board Report page and the batch job share these functions: KPIs are
+lookups into the rollup cube (cube.py) and both charts are built here. Run
+headless to write a self-contained HTML report (figures embedded, plotly.js
+inlined once) and an Excel workbook of the underlying tables:
+
+    PYTHONPATH=src python -m rockfish.board_report --out reports --jobs 4
+
+Cooperative sections and the workbook are rendered in parallel worker
+processes. Outputs are cached under <out>/<fingerprint>/, a hash of the data
+tables' contents, so a repeated request for unchanged data only reads the
+existing files.
+"""
+
+import argparse
+import hashlib
+import html
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from dashboard_common.metrics import timed
+from dashboard_common.snapshot import SnapshotStore
+
+from rockfish import demo_data
+from rockfish.forecast import PSC_CAPS
+
+# Bump when the report layout changes, so cached bundles are regenerated
+BUNDLE_VERSION = 3
+
+HTML_NAME = 'board_report.html'
+XLSX_NAME = 'board_report.xlsx'
+
+# Demo figure (see the Board Report page)
+TOTAL_FORFEITURES = 18500
+
+VESSEL_COLUMNS = {
+    'vessel_name': 'Vessel', 'vessel_id': 'Vessel ID', 'cq_allocation_mt': 'Allocation (mt)',
+    'harvest_to_date_mt': 'Harvested (mt)', 'quota_balance_mt': 'Balance (mt)',
+    'chinook_psc_count': 'Chinook PSC', 'halibut_psc_count': 'Halibut PSC', 'status': 'Status'
+}
+
+REPORT_CSS = """
+body { font-family: -apple-system, 'Segoe UI', Roboto, sans-serif; margin: 2rem auto; max-width: 1200px; color: #0F172A; }
+h1 { color: #0E7490; margin-bottom: 0.25rem; }
+h2 { color: #0E7490; border-bottom: 2px solid #E2E8F0; padding-bottom: 0.25rem; margin-top: 2.5rem; }
+.sub-header { color: #64748B; margin-bottom: 2rem; }
+.cards { display: flex; gap: 1rem; margin-bottom: 1.5rem; }
+.metric-card { flex: 1; background-color: #0E7490; padding: 1.25rem; border-radius: 0.5rem; color: white; }
+.metric-label { font-size: 0.875rem; opacity: 0.9; }
+.metric-value { font-size: 1.6rem; font-weight: 700; margin-top: 0.5rem; }
+.columns { display: flex; gap: 2rem; }
+.columns > div { flex: 1; min-width: 0; }
+table { border-collapse: collapse; width: 100%; font-size: 0.875rem; }
+th, td { border-bottom: 1px solid #E2E8F0; padding: 0.35rem 0.5rem; text-align: left; }
+th { background-color: #F1F5F9; }
+footer { color: #64748B; font-size: 0.75rem; margin-top: 3rem; }
+"""
+
+
+# ============================================================================
+# SHARED COMPUTATIONS (Board Report page and batch job)
+# ============================================================================
+
+def board_kpis(cube):
+    """Fleet KPIs for the Board Report, as a dict of plain numbers"""
+    fleet = cube.fleet()
+    total_vessels = int(fleet['vessels'])
+    total_quota = float(fleet['cq_allocation_mt'])
+    total_harvested = float(fleet['harvest_to_date_mt'])
+    total_chinook = int(fleet['chinook_psc_count'])
+    total_halibut = int(fleet['halibut_psc_count'])
+    vessels_in_compliance = int(fleet['in_compliance'])
+
+    return {
+        'total_vessels': total_vessels,
+        'total_quota': total_quota,
+        'total_harvested': total_harvested,
+        'fleet_harvested_pct': total_harvested / total_quota * 100,
+        'overage_mt': float(fleet['overage_mt']),
+        'total_forfeitures': TOTAL_FORFEITURES,
+        'total_chinook': total_chinook,
+        'chinook_cap': PSC_CAPS['chinook_psc'],
+        'chinook_pct': total_chinook / PSC_CAPS['chinook_psc'] * 100,
+        'total_halibut': total_halibut,
+        'halibut_cap': PSC_CAPS['halibut_psc'],
+        'halibut_pct': total_halibut / PSC_CAPS['halibut_psc'] * 100,
+        'fleet_psc_rate': total_chinook / total_harvested * 1000,  # Chinook per 1000mt
+        'vessels_in_compliance': vessels_in_compliance,
+        'vessels_with_overages': int(fleet['overage']),
+        'settlement_rate': vessels_in_compliance / total_vessels * 100
+    }
+
+
+def kpi_cards(kpis):
+    """(label, value) pairs for the top KPI cards"""
+    return [
+        ('Total Vessels', f"{kpis['total_vessels']}"),
+        ('Total Quota', f"{kpis['total_quota']:,.0f} mt"),
+        ('Fleet Harvested', f"{kpis['fleet_harvested_pct']:.0f}%"),
+        ('Total Forfeitures', f"${kpis['total_forfeitures']:,}")
+    ]
+
+
+def psc_summary_table(kpis):
+    return pd.DataFrame({
+        'Metric': ['Chinook PSC Used:', 'Halibut PSC Used:', 'Fleet PSC Rate:'],
+        'Value': [
+            f"{kpis['total_chinook']:,} / {kpis['chinook_cap']:,} ({kpis['chinook_pct']:.0f}%)",
+            f"{kpis['total_halibut']:,} / {kpis['halibut_cap']:,} ({kpis['halibut_pct']:.0f}%)",
+            f"{kpis['fleet_psc_rate']:.1f} Chinook per 1,000 mt"
+        ]
+    })
+
+
+def compliance_table(kpis):
+    return pd.DataFrame({
+        'Metric': ['Vessels in Compliance:', 'Vessels with Overages:', 'Settlement Rate:'],
+        'Value': [
+            f"{kpis['vessels_in_compliance']} / {kpis['total_vessels']}",
+            f"{kpis['vessels_with_overages']}",
+            f"{kpis['settlement_rate']:.1f}%"
+        ]
+    })
+
+
+def coop_usage(cube):
+    """Harvest, allocation and usage % per cooperative"""
+    usage = cube.cooperatives()[['harvest_to_date_mt', 'cq_allocation_mt']].reset_index()
+    usage['usage_pct'] = (usage['harvest_to_date_mt'] / usage['cq_allocation_mt']) * 100
+    return usage
+
+
+def coop_usage_figure(usage):
+    fig = go.Figure(data=[
+        go.Bar(
+            x=usage['cooperative_name'],
+            y=usage['usage_pct'],
+            marker_color='#0E7490',
+            text=usage['usage_pct'].round(0).astype(str) + '%',
+            textposition='outside'
+        )
+    ])
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="Usage %",
+        showlegend=False,
+        height=300,
+        margin=dict(t=20, b=20),
+        xaxis_tickangle=-15
+    )
+    return fig
+
+
+def psc_trend_figure(weekly, cap):
+    """Cumulative Chinook PSC with the (fleet or cooperative) cap line"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=weekly['week_ending'],
+        y=weekly['cumulative'],
+        mode='lines+markers',
+        name='Cumulative Chinook',
+        line=dict(color='#0E7490', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(14, 116, 144, 0.1)'
+    ))
+
+    fig.add_hline(
+        y=cap,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Cap: {cap:,.0f}",
+        annotation_position="right"
+    )
+
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="Cumulative Chinook PSC",
+        showlegend=False,
+        height=300,
+        margin=dict(t=20, b=20)
+    )
+    return fig
+
+
+def psc_heatmap_figure(heatmap, label):
+    """Vessel (or cooperative) x week PSC rate heatmap (see psc.PscRates.heatmap)"""
+    fig = go.Figure(data=go.Heatmap(
+        z=heatmap.to_numpy(),
+        x=heatmap.columns,
+        y=heatmap.index,
+        colorscale='YlOrRd',
+        colorbar=dict(title='per 1,000 mt'),
+        hovertemplate=f'%{{y}}<br>Week ending %{{x|%b %d}}<br>{label}: %{{z:.1f}} per 1,000 mt<extra></extra>'
+    ))
+    fig.update_layout(
+        xaxis_title="",
+        yaxis=dict(autorange='reversed'),
+        height=max(300, 22 * len(heatmap) + 80),
+        margin=dict(t=20, b=20)
+    )
+    return fig
+
+
+# ============================================================================
+# OFFLINE BUNDLE
+# ============================================================================
+
+def data_fingerprint(snapshot):
+    """Content hash of a snapshot's tables (and the bundle layout version)"""
+    digest = hashlib.sha256(f'bundle-v{BUNDLE_VERSION}'.encode())
+    for name in sorted(snapshot.keys()):
+        digest.update(name.encode())
+        digest.update(pd.util.hash_pandas_object(snapshot[name], index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _figure_html(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+
+def _table_html(df):
+    return df.to_html(index=False, border=0, float_format=lambda value: f'{value:,.1f}', escape=True)
+
+
+def _cards_html(cards):
+    return '<div class="cards">' + ''.join(
+        f'<div class="metric-card"><div class="metric-label">{html.escape(label)}</div>'
+        f'<div class="metric-value">{html.escape(value)}</div></div>'
+        for label, value in cards
+    ) + '</div>'
+
+
+def render_cooperative(name, vessels, weekly_chinook, chinook_cap):
+    """
+    HTML section for one cooperative (runs in a worker process)
+
+    Args:
+        name: cooperative name
+        vessels: the cooperative's rows of the vessels table
+        weekly_chinook: the cooperative's Chinook trend (HarvestSeries.trend)
+        chinook_cap: the cooperative's share of the Chinook cap
+    """
+    quota = vessels['cq_allocation_mt'].sum()
+    harvested = vessels['harvest_to_date_mt'].sum()
+    cards = [
+        ('Vessels', f'{len(vessels)}'),
+        ('Quota', f'{quota:,.0f} mt'),
+        ('Harvested', f'{harvested / quota * 100:.0f}%'),
+        ('Chinook PSC', f"{int(vessels['chinook_psc_count'].sum()):,} / {chinook_cap:,.0f}")
+    ]
+    table = vessels[list(VESSEL_COLUMNS)].rename(columns=VESSEL_COLUMNS).sort_values('Vessel')
+    trend = psc_trend_figure(weekly_chinook, chinook_cap)
+
+    return (
+        f'<section><h2>{html.escape(name)}</h2>{_cards_html(cards)}'
+        f'<div class="columns"><div>{_table_html(table)}</div><div>{_figure_html(trend)}</div></div></section>'
+    )
+
+
+def _cell(value):
+    """Plain Python value for openpyxl (NaN/NaT -> empty cell)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_workbook(path, sheets):
+    """
+    Write {sheet title: DataFrame} to an .xlsx in openpyxl write-only mode
+    (rows are streamed to disk, so memory stays flat for large tables)
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for title, df in sheets.items():
+        sheet = workbook.create_sheet(title=title)
+        sheet.append([str(column) for column in df.columns])
+        for row in df.itertuples(index=False, name=None):
+            sheet.append([_cell(value) for value in row])
+
+    tmp_path = f'{path}.tmp'
+    workbook.save(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _write_text(path, text):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def render_html(kpis, usage, weekly, sections, fingerprint):
+    """Self-contained report page: plotly.js is inlined once for all figures"""
+    from plotly.offline import get_plotlyjs
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Board Summary Report – 2026 Rockfish Program</title>
+<style>{REPORT_CSS}</style>
+<script type="text/javascript">{get_plotlyjs()}</script>
+</head>
+<body>
+<h1>Board Summary Report – 2026 Rockfish Program</h1>
+<div class="sub-header">Comprehensive fleet performance and program analytics</div>
+{_cards_html(kpi_cards(kpis))}
+<div class="columns">
+<div><h2>PSC Summary</h2>{_table_html(psc_summary_table(kpis))}</div>
+<div><h2>Program Compliance</h2>{_table_html(compliance_table(kpis))}</div>
+</div>
+<div class="columns">
+<div><h2>Quota Usage by Cooperative (%)</h2>{_figure_html(coop_usage_figure(usage))}</div>
+<div><h2>PSC Usage Trend (Chinook)</h2>{_figure_html(psc_trend_figure(weekly, kpis['chinook_cap']))}</div>
+</div>
+{''.join(sections)}
+<footer>Generated {datetime.now():%Y-%m-%d %H:%M} · data {fingerprint}</footer>
+</body>
+</html>
+"""
+
+
+@timed()
+def build_bundle(snapshot, out_dir, jobs=None, force=False):
+    """
+    Write (or reuse) the HTML report and workbook for a data snapshot
+
+    Args:
+        snapshot: data snapshot (see snapshot.py)
+        out_dir: root directory; the bundle goes in out_dir/<fingerprint>/
+        jobs: worker processes (default: CPU count; 1 renders in-process)
+        force: regenerate even if the bundle for this data already exists
+
+    Returns:
+        (html_path, xlsx_path, cached)
+    """
+    fingerprint = data_fingerprint(snapshot)
+    bundle_dir = os.path.join(out_dir, fingerprint)
+    html_path = os.path.join(bundle_dir, HTML_NAME)
+    xlsx_path = os.path.join(bundle_dir, XLSX_NAME)
+    if not force and os.path.exists(html_path) and os.path.exists(xlsx_path):
+        return html_path, xlsx_path, True
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    cube = demo_data.get_cube(snapshot)
+    kpis = board_kpis(cube)
+    usage = coop_usage(cube)
+    series = demo_data.get_harvest_series(snapshot)
+    weekly = series.trend('chinook_psc')
+    vessels = snapshot['vessels']
+    by_coop_week = cube.weekly('cooperative_name', 'week_ending')
+
+    sheets = {
+        'Summary': pd.concat([psc_summary_table(kpis), compliance_table(kpis)], ignore_index=True),
+        'Cooperatives': cube.cooperatives().reset_index(),
+        'Vessels': vessels,
+        'Weekly PSC': by_coop_week.reset_index(),
+        'Weekly Harvest': snapshot['weekly_harvest'],
+        'Transfers': snapshot['transfers']
+    }
+
+    tasks = []
+    for name, row in cube.cooperatives().iterrows():
+        coop_vessels = vessels[vessels['cooperative_name'] == name]
+        tasks.append(partial(
+            render_cooperative, name, coop_vessels,
+            series.trend('chinook_psc', vessel_ids=coop_vessels['vessel_id']),
+            kpis['chinook_cap'] * row['cq_allocation_mt'] / kpis['total_quota']
+        ))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+            workbook = pool.submit(write_workbook, xlsx_path, sheets)
+            sections = list(pool.map(_call, tasks))
+            workbook.result()
+    else:
+        write_workbook(xlsx_path, sheets)
+        sections = [task() for task in tasks]
+
+    _write_text(html_path, render_html(kpis, usage, weekly, sections, fingerprint))
+    return html_path, xlsx_path, False
+
+
+def _call(task):
+    return task()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render the Rockfish Board Report to HTML and XLSX')
+    parser.add_argument('--out', default='reports', help='output root directory (default: reports)')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=None, help='demo data seed')
+    parser.add_argument('--scale', type=int, default=1, help='demo fleet size multiplier')
+    parser.add_argument('--force', action='store_true', help='regenerate even if cached')
+    args = parser.parse_args(argv)
+
+    seed = demo_data.DEMO_SEED if args.seed is None else args.seed
+    snapshot = SnapshotStore(partial(demo_data.load_demo_data, seed=seed, scale=args.scale)).latest()
+    html_path, xlsx_path, cached = build_bundle(snapshot, args.out, args.jobs, args.force)
+
+    print(f"{'Cached' if cached else 'Wrote'}: {html_path}")
+    print(f"{'Cached' if cached else 'Wrote'}: {xlsx_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
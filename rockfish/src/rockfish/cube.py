@@ -0,0 +1,114 @@
+"""
+Pre-aggregated rollup cube for the Board Report and Dashboard KPIs
+
+Two fact tables are rolled up once per data version:
+
+    vessel facts - allocation, harvest to date, balance, overage, PSC counts
+                   and status counts, by cooperative and for the fleet
+    weekly facts - harvest, Chinook and halibut by every combination of
+                   cooperative x week x season (vessel is the base grain)
+
+Pages read KPIs with lookups (`cube.fleet()['cq_allocation_mt']`,
+`cube.weekly('week_ending')`) instead of re-aggregating the raw frames on every
+rerun. New weekly rows are folded into every materialized rollup by
+`append_weeks`, and vessel changes (e.g. transfers) only rebuild the small
+vessel rollups via `with_vessels`; both return a new cube, leaving the one in
+the current snapshot untouched.
+"""
+
+from itertools import combinations
+
+from dashboard_common.metrics import timed
+
+WEEKLY_DIMENSIONS = ('cooperative_name', 'week_ending', 'season')
+WEEKLY_MEASURES = ['harvest_mt', 'chinook_psc', 'halibut_psc']
+
+VESSEL_MEASURES = [
+    'vessels', 'cq_allocation_mt', 'harvest_to_date_mt', 'quota_balance_mt', 'overage_mt',
+    'chinook_psc_count', 'halibut_psc_count', 'in_compliance', 'near_overage', 'overage'
+]
+STATUS_COLUMNS = {'In Compliance': 'in_compliance', 'Near Overage': 'near_overage', 'Overage': 'overage'}
+
+
+def _groupings():
+    """Every subset of the weekly dimensions, in canonical order"""
+    return [dims for size in range(len(WEEKLY_DIMENSIONS) + 1) for dims in combinations(WEEKLY_DIMENSIONS, size)]
+
+
+def _aggregate(weekly_df, dims):
+    if not dims:
+        return weekly_df[WEEKLY_MEASURES].sum().to_frame().T
+    return weekly_df.groupby(list(dims), sort=True)[WEEKLY_MEASURES].sum()
+
+
+def _vessel_facts(vessels_df):
+    facts = vessels_df[['cooperative_name', 'cq_allocation_mt', 'harvest_to_date_mt', 'quota_balance_mt',
+                        'chinook_psc_count', 'halibut_psc_count']].assign(
+        vessels=1,
+        overage_mt=(-vessels_df['quota_balance_mt']).clip(lower=0),
+        **{column: (vessels_df['status'] == status).astype(int) for status, column in STATUS_COLUMNS.items()}
+    )
+    return facts
+
+
+class RollupCube:
+    """Materialized vessel and weekly rollups for one data version"""
+
+    def __init__(self, vessels_df, weekly_df):
+        self._set_vessels(vessels_df)
+        self._dimension_dtypes = weekly_df[list(WEEKLY_DIMENSIONS)].dtypes.to_dict()
+        self._weekly = {dims: _aggregate(weekly_df, dims) for dims in _groupings()}
+
+    def _set_vessels(self, vessels_df):
+        facts = _vessel_facts(vessels_df)
+        self._fleet = facts[VESSEL_MEASURES].sum()
+        self._by_cooperative = facts.groupby('cooperative_name', sort=True)[VESSEL_MEASURES].sum()
+
+    def fleet(self):
+        """Fleet totals of the vessel measures (Series keyed by VESSEL_MEASURES)"""
+        return self._fleet.copy()
+
+    def cooperatives(self):
+        """Vessel measures per cooperative (indexed by cooperative_name)"""
+        return self._by_cooperative.copy(deep=False)
+
+    def weekly(self, *dims):
+        """Weekly measures rolled up to the given dimensions (any order)"""
+        unknown = set(dims) - set(WEEKLY_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown cube dimensions: {', '.join(sorted(unknown))}")
+        key = tuple(dim for dim in WEEKLY_DIMENSIONS if dim in dims)
+        return self._weekly[key].copy(deep=False)
+
+    def _clone(self):
+        cube = object.__new__(RollupCube)
+        cube.__dict__.update(self.__dict__)
+        return cube
+
+    def with_vessels(self, vessels_df):
+        """New cube with the vessel rollups rebuilt and weekly rollups shared"""
+        cube = self._clone()
+        cube._set_vessels(vessels_df)
+        return cube
+
+    @timed()
+    def append_weeks(self, new_weekly_rows):
+        """New cube with weekly rows folded into every materialized rollup"""
+        # Keys must have the cube's dtypes (e.g. ticket rows carry object
+        # strings), or the combined rollups end up with object indexes
+        new_weekly_rows = new_weekly_rows.astype(self._dimension_dtypes)
+        cube = self._clone()
+        cube._weekly = {}
+        for dims, rollup in self._weekly.items():
+            delta = _aggregate(new_weekly_rows, dims)
+            if not dims:
+                delta.index = rollup.index
+            combined = rollup.add(delta, fill_value=0).astype(rollup.dtypes.to_dict())
+            cube._weekly[dims] = combined.sort_index()
+        return cube
+
+
+@timed()
+def build_cube(vessels_df, weekly_df):
+    """Roll up a data version's vessel and weekly tables"""
+    return RollupCube(vessels_df, weekly_df)
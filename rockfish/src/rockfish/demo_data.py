@@ -0,0 +1,616 @@
+"""
+Demo data generator for CGOA Rockfish Program Analytics Dashboard
+Based on real program structure from RFP
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+import threading
+
+from dashboard_common.metrics import timed
+from dashboard_common.snapshot import SnapshotStore
+
+from rockfish.alerts import generate_alerts
+from rockfish.cube import build_cube
+from rockfish.forecast import forecast_psc
+from rockfish.ingest import (build_harvest_totals, empty_tickets, harvest_to_date, normalize_tickets, quota_status,
+                             read_tickets, season_weeks, weekly_rows)
+from rockfish.ledger import SEASON_START, build_ledger
+from rockfish.psc import build_psc_rates
+from rockfish.timeseries import build_harvest_series
+from rockfish.transfers import recommend_transfers, validate_transfers
+from rockfish.vessel_index import VesselIndex
+
+# Seed for reproducible demo data (passed to an explicit np.random.Generator)
+DEMO_SEED = 42
+
+# Real cooperative names from RFP
+COOPERATIVES = [
+    "North Pacific Rockfish Cooperative",
+    "OBSI Rockfish Cooperative",
+    "Silver Bay Seafoods Rockfish Cooperative",
+    "Star of Kodiak Rockfish Cooperative"
+]
+
+# Vessel names (realistic Alaska fishing vessel names)
+VESSEL_NAMES = [
+    "Pacific Storm", "Kodiak Queen", "Northern Star", "Ocean Harvester", "Sea Wolf",
+    "Arctic Prowler", "Golden Tide", "Blue Horizon", "Midnight Sun", "Silver Bay",
+    "Thunder Bay", "Ocean Pride", "Alaska Spirit", "Neptune's Bounty", "Sea Hawk",
+    "Pacific Challenger", "Bering Star", "Kodiak Explorer", "Ocean Venture", "Sea Lion",
+    "North Wind", "Pacific Triumph"
+]
+
+# Vessels per cooperative and cooperative allocations (mt) at scale=1
+COOP_VESSEL_COUNTS = [6, 7, 5, 4]       # Sums to 22 vessels
+COOP_ALLOCATIONS = [6500, 7200, 5800, 5500]  # Sums to 25,000 mt
+
+
+def generate_cooperatives(scale=1):
+    """Generate cooperative data"""
+    return pd.DataFrame({
+        'cooperative_id': [f'COOP-{i+1}' for i in range(4)],
+        'cooperative_name': COOPERATIVES,
+        'processor': ['Processor A', 'Processor B', 'Processor C', 'Processor D'],
+        'total_allocation_mt': [a * scale for a in COOP_ALLOCATIONS],
+        'member_count': [n * scale for n in COOP_VESSEL_COUNTS]
+    })
+
+
+def vessel_name(vessel_idx):
+    """Vessel name for a fleet position (numbered once the name list runs out)"""
+    name = VESSEL_NAMES[vessel_idx % len(VESSEL_NAMES)]
+    lap = vessel_idx // len(VESSEL_NAMES)
+    return f"{name} {lap + 1}" if lap else name
+
+
+def generate_vessels(rng, scale=1):
+    """Generate vessel data with allocations (drawn per cooperative in bulk)"""
+    frames = []
+    vessel_idx = 0
+
+    for coop_idx, (coop_name, vessel_count, total_allocation) in enumerate(
+        zip(COOPERATIVES, COOP_VESSEL_COUNTS, COOP_ALLOCATIONS)
+    ):
+        vessel_count *= scale
+        total_allocation *= scale
+
+        # Random allocations that sum to cooperative total
+        allocation = rng.dirichlet(np.ones(vessel_count)) * total_allocation
+
+        # Harvest between 60-105% of allocation (some overages)
+        harvest = allocation * rng.uniform(0.60, 1.05, vessel_count)
+
+        # PSC roughly proportional to harvest with some variation
+        chinook_rate = rng.uniform(28, 50, vessel_count)  # Chinook per 1000mt
+        halibut_rate = rng.uniform(15, 35, vessel_count)  # Halibut per 1000mt
+
+        positions = range(vessel_idx, vessel_idx + vessel_count)
+        frames.append(pd.DataFrame({
+            'vessel_id': [f'V-{i+1:03d}' for i in positions],
+            'vessel_name': [vessel_name(i) for i in positions],
+            'cooperative_id': f'COOP-{coop_idx+1}',
+            'cooperative_name': coop_name,
+            'cq_allocation_mt': allocation.round(1),
+            'harvest_to_date_mt': harvest.round(1),
+            'quota_balance_mt': (allocation - harvest).round(1),
+            'chinook_psc_count': (harvest / 1000 * chinook_rate).astype(int),
+            'halibut_psc_count': (harvest / 1000 * halibut_rate).astype(int),
+            'status': quota_status(harvest, allocation)
+        }))
+        vessel_idx += vessel_count
+
+    return pd.concat(frames, ignore_index=True)
+
+# (start month, start day, weeks, weekly pattern, share of annual totals) per season
+SEASONS = {
+    'A': (4, 1, 13, 'ramp_up', 0.80),     # April 1 - June 30
+    'B': (10, 15, 5, 'decline', 0.20),    # October 15 - November 15
+}
+
+
+def generate_weekly_harvest(vessels_df, rng, years=(2026,)):
+    """
+    Generate weekly harvest data for A season (Apr-Jun) + some B season (Oct-Nov)
+
+    Every vessel's weekly harvest, Chinook and halibut series are drawn at
+    once as (vessels x weeks) arrays and flattened into the long frame in one
+    step, so large fleets and several fishing years stay cheap to generate.
+
+    Args:
+        vessels_df: vessel frame from generate_vessels
+        rng: np.random.Generator
+        years: fishing years to generate (each gets the vessel's season totals)
+    """
+    n_vessels = len(vessels_df)
+    totals = {
+        'harvest_mt': vessels_df['harvest_to_date_mt'].to_numpy(dtype=float),
+        'chinook_psc': vessels_df['chinook_psc_count'].to_numpy(dtype=float),
+        'halibut_psc': vessels_df['halibut_psc_count'].to_numpy(dtype=float)
+    }
+
+    # Per-vessel rows: each season's weeks side by side, A then B
+    blocks = []
+    for year in years:
+        week_dates, seasons, series = [], [], {col: [] for col in totals}
+        for season, (month, day, weeks, pattern, share) in SEASONS.items():
+            start = pd.Timestamp(year, month, day)
+            week_dates.append(pd.date_range(start, periods=weeks, freq='7D'))
+            seasons.append(np.full(weeks, season))
+            for col, total in totals.items():
+                series[col].append(generate_seasonal_pattern(rng, total * share, weeks, pattern))
+
+        week_dates = np.concatenate([dates.to_numpy() for dates in week_dates])
+        n_weeks = len(week_dates)
+        values = {col: np.concatenate(parts, axis=1).ravel() for col, parts in series.items()}
+
+        blocks.append(pd.DataFrame({
+            'vessel_id': np.repeat(vessels_df['vessel_id'].to_numpy(), n_weeks),
+            'vessel_name': np.repeat(vessels_df['vessel_name'].to_numpy(), n_weeks),
+            'cooperative_name': np.repeat(vessels_df['cooperative_name'].to_numpy(), n_weeks),
+            'week_ending': np.tile(week_dates, n_vessels),
+            'season': np.tile(np.concatenate(seasons), n_vessels),
+            'harvest_mt': values['harvest_mt'].round(1),
+            'chinook_psc': values['chinook_psc'].astype(int),
+            'halibut_psc': values['halibut_psc'].astype(int)
+        }))
+
+    return pd.concat(blocks, ignore_index=True) if len(blocks) > 1 else blocks[0]
+
+
+def generate_seasonal_pattern(rng, total, weeks, pattern='ramp_up'):
+    """
+    Generate weekly distribution with specific patterns
+
+    Args:
+        total: season total, scalar or one per vessel
+
+    Returns:
+        Array of shape total.shape + (weeks,); each row sums to its total
+    """
+    if pattern == 'ramp_up':
+        # Slow start, ramp up, then stabilize
+        weights = np.array([0.5, 0.7, 0.9, 1.0, 1.1, 1.2, 1.3, 1.2, 1.1, 1.0, 0.9, 0.8, 0.6][:weeks])
+    elif pattern == 'decline':
+        # Start strong, decline
+        weights = np.array([1.3, 1.1, 0.9, 0.7, 0.5][:weeks])
+    else:
+        weights = np.ones(weeks)
+
+    total = np.asarray(total, dtype=float)
+
+    # Add some random variation (+/- 15%)
+    variation = rng.uniform(0.85, 1.15, total.shape + (weeks,))
+    weekly_values = weights * variation
+
+    # Scale each row to match its total exactly
+    return weekly_values / weekly_values.sum(axis=-1, keepdims=True) * total[..., None]
+
+def generate_transfers(vessels_df, rng):
+    """Generate quota transfer history"""
+
+    transfers = []
+    transfer_dates = [
+        datetime(2026, 3, 15),
+        datetime(2026, 4, 5),
+        datetime(2026, 4, 12),
+        datetime(2026, 4, 20),
+        datetime(2026, 5, 3),
+        datetime(2026, 5, 15),
+        datetime(2026, 5, 28),
+        datetime(2026, 6, 10),
+        datetime(2026, 10, 18),
+        datetime(2026, 10, 25),
+    ]
+
+    for i, transfer_date in enumerate(transfer_dates):
+        # Random from/to vessels
+        from_vessel = vessels_df.sample(1, random_state=rng).iloc[0]
+        to_vessel = vessels_df[vessels_df['vessel_id'] != from_vessel['vessel_id']].sample(1, random_state=rng).iloc[0]
+
+        # Transfer amount (50-300 mt)
+        amount = round(rng.uniform(50, 300), 1)
+
+        transfers.append({
+            'transfer_id': f'T-{i+1:03d}',
+            'transfer_date': transfer_date,
+            'from_vessel_id': from_vessel['vessel_id'],
+            'from_vessel_name': from_vessel['vessel_name'],
+            'from_cooperative': from_vessel['cooperative_name'],
+            'to_vessel_id': to_vessel['vessel_id'],
+            'to_vessel_name': to_vessel['vessel_name'],
+            'to_cooperative': to_vessel['cooperative_name'],
+            'amount_mt': amount,
+            'notes': 'Pre-season quota optimization' if transfer_date < datetime(2026, 4, 1) else 'In-season transfer'
+        })
+
+    return pd.DataFrame(transfers)
+
+def apply_ledger_balances(vessels_df, ledger):
+    """
+    Set each vessel's net transfers, quota balance and status from the
+    ledger's end-of-season position (allocation + transfers - harvest)
+    """
+    position = ledger.fleet_balances(ledger.end).set_index('vessel_id').reindex(vessels_df['vessel_id'])
+    net_transfers = position['net_transfers_mt'].to_numpy()
+    quota = vessels_df['cq_allocation_mt'].to_numpy() + net_transfers
+
+    vessels_df = vessels_df.copy()
+    vessels_df['net_transfers_mt'] = net_transfers.round(1)
+    vessels_df['quota_balance_mt'] = position['balance_mt'].to_numpy().round(1)
+    vessels_df['status'] = quota_status(vessels_df['harvest_to_date_mt'].to_numpy(), quota)
+    return vessels_df
+
+
+def generate_submission_dates(weekly_df, rng):
+    """
+    Fish ticket submission date for every weekly row: mostly 1-3 days after
+    the week ends, with a few late submissions
+    """
+    lag_days = rng.choice([1, 2, 3, 5, 8], size=len(weekly_df), p=[0.45, 0.35, 0.17, 0.02, 0.01])
+    return weekly_df['week_ending'] + pd.to_timedelta(lag_days, unit='D')
+
+
+# Generate all data
+@timed()
+def load_demo_data(seed=DEMO_SEED, scale=1, years=1):
+    """
+    Load all demo data
+
+    The vessel frame is generated once and passed to every downstream
+    generator, all drawing from one seeded Generator, so every table
+    describes the same fleet and the same seed always gives the same data.
+
+    Args:
+        seed: seed for the np.random.Generator
+        scale: fleet size multiplier (vessels and allocations per cooperative)
+        years: fishing years of weekly harvest, ending with 2026 (load testing)
+    """
+    rng = np.random.default_rng(seed)
+    vessels = generate_vessels(rng, scale)
+    weekly_harvest = generate_weekly_harvest(vessels, rng, range(2027 - years, 2027))
+    transfers = generate_transfers(vessels, rng)
+    weekly_harvest['submitted_date'] = generate_submission_dates(weekly_harvest, rng)
+
+    # Harvest and PSC to date are the sums of the season's landings; balances
+    # include transfers, so alerts see the post-transfer position
+    season_harvest = weekly_harvest[weekly_harvest['week_ending'].dt.year == SEASON_START.year]
+    vessels = harvest_to_date(vessels, season_harvest)
+    vessels = apply_ledger_balances(vessels, build_ledger(vessels, weekly_harvest, transfers))
+    return {
+        'cooperatives': generate_cooperatives(scale),
+        'vessels': vessels,
+        'weekly_harvest': weekly_harvest,
+        'transfers': transfers,
+        'fish_tickets': empty_tickets(),
+        'alerts': generate_alerts(vessels, weekly_harvest, forecast_as_of(weekly_harvest))
+    }
+
+# Process-wide store shared by all sessions; data is generated on first use
+DATA_STORE = SnapshotStore(load_demo_data)
+
+# Serializes transfer and fish ticket posting (read ledger, post, publish)
+_write_lock = threading.Lock()
+
+
+def get_ledger(snapshot=None):
+    """Quota ledger for a data version (built once, then patched per transfer)"""
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    return snapshot.derive(
+        'ledger',
+        lambda snap: build_ledger(snap['vessels'], snap['weekly_harvest'], snap['transfers'])
+    )
+
+
+def get_cube(snapshot=None):
+    """Board Report / Dashboard rollup cube for a data version (see cube.py)"""
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    return snapshot.derive('cube', lambda snap: build_cube(snap['vessels'], snap['weekly_harvest']))
+
+
+def get_vessel_index(snapshot=None):
+    """Vessels page filter/sort index for a data version (see vessel_index.py)"""
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    return snapshot.derive('vessel_index', lambda snap: VesselIndex(snap['vessels']))
+
+
+def get_psc_rates(snapshot=None):
+    """PSC rate ranking and hotspot grids for a data version (see psc.py)"""
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    return snapshot.derive('psc_rates', lambda snap: build_psc_rates(snap['vessels'], snap['weekly_harvest']))
+
+
+def get_harvest_series(snapshot=None):
+    """Per-vessel cumulative harvest/PSC time series for a data version (see timeseries.py)"""
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    return snapshot.derive('harvest_series', lambda snap: build_harvest_series(snap['vessels'], snap['weekly_harvest']))
+
+
+def forecast_as_of(weekly_df):
+    """Today, clamped to the weeks in the harvest schedule"""
+    weeks = weekly_df['week_ending']
+    return min(max(pd.Timestamp(datetime.now().date()), weeks.min()), weeks.max())
+
+
+def get_psc_forecast(as_of=None, snapshot=None):
+    """
+    Chinook/halibut cap forecast per vessel, cooperative and fleet (see
+    forecast.py), computed once per data version and as-of date
+
+    Returns:
+        (as_of, forecast DataFrame)
+    """
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    weekly = snapshot['weekly_harvest']
+    as_of = pd.Timestamp(as_of) if as_of is not None else forecast_as_of(weekly)
+    forecast = snapshot.derive(
+        f'psc_forecast_{as_of:%Y%m%d}',
+        lambda snap: forecast_psc(snap['vessels'], weekly, as_of)
+    )
+    return as_of, forecast
+
+
+def get_transfer_recommendations(buffer_pct=0, snapshot=None):
+    """
+    Suggested transfers clearing projected overages (see
+    transfers.recommend_transfers), dated today clamped to the season and
+    computed once per data version, date and buffer
+
+    Returns:
+        (transfer_date, batch, shortfall)
+    """
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    ledger = get_ledger(snapshot)
+    transfer_date = min(max(pd.Timestamp(datetime.now().date()), ledger.start), ledger.end)
+    batch, shortfall = snapshot.derive(
+        f'transfer_recommendations_{transfer_date:%Y%m%d}_{buffer_pct:g}',
+        lambda snap: recommend_transfers(snap['vessels'], ledger, snap['transfers'], transfer_date, buffer_pct)
+    )
+    return transfer_date, batch, shortfall
+
+
+def record_transfers(batch):
+    """
+    Validate, net and post a batch of quota transfers atomically
+
+    The batch is checked in one pass (see transfers.py); if any row fails,
+    nothing is posted. Otherwise offsetting transfers are netted, the ledger
+    is patched once for the whole batch and a single new data version is
+    published.
+
+    Args:
+        batch: DataFrame with from_vessel_id, to_vessel_id, amount_mt,
+            transfer_date and optional notes
+
+    Returns:
+        (snapshot, report, netted): the published snapshot (None if the batch
+        was rejected), the per-row validation report and the netted transfers
+    """
+    with _write_lock:
+        snapshot = DATA_STORE.latest()
+        ledger = get_ledger(snapshot)
+        vessels = snapshot['vessels']
+        transfers = snapshot['transfers']
+
+        report, netted = validate_transfers(batch, vessels, ledger, transfers)
+        if (report['error'] != '').any() or netted.empty:
+            return None, report, netted
+
+        first = int(transfers['transfer_id'].str[2:].astype(int).max()) + 1
+        netted = netted.assign(transfer_id=[f'T-{n:03d}' for n in range(first, first + len(netted))])
+        new_ledger = ledger.apply_transfers(netted)
+
+        by_id = vessels.set_index('vessel_id')
+        posted = pd.DataFrame({
+            'transfer_id': netted['transfer_id'],
+            'transfer_date': netted['transfer_date'],
+            'from_vessel_id': netted['from_vessel_id'],
+            'from_vessel_name': netted['from_vessel_id'].map(by_id['vessel_name']),
+            'from_cooperative': netted['from_vessel_id'].map(by_id['cooperative_name']),
+            'to_vessel_id': netted['to_vessel_id'],
+            'to_vessel_name': netted['to_vessel_id'].map(by_id['vessel_name']),
+            'to_cooperative': netted['to_vessel_id'].map(by_id['cooperative_name']),
+            'amount_mt': netted['amount_mt'].round(1),
+            'notes': netted['notes'].replace('', 'In-season transfer').fillna('In-season transfer')
+        })
+
+        tables = {name: snapshot[name] for name in snapshot.keys()}
+        tables['vessels'] = apply_ledger_balances(vessels, new_ledger)
+        tables['transfers'] = pd.concat([transfers, posted], ignore_index=True)
+        tables['alerts'] = generate_alerts(tables['vessels'], tables['weekly_harvest'],
+                                           forecast_as_of(tables['weekly_harvest']))
+        cube = get_cube(snapshot).with_vessels(tables['vessels'])
+        published = DATA_STORE.publish(tables, derived={'ledger': new_ledger, 'cube': cube})
+        return published, report, netted
+
+
+def get_harvest_totals(snapshot=None):
+    """Running harvest/PSC totals per vessel and cooperative for a data version (see ingest.py)"""
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    return snapshot.derive('harvest_totals', lambda snap: build_harvest_totals(snap['vessels'], snap['fish_tickets']))
+
+
+def _merge_weekly(weekly_df, new_rows, submitted_date):
+    """Add vessel-week totals into the weekly table (new vessel-weeks are appended)"""
+    keys = pd.MultiIndex.from_arrays([weekly_df['vessel_id'], weekly_df['week_ending']])
+    positions = keys.get_indexer(pd.MultiIndex.from_arrays([new_rows['vessel_id'], new_rows['week_ending']]))
+    existing = positions >= 0
+
+    weekly_df = weekly_df.copy()
+    for measure in ('harvest_mt', 'chinook_psc', 'halibut_psc'):
+        values = weekly_df[measure].to_numpy().copy()
+        values[positions[existing]] += new_rows[measure].to_numpy()[existing].astype(values.dtype)
+        weekly_df[measure] = values
+    weekly_df['harvest_mt'] = weekly_df['harvest_mt'].round(1)
+
+    appended = new_rows[~existing].assign(submitted_date=submitted_date)
+    if appended.empty:
+        return weekly_df
+    return pd.concat([weekly_df, appended[weekly_df.columns].astype(weekly_df.dtypes.to_dict())],
+                     ignore_index=True)
+
+
+def sample_fish_tickets(count=100, seed=None, snapshot=None):
+    """
+    Mock fish ticket feed: landings spread over the latest fishing week
+
+    Returns:
+        DataFrame with ticket_id, vessel_id, landing_date, harvest_mt,
+        chinook_psc and halibut_psc (CSV-ready)
+    """
+    if snapshot is None:
+        snapshot = DATA_STORE.current()
+    rng = np.random.default_rng(seed)
+    vessels = snapshot['vessels']
+    week_ending = snapshot['weekly_harvest']['week_ending'].max()
+    harvest = rng.gamma(2.0, 5.0, count).round(1)
+    return pd.DataFrame({
+        'ticket_id': [f'FT-{value:08x}' for value in rng.integers(0, 2**32, count)],
+        'vessel_id': rng.choice(vessels['vessel_id'].to_numpy(), count),
+        'landing_date': week_ending - pd.to_timedelta(rng.integers(0, 7, count), unit='D'),
+        'harvest_mt': harvest,
+        'chinook_psc': rng.poisson(harvest * 0.035),
+        'halibut_psc': rng.poisson(harvest * 0.015)
+    })
+
+
+def ingest_fish_tickets(tickets):
+    """
+    Post a batch of landed fish tickets and publish a new data version
+
+    Only the batch is aggregated: vessel and cooperative running totals,
+    the ledger, the rollup cube and the harvest time series are all patched
+    with the new landings (see ingest.py). Tickets already posted are skipped.
+
+    Args:
+        tickets: DataFrame with ticket_id, vessel_id, landing_date,
+            harvest_mt and optionally chinook_psc, halibut_psc
+
+    Returns:
+        (snapshot, accepted): the published snapshot (None if every ticket
+        was already posted) and the accepted tickets
+
+    Raises:
+        ValueError: the batch failed validation (nothing is posted)
+    """
+    with _write_lock:
+        snapshot = DATA_STORE.latest()
+        vessels = snapshot['vessels']
+        weekly = snapshot['weekly_harvest']
+
+        normalized = normalize_tickets(tickets, vessels, season_weeks(weekly))
+        totals, accepted = get_harvest_totals(snapshot).apply(normalized)
+        if accepted.empty:
+            return None, accepted
+
+        ledger = get_ledger(snapshot)
+        if accepted['week_ending'].max() > ledger.end:
+            raise ValueError(f"Landings after the ledger season ({ledger.end:%Y-%m-%d})")
+        new_rows = weekly_rows(accepted)
+
+        touched = accepted['vessel_id'].unique()
+        updated = totals.vessels(touched).set_index('vessel_id')
+        rows = vessels['vessel_id'].isin(touched).to_numpy()
+        new_vessels = vessels.copy()
+        for column in ('harvest_to_date_mt', 'chinook_psc_count', 'halibut_psc_count', 'quota_balance_mt', 'status'):
+            values = new_vessels[column].to_numpy().copy()
+            fresh = updated[column].reindex(vessels['vessel_id'][rows]).to_numpy()
+            values[rows] = fresh.round(1) if column in ('harvest_to_date_mt', 'quota_balance_mt') else fresh
+            new_vessels[column] = pd.Series(values, index=vessels.index).astype(vessels[column].dtype)
+
+        tables = {name: snapshot[name] for name in snapshot.keys()}
+        tables['vessels'] = new_vessels
+        tables['weekly_harvest'] = _merge_weekly(weekly, new_rows, pd.Timestamp(datetime.now().date()))
+        tables['fish_tickets'] = pd.concat([snapshot['fish_tickets'], accepted], ignore_index=True)
+        tables['alerts'] = generate_alerts(new_vessels, tables['weekly_harvest'],
+                                           forecast_as_of(tables['weekly_harvest']))
+
+        derived = {
+            'ledger': ledger.apply_harvest(accepted),
+            'cube': get_cube(snapshot).append_weeks(new_rows).with_vessels(new_vessels),
+            'harvest_totals': totals
+        }
+        series = get_harvest_series(snapshot)
+        if series.start <= accepted['week_ending'].min() and accepted['week_ending'].max() <= series.end:
+            derived['harvest_series'] = series.append(new_rows)
+        return DATA_STORE.publish(tables, derived=derived), accepted
+
+
+def ingest_fish_ticket_csv(source, chunksize=None):
+    """
+    Stream a fish ticket CSV into the store, one data version per chunk
+
+    Chunks are posted as they are read, so a chunk that fails validation
+    stops the import with the earlier chunks already posted (re-importing
+    the fixed file skips them as already posted).
+
+    Returns:
+        (snapshot, accepted, skipped, error): the last published snapshot
+        (None if nothing new), tickets accepted and tickets skipped as
+        already posted, and None, or the error that stopped the import
+        (naming the failed chunk's rows; nothing from it or later was posted)
+    """
+    snapshot, accepted_count, skipped_count, rows_read = None, 0, 0, 0
+    chunks = read_tickets(source) if chunksize is None else read_tickets(source, chunksize)
+    try:
+        for chunk in chunks:
+            try:
+                published, accepted = ingest_fish_tickets(chunk)
+            except ValueError as e:
+                return snapshot, accepted_count, skipped_count, f"rows {rows_read + 1:,}-{rows_read + len(chunk):,}: {e}"
+            rows_read += len(chunk)
+            snapshot = published or snapshot
+            accepted_count += len(accepted)
+            skipped_count += len(chunk) - len(accepted)
+    except ValueError as e:
+        # The CSV itself could not be parsed past row rows_read
+        return snapshot, accepted_count, skipped_count, f"after row {rows_read:,}: {e}"
+    return snapshot, accepted_count, skipped_count, None
+
+
+def record_transfer(from_vessel_id, to_vessel_id, amount_mt, transfer_date, notes=''):
+    """
+    Post a single quota transfer (a one-row batch, see record_transfers)
+
+    Raises:
+        ValueError: the transfer failed validation, or its amount rounds to
+            0.0 mt so there is nothing to post
+    """
+    snapshot, report, _ = record_transfers(pd.DataFrame([{
+        'from_vessel_id': from_vessel_id,
+        'to_vessel_id': to_vessel_id,
+        'amount_mt': amount_mt,
+        'transfer_date': pd.Timestamp(transfer_date),
+        'notes': notes
+    }]))
+    if snapshot is None:
+        errors = report.loc[report['error'] != '', 'error']
+        if errors.empty:
+            raise ValueError(f"Transfer of {amount_mt} mt nets to zero after rounding to 0.1 mt; nothing was posted")
+        raise ValueError(errors.iloc[0])
+    return snapshot
+
+if __name__ == "__main__":
+    # Test data generation
+    data = load_demo_data()
+
+    print("Cooperatives:")
+    print(data['cooperatives'])
+    print("\nVessels:")
+    print(data['vessels'].head())
+    print("\nWeekly Harvest:")
+    print(data['weekly_harvest'].head())
+    print("\nTransfers:")
+    print(data['transfers'].head())
+    print("\nAlerts:")
+    print(data['alerts'])
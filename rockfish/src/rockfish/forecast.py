@@ -0,0 +1,203 @@
+"""
+PSC cap exhaustion forecasting for Chinook and halibut
+
+Cumulative PSC is tracked for every vessel, cooperative and the fleet at once.
+Each level maps every vessel to its group row, so vessel PSC rolls up to all
+groups with one np.bincount per level (linear in the number of vessels).
+`PSCForecaster` sums the fishing weeks up to the as-of date in one pass
+(season totals plus the most recent weeks), and `forecast` projects the
+recent weekly rate over the remaining fishing weeks with an 80% band, as
+(groups x weeks) arrays, to find the week each cap is reached.
+
+The fleet caps are the program limits. Cooperatives and vessels get the share
+of each cap matching their share of the CQ allocation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+# Program PSC limits (halibut cap not specified in RFP, using 650 as example)
+PSC_CAPS = {'chinook_psc': 1200, 'halibut_psc': 650}
+PSC_LABELS = {'chinook_psc': 'Chinook', 'halibut_psc': 'Halibut'}
+
+RATE_WEEKS = 4        # Recent fishing weeks that set the projected rate
+BAND_Z = 1.2816       # Two-sided 80% band
+
+FORECAST_COLUMNS = [
+    'level', 'group_id', 'group_name', 'species', 'cap', 'cumulative', 'weekly_rate',
+    'projected_end', 'projected_end_low', 'projected_end_high',
+    'hit_date', 'hit_date_early', 'hit_date_late', 'status'
+]
+
+
+def psc_groups(vessels_df):
+    """
+    Vessel, cooperative and fleet groups with their cap shares
+
+    Returns:
+        (groups, group_index): groups is a DataFrame with level, group_id,
+        group_name and cap_share; group_index has one array per level giving
+        each vessel's group row
+    """
+    coop_index, coop_ids = pd.factorize(vessels_df['cooperative_id'])
+    coops = vessels_df.drop_duplicates('cooperative_id')
+    n_vessels = len(vessels_df)
+
+    group_index = [
+        np.zeros(n_vessels, dtype=np.intp),
+        1 + coop_index,
+        1 + len(coop_ids) + np.arange(n_vessels)
+    ]
+    groups = pd.concat([
+        pd.DataFrame({'level': 'Fleet', 'group_id': ['FLEET'], 'group_name': ['Fleet']}),
+        pd.DataFrame({
+            'level': 'Cooperative',
+            'group_id': coops['cooperative_id'].to_numpy(),
+            'group_name': coops['cooperative_name'].to_numpy()
+        }),
+        pd.DataFrame({
+            'level': 'Vessel',
+            'group_id': vessels_df['vessel_id'].to_numpy(),
+            'group_name': vessels_df['vessel_name'].to_numpy()
+        }),
+    ], ignore_index=True)
+
+    share = vessels_df['cq_allocation_mt'].to_numpy(dtype=float)
+    groups['cap_share'] = rollup(share / share.sum(), group_index, len(groups))
+    return groups, group_index
+
+
+def rollup(values, group_index, n_groups):
+    """
+    Sum per-vessel values to every group
+
+    Args:
+        values: array (..., vessels)
+        group_index: per-level vessel -> group row arrays (see psc_groups)
+
+    Returns:
+        array (..., groups)
+    """
+    values = np.asarray(values, dtype=float)
+    rows = values.reshape(-1, values.shape[-1])
+    offsets = np.arange(len(rows))[:, None] * n_groups
+    totals = np.zeros(len(rows) * n_groups)
+    for index in group_index:
+        totals += np.bincount((offsets + index).ravel(), weights=rows.ravel(), minlength=totals.size)
+    return totals.reshape(values.shape[:-1] + (n_groups,))
+
+
+class PSCForecaster:
+    """PSC totals per group from the fishing weeks up to an as-of date"""
+
+    def __init__(self, vessels_df, weekly_df, as_of, species=tuple(PSC_CAPS), rate_weeks=RATE_WEEKS):
+        self.species = list(species)
+        self.rate_weeks = rate_weeks
+        self.groups, group_index = psc_groups(vessels_df)
+        self.caps = np.array([[PSC_CAPS[sp]] for sp in self.species]) * self.groups['cap_share'].to_numpy()[None, :]
+
+        # Weekly rows of known vessels; vessels missing from a week count as zero
+        observed = weekly_df[weekly_df['week_ending'] <= pd.Timestamp(as_of)]
+        weeks = pd.DatetimeIndex(observed['week_ending'].unique()).sort_values()
+        vessel_pos = pd.Index(vessels_df['vessel_id']).get_indexer(observed['vessel_id'])
+        observed, vessel_pos = observed[vessel_pos >= 0], vessel_pos[vessel_pos >= 0]
+        psc = observed[self.species].to_numpy(dtype=float)
+
+        # (species, recent weeks, vessels) of the last rate_weeks fishing weeks
+        n_vessels, n_recent = len(vessels_df), min(len(weeks), rate_weeks)
+        week_pos = weeks[len(weeks) - n_recent:].get_indexer(observed['week_ending'])
+        in_recent = week_pos >= 0
+        cells = week_pos[in_recent] * n_vessels + vessel_pos[in_recent]
+        recent = np.stack([
+            np.bincount(cells, weights=psc[in_recent, i], minlength=n_recent * n_vessels)
+            for i in range(len(self.species))
+        ]).reshape(len(self.species), n_recent, n_vessels)
+
+        totals = np.stack([np.bincount(vessel_pos, weights=psc[:, i], minlength=n_vessels)
+                           for i in range(len(self.species))])
+        self.cumulative = rollup(totals, group_index, len(self.groups))                     # (species, groups)
+        self.recent = rollup(recent, group_index, len(self.groups)).transpose(0, 2, 1)     # (species, groups, weeks)
+        self.weeks_seen = len(weeks)
+        self.as_of = weeks[-1] if len(weeks) else None
+
+    @timed()
+    def forecast(self, future_weeks):
+        """
+        Project cumulative PSC over the remaining fishing weeks
+
+        Returns:
+            DataFrame (FORECAST_COLUMNS), one row per group and species.
+            status is 'exceeded' (cap already reached), 'projected' (expected
+            to reach the cap this season), 'at risk' (only the high band
+            reaches it) or 'ok'
+        """
+        future_weeks = pd.DatetimeIndex(future_weeks)
+        recent = self.recent
+        n = recent.shape[2]
+        rate = recent.mean(axis=2) if n else np.zeros_like(self.cumulative)
+        spread = recent.std(axis=2, ddof=1) if n > 1 else np.zeros_like(self.cumulative)
+
+        steps = np.arange(1, len(future_weeks) + 1)                         # (weeks,)
+        expected = self.cumulative[..., None] + rate[..., None] * steps     # (species, groups, weeks)
+        band = BAND_Z * spread[..., None] * np.sqrt(steps)
+        low, high = expected - band, expected + band
+
+        def first_hit(path):
+            reached = path >= self.caps[..., None]
+            index = reached.argmax(axis=2)
+            dates = np.where(reached.any(axis=2), future_weeks.to_numpy()[index] if len(future_weeks) else None, None)
+            return np.where(self.cumulative >= self.caps, self.as_of, dates)
+
+        if len(future_weeks):
+            hit, early, late = first_hit(expected), first_hit(high), first_hit(low)
+            end, end_low, end_high = expected[..., -1], low[..., -1].clip(min=self.cumulative), high[..., -1]
+        else:
+            already = np.where(self.cumulative >= self.caps, self.as_of, None)
+            hit = early = late = already
+            end = end_low = end_high = self.cumulative
+
+        status = np.select(
+            [self.cumulative >= self.caps, hit != None, early != None],  # noqa: E711 (elementwise)
+            ['exceeded', 'projected', 'at risk'],
+            default='ok'
+        )
+
+        n_species, n_groups = self.cumulative.shape
+        result = pd.DataFrame({
+            'level': np.tile(self.groups['level'].to_numpy(), n_species),
+            'group_id': np.tile(self.groups['group_id'].to_numpy(), n_species),
+            'group_name': np.tile(self.groups['group_name'].to_numpy(), n_species),
+            'species': np.repeat(self.species, n_groups),
+            'cap': self.caps.ravel(),
+            'cumulative': self.cumulative.ravel(),
+            'weekly_rate': rate.ravel(),
+            'projected_end': end.ravel(),
+            'projected_end_low': end_low.ravel(),
+            'projected_end_high': end_high.ravel(),
+            'hit_date': pd.to_datetime(hit.ravel()),
+            'hit_date_early': pd.to_datetime(early.ravel()),
+            'hit_date_late': pd.to_datetime(late.ravel()),
+            'status': status.ravel()
+        })
+        return result[FORECAST_COLUMNS]
+
+
+@timed()
+def forecast_psc(vessels_df, weekly_df, as_of):
+    """
+    Cap forecast as of a date: weeks up to as_of are observed, later weeks in
+    the weekly schedule are projected
+    """
+    as_of = pd.Timestamp(as_of)
+    weeks = pd.DatetimeIndex(weekly_df['week_ending'].unique()).sort_values()
+    return PSCForecaster(vessels_df, weekly_df, as_of).forecast(weeks[weeks > as_of])
+
+
+def forecast_alerts(forecast_df, levels=('Fleet', 'Cooperative', 'Vessel')):
+    """Groups whose cap is exceeded or projected to be reached, soonest first"""
+    flagged = forecast_df[forecast_df['status'].isin(['exceeded', 'projected', 'at risk'])
+                          & forecast_df['level'].isin(levels)]
+    order = flagged['status'].map({'exceeded': 0, 'projected': 1, 'at risk': 2})
+    return flagged.assign(_order=order).sort_values(['_order', 'hit_date_early']).drop(columns='_order')
@@ -0,0 +1,292 @@
+"""
+Fish ticket ingestion: incremental harvest-to-date and PSC totals
+
+Landed fish tickets (one row per landing) arrive as CSV, read in chunks so a
+season's export never has to fit in memory at once. Each chunk is
+normalized against the fleet and folded into `HarvestTotals`: per-vessel
+and per-cooperative running totals of harvest, Chinook and halibut, kept as
+arrays. A chunk only touches the rows of its own vessels and cooperatives
+(`np.add.at`), so the cost of a batch is its number of tickets, not the
+size of the season. Ticket IDs already posted are skipped, so re-sending a
+feed is harmless.
+
+Statuses follow the program rule (`quota_status`): Overage above the
+vessel's quota (allocation plus net transfers), Near Overage above 95% of it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+TICKET_COLUMNS = ['ticket_id', 'vessel_id', 'landing_date', 'harvest_mt', 'chinook_psc', 'halibut_psc']
+MEASURES = ('harvest_mt', 'chinook_psc', 'halibut_psc')
+
+# Vessel frame column holding each running total
+TOTAL_COLUMNS = {
+    'harvest_mt': 'harvest_to_date_mt',
+    'chinook_psc': 'chinook_psc_count',
+    'halibut_psc': 'halibut_psc_count'
+}
+
+TICKET_CHUNK_ROWS = 50_000
+NEAR_OVERAGE_PCT = 95
+
+
+def quota_status(harvest, quota):
+    """
+    Overage / Near Overage / In Compliance for arrays of harvest vs. quota
+
+    Amounts are compared at 0.01 mt: quota and harvest are sums of tenths, so
+    a vessel whose quota is used up exactly must not read as an overage
+    because of float rounding in those sums.
+    """
+    harvest = np.round(harvest, 2)
+    return np.select(
+        [harvest > np.round(quota, 2), harvest > np.round(quota * NEAR_OVERAGE_PCT / 100, 2)],
+        ['Overage', 'Near Overage'],
+        default='In Compliance'
+    )
+
+
+def harvest_to_date(vessels_df, weekly_df):
+    """
+    Vessel frame with its running totals (TOTAL_COLUMNS) summed from the
+    season's weekly landings (the one full aggregation; tickets are added
+    incrementally after that)
+    """
+    sums = weekly_df.groupby('vessel_id', observed=True)[list(MEASURES)].sum().reindex(vessels_df['vessel_id'])
+    vessels_df = vessels_df.copy()
+    for measure, column in TOTAL_COLUMNS.items():
+        values = sums[measure].fillna(0).to_numpy()
+        vessels_df[column] = values.round(1) if measure == 'harvest_mt' else values.astype(vessels_df[column].dtype)
+    return vessels_df
+
+
+def read_tickets(source, chunksize=TICKET_CHUNK_ROWS):
+    """
+    Stream fish tickets from a CSV path or file object
+
+    Yields:
+        DataFrames of at most chunksize rows
+    """
+    with pd.read_csv(source, chunksize=chunksize, parse_dates=['landing_date']) as reader:
+        yield from reader
+
+
+def season_weeks(weekly_df):
+    """Fishing weeks of the harvest schedule: week_ending and season, by date"""
+    return (weekly_df[['week_ending', 'season']].drop_duplicates('week_ending')
+            .sort_values('week_ending', ignore_index=True))
+
+
+def normalize_tickets(tickets, vessels_df, weeks):
+    """
+    Validate fish tickets and assign each landing to its fishing week
+
+    A landing belongs to the first week ending on or after its date (within
+    7 days).
+
+    Args:
+        tickets: DataFrame with TICKET_COLUMNS (PSC columns optional, 0 if
+            missing)
+        weeks: season_weeks() of the harvest schedule
+
+    Returns:
+        DataFrame with TICKET_COLUMNS plus vessel_name, cooperative_name,
+        week_ending and season
+
+    Raises:
+        ValueError: missing columns, blank ticket IDs, unknown vessels,
+            missing, non-numeric or negative amounts, invalid dates or
+            landings outside the fishing weeks
+    """
+    required = ['ticket_id', 'vessel_id', 'landing_date', 'harvest_mt']
+    missing = [col for col in required if col not in tickets.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    # A blank ID would be read as the string 'nan' and then skipped as a
+    # repeat of the first blank ticket
+    ticket_ids = tickets['ticket_id']
+    blank = (ticket_ids.isna() | (ticket_ids.astype(str).str.strip() == '')).to_numpy()
+    if blank.any():
+        raise ValueError(f"{blank.sum()} tickets without a ticket_id")
+
+    by_id = vessels_df.set_index('vessel_id')
+    unknown = sorted(set(tickets['vessel_id']) - set(by_id.index), key=str)
+    if unknown:
+        raise ValueError(f"Unrecognized vessel IDs: {', '.join(map(str, unknown))}")
+
+    # A blank PSC count means none were caught; a blank harvest is an error
+    amounts = {}
+    for column in MEASURES:
+        if column not in tickets:
+            amounts[column] = pd.Series(0, index=tickets.index)
+            continue
+        values = pd.to_numeric(tickets[column], errors='coerce')
+        amounts[column] = values if column == 'harvest_mt' else values.where(tickets[column].notna(), 0)
+    amounts = pd.DataFrame(amounts)
+    invalid = amounts.isna().any(axis=1).to_numpy()
+    if invalid.any():
+        raise ValueError(f"{invalid.sum()} tickets with a missing or non-numeric amount "
+                         f"(e.g. ticket {ticket_ids[invalid].iloc[0]})")
+    if (amounts < 0).to_numpy().any():
+        raise ValueError("Harvest and PSC amounts must not be negative")
+
+    landing_dates = pd.to_datetime(tickets['landing_date'], errors='coerce', format='mixed')
+    if landing_dates.isna().any():
+        raise ValueError(f"{landing_dates.isna().sum()} tickets with a missing or invalid landing_date")
+
+    normalized = pd.DataFrame({
+        'ticket_id': ticket_ids.astype(str).to_numpy(),
+        'vessel_id': tickets['vessel_id'].to_numpy(),
+        'landing_date': landing_dates.dt.normalize().to_numpy(),
+        'harvest_mt': amounts['harvest_mt'].to_numpy(dtype=float),
+        'chinook_psc': amounts['chinook_psc'].astype(int).to_numpy(),
+        'halibut_psc': amounts['halibut_psc'].astype(int).to_numpy()
+    })
+
+    week_endings = pd.DatetimeIndex(weeks['week_ending'])
+    positions = week_endings.searchsorted(normalized['landing_date'])
+    in_week = positions < len(week_endings)
+    in_week[in_week] = (week_endings[positions[in_week]] - normalized['landing_date'][in_week]).dt.days < 7
+    if not in_week.all():
+        first = normalized['landing_date'][~in_week].iloc[0]
+        raise ValueError(f"{(~in_week).sum()} landings outside the fishing weeks (e.g. {first:%Y-%m-%d})")
+
+    normalized['week_ending'] = week_endings[positions]
+    normalized['season'] = weeks['season'].to_numpy()[positions]
+    normalized.insert(2, 'vessel_name', normalized['vessel_id'].map(by_id['vessel_name']).to_numpy())
+    normalized.insert(3, 'cooperative_name', normalized['vessel_id'].map(by_id['cooperative_name']).to_numpy())
+    return normalized
+
+
+def empty_tickets():
+    """Posted fish tickets table with no rows (normalize_tickets columns)"""
+    return pd.DataFrame({
+        'ticket_id': pd.Series(dtype=object),
+        'vessel_id': pd.Series(dtype=object),
+        'vessel_name': pd.Series(dtype=object),
+        'cooperative_name': pd.Series(dtype=object),
+        'landing_date': pd.Series(dtype='datetime64[ns]'),
+        'harvest_mt': pd.Series(dtype=float),
+        'chinook_psc': pd.Series(dtype=int),
+        'halibut_psc': pd.Series(dtype=int),
+        'week_ending': pd.Series(dtype='datetime64[ns]'),
+        'season': pd.Series(dtype=object)
+    })
+
+
+def weekly_rows(tickets):
+    """Normalized tickets summed to the weekly harvest grain (vessel x week)"""
+    keys = ['vessel_id', 'vessel_name', 'cooperative_name', 'week_ending', 'season']
+    return tickets.groupby(keys, sort=False, observed=True)[list(MEASURES)].sum().reset_index()
+
+
+def _total(totals, measure):
+    """Running totals as reported: harvest in mt, PSC as whole animals"""
+    return totals[measure] if measure == 'harvest_mt' else totals[measure].round().astype(int)
+
+
+class HarvestTotals:
+    """Per-vessel and per-cooperative running harvest and PSC totals"""
+
+    def __init__(self, vessels_df, ticket_ids=()):
+        """
+        Args:
+            vessels_df: vessel frame; its totals (TOTAL_COLUMNS) are the
+                starting point, so only new tickets are ever added up
+            ticket_ids: tickets already included in those totals
+        """
+        self.vessel_ids = vessels_df['vessel_id'].to_numpy()
+        self._rows = pd.Index(self.vessel_ids)
+        self.cooperative_names, self._coop_rows = np.unique(
+            vessels_df['cooperative_name'].to_numpy(dtype=object), return_inverse=True
+        )
+        self.ticket_ids = frozenset(ticket_ids)
+        self._set_quota(vessels_df)
+
+        self.vessel_totals = {
+            measure: vessels_df[column].to_numpy(dtype=float).copy() for measure, column in TOTAL_COLUMNS.items()
+        }
+        self.coop_totals = {
+            measure: np.bincount(self._coop_rows, totals, minlength=len(self.cooperative_names))
+            for measure, totals in self.vessel_totals.items()
+        }
+
+    def _set_quota(self, vessels_df):
+        net_transfers = vessels_df['net_transfers_mt'] if 'net_transfers_mt' in vessels_df else 0
+        self.quota = (vessels_df['cq_allocation_mt'] + net_transfers).to_numpy(dtype=float)
+        self.coop_quota = np.bincount(self._coop_rows, self.quota, minlength=len(self.cooperative_names))
+
+    def _clone(self):
+        totals = object.__new__(HarvestTotals)
+        totals.__dict__.update(self.__dict__)
+        return totals
+
+    def with_quota(self, vessels_df):
+        """New totals with quotas refreshed (e.g. after transfers), same harvest"""
+        totals = self._clone()
+        totals._set_quota(vessels_df)
+        return totals
+
+    @timed()
+    def apply(self, tickets):
+        """
+        Fold normalized tickets into new running totals
+
+        Tickets already posted (or repeated within the batch) are skipped.
+
+        Returns:
+            (totals, accepted): the new HarvestTotals and the accepted tickets
+        """
+        ticket_ids = tickets['ticket_id']
+        accepted = tickets[~ticket_ids.isin(self.ticket_ids) & ~ticket_ids.duplicated()]
+
+        totals = self._clone()
+        totals.ticket_ids = self.ticket_ids.union(accepted['ticket_id'])
+        rows = self._rows.get_indexer(accepted['vessel_id'])
+        coop_rows = self._coop_rows[rows]
+        totals.vessel_totals, totals.coop_totals = {}, {}
+        for measure in MEASURES:
+            amounts = accepted[measure].to_numpy(dtype=float)
+            totals.vessel_totals[measure] = self.vessel_totals[measure].copy()
+            totals.coop_totals[measure] = self.coop_totals[measure].copy()
+            np.add.at(totals.vessel_totals[measure], rows, amounts)
+            np.add.at(totals.coop_totals[measure], coop_rows, amounts)
+        return totals, accepted
+
+    def vessels(self, vessel_ids=None):
+        """
+        Running totals, balance and status per vessel
+
+        Returns:
+            DataFrame with vessel_id and TOTAL_COLUMNS, quota_balance_mt and
+            status, for vessel_ids (default: all) in the given order
+        """
+        rows = slice(None) if vessel_ids is None else self._rows.get_indexer(pd.Index(vessel_ids))
+        harvest = self.vessel_totals['harvest_mt'][rows]
+        return pd.DataFrame({
+            'vessel_id': self.vessel_ids[rows],
+            **{column: _total(self.vessel_totals, measure)[rows] for measure, column in TOTAL_COLUMNS.items()},
+            'quota_balance_mt': self.quota[rows] - harvest,
+            'status': quota_status(harvest, self.quota[rows])
+        })
+
+    def cooperatives(self):
+        """Running totals, quota, balance and status per cooperative"""
+        harvest = self.coop_totals['harvest_mt']
+        return pd.DataFrame({
+            'cooperative_name': self.cooperative_names,
+            **{column: _total(self.coop_totals, measure) for measure, column in TOTAL_COLUMNS.items()},
+            'quota_mt': self.coop_quota,
+            'quota_balance_mt': self.coop_quota - harvest,
+            'status': quota_status(harvest, self.coop_quota)
+        })
+
+
+@timed()
+def build_harvest_totals(vessels_df, tickets_df):
+    """Running totals for a data version: its vessel frame and posted tickets"""
+    return HarvestTotals(vessels_df, tickets_df['ticket_id'])
@@ -0,0 +1,217 @@
+"""
+Quota ledger for the Rockfish Program
+
+Allocations, transfers and harvest are posted as dated events per vessel.
+Each kind of event is indexed by a Fenwick (binary indexed) tree over the days
+of the season for every vessel, so
+
+    balance of vessel X on date D         -> O(log days)
+    balances of the whole fleet on date D -> O(log days), vectorized over vessels
+    posting a batch of transfers/landings  -> O(log days) vectorized steps
+
+The ledger is treated as immutable so it can live in a data snapshot:
+`apply_transfers` (and `apply_harvest` for fish tickets) returns a new ledger
+whose trees are a copy of this one's with the new events patched in, rather
+than being rebuilt from the events.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+SEASON_START = pd.Timestamp('2026-01-01')
+SEASON_DAYS = 365
+
+# Event kinds, in tree order. Amounts are signed changes to the quota balance
+KINDS = ('allocation', 'transfer', 'harvest')
+
+EVENT_COLUMNS = ['vessel_id', 'date', 'kind', 'amount_mt', 'ref']
+
+
+class QuotaLedger:
+    """Per-vessel quota events with Fenwick-tree as-of-date balances"""
+
+    def __init__(self, vessel_ids, events, start=SEASON_START, days=SEASON_DAYS):
+        self.vessel_ids = np.asarray(vessel_ids)
+        self.start = pd.Timestamp(start)
+        self.days = days
+        self.end = self.start + pd.Timedelta(days=days - 1)
+        self._rows = {vessel_id: i for i, vessel_id in enumerate(self.vessel_ids)}
+
+        events = events[EVENT_COLUMNS].reset_index(drop=True)
+        self.events = events
+
+        # Point deltas at 1-based day positions, then an O(days) Fenwick build
+        tree = np.zeros((len(KINDS), len(self.vessel_ids), days + 1))
+        if len(events):
+            kinds = events['kind'].map({kind: i for i, kind in enumerate(KINDS)}).to_numpy()
+            rows = events['vessel_id'].map(self._rows).to_numpy()
+            np.add.at(tree, (kinds, rows, self._positions(events['date'])), events['amount_mt'].to_numpy(dtype=float))
+
+        for i in range(1, days + 1):
+            parent = i + (i & -i)
+            if parent <= days:
+                tree[:, :, parent] += tree[:, :, i]
+        self._tree = tree
+
+    def _positions(self, dates):
+        """1-based Fenwick positions for dates (ValueError outside the season)"""
+        offsets = (pd.to_datetime(pd.Series(dates)) - self.start).dt.days.to_numpy()
+        if len(offsets) and (offsets.min() < 0 or offsets.max() >= self.days):
+            raise ValueError(f"Date outside the ledger season ({self.start:%Y-%m-%d} to {self.end:%Y-%m-%d})")
+        return offsets + 1
+
+    def _row(self, vessel_id):
+        if vessel_id not in self._rows:
+            raise ValueError(f"Unknown vessel ID: {vessel_id}")
+        return self._rows[vessel_id]
+
+    def _prefix(self, date, rows=slice(None)):
+        """Per-kind totals up to and including date: array (kinds, vessels)"""
+        i = int(self._positions([date])[0])
+        total = np.zeros(self._tree[:, rows, 0].shape)
+        while i > 0:
+            total += self._tree[:, rows, i]
+            i -= i & -i
+        return total
+
+    def balance(self, vessel_id, date):
+        """Quota balance (mt) of one vessel at the end of date"""
+        return float(self._prefix(date, self._row(vessel_id)).sum())
+
+    def fleet_balances(self, date):
+        """
+        Every vessel's position at the end of date
+
+        Returns:
+            DataFrame with vessel_id, allocation_mt, net_transfers_mt,
+            harvest_mt (positive) and balance_mt
+        """
+        allocation, transfers, harvest = self._prefix(date)
+        return pd.DataFrame({
+            'vessel_id': self.vessel_ids,
+            'allocation_mt': allocation,
+            'net_transfers_mt': transfers,
+            'harvest_mt': -harvest,
+            'balance_mt': allocation + transfers + harvest
+        })
+
+    def balances_at(self, vessel_ids, dates):
+        """
+        Balance of each (vessel, date) pair: one Fenwick walk for all pairs,
+        vectorized, so O(log days) NumPy steps regardless of how many pairs
+        """
+        rows = np.array([self._row(vessel_id) for vessel_id in vessel_ids], dtype=int)
+        positions = np.asarray(self._positions(dates), dtype=int)
+        total = np.zeros(len(rows))
+        while (positions > 0).any():
+            active = positions > 0
+            total[active] += self._tree[:, rows[active], positions[active]].sum(axis=0)
+            positions = np.where(active, positions - (positions & -positions), 0)
+        return total
+
+    def _posted(self, kind, vessel_ids, dates, amounts, refs):
+        """
+        New ledger with events of one kind pushed up a copy of the Fenwick
+        tree together (O(log days) vectorized steps for the whole batch)
+        """
+        rows = np.array([self._row(vessel_id) for vessel_id in vessel_ids], dtype=int)
+        positions = np.asarray(self._positions(dates), dtype=int)
+        tree = self._tree.copy()
+        kind_index = KINDS.index(kind)
+        while (positions <= self.days).any():
+            active = positions <= self.days
+            np.add.at(tree, (kind_index, rows[active], positions[active]), amounts[active])
+            positions = np.where(active, positions + (positions & -positions), self.days + 1)
+
+        ledger = object.__new__(QuotaLedger)
+        ledger.__dict__.update(self.__dict__)
+        ledger._tree = tree
+        ledger.events = pd.concat([self.events, pd.DataFrame({
+            'vessel_id': vessel_ids,
+            'date': dates,
+            'kind': kind,
+            'amount_mt': amounts,
+            'ref': refs
+        })], ignore_index=True)
+        return ledger
+
+    def apply_transfers(self, transfers_df):
+        """
+        New ledger with a batch of transfers posted
+
+        Both legs of every transfer are pushed up the Fenwick tree together
+        on a copy of this ledger's tree; nothing is rebuilt from the events.
+
+        Args:
+            transfers_df: transfer_id, from_vessel_id, to_vessel_id,
+                amount_mt, transfer_date
+        """
+        amounts = transfers_df['amount_mt'].to_numpy(dtype=float)
+        vessel_ids = np.concatenate([transfers_df['from_vessel_id'].to_numpy(), transfers_df['to_vessel_id'].to_numpy()])
+        dates = pd.to_datetime(pd.concat([transfers_df['transfer_date'], transfers_df['transfer_date']], ignore_index=True))
+        return self._posted('transfer', vessel_ids, dates, np.concatenate([-amounts, amounts]),
+                            np.concatenate([transfers_df['transfer_id'].to_numpy()] * 2))
+
+    def apply_harvest(self, landings_df, date_column='week_ending'):
+        """
+        New ledger with a batch of fish tickets posted (harvest draws down
+        the balance; dated by week ending by default, like build_ledger)
+
+        Args:
+            landings_df: ticket_id, vessel_id, harvest_mt and the date column
+        """
+        return self._posted('harvest', landings_df['vessel_id'].to_numpy(),
+                            pd.to_datetime(landings_df[date_column]).reset_index(drop=True),
+                            -landings_df['harvest_mt'].to_numpy(dtype=float), landings_df['ticket_id'].to_numpy())
+
+    def apply_transfer(self, transfer_id, from_vessel_id, to_vessel_id, amount_mt, date):
+        """New ledger with one transfer posted (two O(log days) point updates)"""
+        return self.apply_transfers(pd.DataFrame({
+            'transfer_id': [transfer_id],
+            'from_vessel_id': [from_vessel_id],
+            'to_vessel_id': [to_vessel_id],
+            'amount_mt': [amount_mt],
+            'transfer_date': [pd.Timestamp(date)]
+        }))
+
+
+@timed()
+def build_ledger(vessels_df, weekly_df, transfers_df, start=SEASON_START, days=SEASON_DAYS):
+    """
+    Post every allocation (on the first day of the season), transfer and
+    weekly harvest into a QuotaLedger
+    """
+    events = pd.concat([
+        pd.DataFrame({
+            'vessel_id': vessels_df['vessel_id'],
+            'date': start,
+            'kind': 'allocation',
+            'amount_mt': vessels_df['cq_allocation_mt'].astype(float),
+            'ref': 'CQ allocation'
+        }),
+        pd.DataFrame({
+            'vessel_id': transfers_df['from_vessel_id'],
+            'date': transfers_df['transfer_date'],
+            'kind': 'transfer',
+            'amount_mt': -transfers_df['amount_mt'].astype(float),
+            'ref': transfers_df['transfer_id']
+        }),
+        pd.DataFrame({
+            'vessel_id': transfers_df['to_vessel_id'],
+            'date': transfers_df['transfer_date'],
+            'kind': 'transfer',
+            'amount_mt': transfers_df['amount_mt'].astype(float),
+            'ref': transfers_df['transfer_id']
+        }),
+        pd.DataFrame({
+            'vessel_id': weekly_df['vessel_id'],
+            'date': weekly_df['week_ending'],
+            'kind': 'harvest',
+            'amount_mt': -weekly_df['harvest_mt'].astype(float),
+            'ref': 'Week ending ' + pd.to_datetime(weekly_df['week_ending']).dt.strftime('%Y-%m-%d')
+        }),
+    ], ignore_index=True)
+    events = events[(pd.to_datetime(events['date']) - start).dt.days.between(0, days - 1)]
+    return QuotaLedger(vessels_df['vessel_id'], events, start, days)
@@ -0,0 +1,177 @@
+"""
+PSC rates per vessel and cooperative: ranking and hotspot weeks
+
+The weekly harvest table is laid out once per data version as dense
+(vessels x weeks) grids of harvest, Chinook and halibut, plus their running
+totals along the week axis. Every rate is then array arithmetic on those
+grids:
+
+    rate          - PSC per 1,000 mt harvested
+    rolling rates - PSC / harvest over the last 2 and 4 weeks (a window sum is
+                    the difference of two running totals)
+    percentile    - where a vessel's season rate falls in the fleet (100 =
+                    highest bycatch rate)
+    hotspots      - the vessel-weeks with the highest (rolling) rates, chosen
+                    with a partial sort
+
+Cooperative grids are vessel grids summed by cooperative, so vessel and
+cooperative rates always agree with each other and with the fleet rate.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+from rockfish.forecast import PSC_LABELS
+
+RATE_WINDOWS = (2, 4)
+
+# Vessel-weeks with less harvest than this are not ranked as hotspots (a few
+# salmon on a tiny landing make an extreme but meaningless rate)
+HOTSPOT_MIN_HARVEST_MT = 10.0
+HOTSPOT_COUNT = 10
+
+
+def _rate(psc, harvest):
+    """PSC per 1,000 mt (NaN where nothing was harvested)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(harvest > 0, psc / harvest * 1000, np.nan)
+
+
+def _window_sums(cumulative, window):
+    """(rows x weeks) sums over the window of weeks ending at each week"""
+    shifted = np.zeros_like(cumulative)
+    shifted[:, window:] = cumulative[:, :-window]
+    return cumulative - shifted
+
+
+class PscRates:
+    """Per-vessel and per-cooperative PSC rates for one data version"""
+
+    def __init__(self, vessels_df, weekly_df):
+        self.vessels = vessels_df[['vessel_id', 'vessel_name', 'cooperative_name']].reset_index(drop=True)
+        self.weeks = pd.DatetimeIndex(np.unique(weekly_df['week_ending'].to_numpy()))
+        self.cooperatives, coop_rows = np.unique(self.vessels['cooperative_name'].to_numpy(dtype=object),
+                                                 return_inverse=True)
+
+        rows = pd.Index(self.vessels['vessel_id']).get_indexer(weekly_df['vessel_id'])
+        if (rows < 0).any():
+            raise ValueError(f"Unknown vessel ID: {weekly_df['vessel_id'].iloc[np.flatnonzero(rows < 0)[0]]}")
+        columns = self.weeks.get_indexer(weekly_df['week_ending'])
+
+        # grids[level][measure] is (rows x weeks); level rows are vessels or cooperatives
+        self._grids = {'vessel': {}, 'cooperative': {}}
+        for measure in ('harvest_mt', *PSC_LABELS):
+            grid = np.zeros((len(self.vessels), len(self.weeks)))
+            np.add.at(grid, (rows, columns), weekly_df[measure].to_numpy(dtype=float))
+            coop_grid = np.zeros((len(self.cooperatives), len(self.weeks)))
+            np.add.at(coop_grid, coop_rows, grid)
+            self._grids['vessel'][measure] = grid
+            self._grids['cooperative'][measure] = coop_grid
+        self._cumulative = {
+            level: {measure: np.cumsum(grid, axis=1) for measure, grid in grids.items()}
+            for level, grids in self._grids.items()
+        }
+
+    def _check(self, species, level):
+        if species not in PSC_LABELS:
+            raise ValueError(f"Unknown PSC species: {species}")
+        if level not in self._grids:
+            raise ValueError(f"Unknown level: {level} (vessel or cooperative)")
+
+    def _labels(self, level):
+        if level == 'vessel':
+            return self.vessels.copy()
+        return pd.DataFrame({'cooperative_name': self.cooperatives})
+
+    def weekly_rates(self, species='chinook_psc', window=1, level='vessel'):
+        """
+        Rate for the window of weeks ending at each week
+
+        Returns:
+            (rows x weeks) array, rows in vessel (or cooperative) order
+        """
+        self._check(species, level)
+        cumulative = self._cumulative[level]
+        return _rate(_window_sums(cumulative[species], window), _window_sums(cumulative['harvest_mt'], window))
+
+    def ranking(self, species='chinook_psc', level='vessel'):
+        """
+        Season and latest rolling rates with the fleet percentile
+
+        Returns:
+            DataFrame with the vessel (or cooperative) labels, harvest_mt,
+            psc, rate, rate_<n>wk for RATE_WINDOWS (windows ending at the last
+            week), percentile and rank (1 = highest season rate), sorted by
+            rank; the index is the row position in the rate grids
+        """
+        self._check(species, level)
+        cumulative = self._cumulative[level]
+        harvest = cumulative['harvest_mt'][:, -1]
+        psc = cumulative[species][:, -1]
+
+        ranking = self._labels(level)
+        ranking['harvest_mt'] = harvest.round(1)
+        ranking['psc'] = psc.astype(int)
+        ranking['rate'] = _rate(psc, harvest)
+        for window in RATE_WINDOWS:
+            ranking[f'rate_{window}wk'] = self.weekly_rates(species, window, level)[:, -1]
+
+        rate = ranking['rate']
+        ranking['percentile'] = (rate.rank(pct=True) * 100).round(0)
+        ranking['rank'] = rate.rank(ascending=False, method='min').astype('Int64')
+        return ranking.sort_values(['rank', 'harvest_mt'], ascending=[True, False], na_position='last')
+
+    def hotspots(self, species='chinook_psc', window=1, n=HOTSPOT_COUNT, min_harvest_mt=HOTSPOT_MIN_HARVEST_MT):
+        """
+        Top-n vessel-weeks by rate over the window ending at each week
+
+        Returns:
+            DataFrame with vessel labels, week_ending, harvest_mt, psc and
+            rate, highest rate first
+        """
+        self._check(species, 'vessel')
+        cumulative = self._cumulative['vessel']
+        harvest = _window_sums(cumulative['harvest_mt'], window)
+        psc = _window_sums(cumulative[species], window)
+        rate = np.where(harvest >= min_harvest_mt, _rate(psc, harvest), -np.inf).ravel()
+
+        n = min(n, int(np.isfinite(rate).sum()))
+        if n == 0:
+            top = np.empty(0, dtype=int)
+        else:
+            top = np.argpartition(-rate, n - 1)[:n]
+            top = top[np.argsort(-rate[top], kind='stable')]
+        rows, columns = np.unravel_index(top, harvest.shape)
+
+        hotspots = self.vessels.iloc[rows].reset_index(drop=True)
+        hotspots['week_ending'] = self.weeks[columns]
+        hotspots['harvest_mt'] = harvest.ravel()[top].round(1)
+        hotspots['psc'] = psc.ravel()[top].astype(int)
+        hotspots['rate'] = rate[top]
+        return hotspots
+
+    def heatmap(self, species='chinook_psc', window=1, level='vessel', top=None):
+        """
+        Rates as a (rows x weeks) DataFrame for a heatmap
+
+        Args:
+            top: keep only the top rows by season rate (default: all)
+
+        Returns:
+            DataFrame indexed by vessel (or cooperative) name, one column per
+            week, rows in ranking order
+        """
+        ranking = self.ranking(species, level)
+        if top is not None:
+            ranking = ranking.head(top)
+        names = ranking['vessel_name' if level == 'vessel' else 'cooperative_name']
+        return pd.DataFrame(self.weekly_rates(species, window, level)[ranking.index.to_numpy()],
+                            index=names.to_numpy(), columns=self.weeks)
+
+
+@timed()
+def build_psc_rates(vessels_df, weekly_df):
+    """PSC rate grids for a data version"""
+    return PscRates(vessels_df, weekly_df)
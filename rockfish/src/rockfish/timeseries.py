@@ -0,0 +1,169 @@
+"""
+Columnar daily time series of harvest and PSC per vessel
+
+Landings are posted on their date into a (vessels x days) grid per measure,
+stored only as running totals: row v of `cumulative[measure]` is vessel v's
+contiguous series of cumulative harvest (or Chinook, halibut) at the end of
+each day. Any range total is then one subtraction per vessel,
+
+    total(v, D1..D2) = cumulative[v, D2 + 1] - cumulative[v, D1]
+
+so "harvest between D1 and D2", daily -> weekly -> season rollups and the
+cumulative PSC trend are O(1) per vessel and period, whatever the number of
+landings. `append` posts new landings and only rewrites the running totals
+from the earliest new date onward.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+MEASURES = ('harvest_mt', 'chinook_psc', 'halibut_psc')
+
+
+class HarvestSeries:
+    """Per-vessel daily cumulative harvest, Chinook and halibut"""
+
+    def __init__(self, vessel_ids, landings, date_column='week_ending', start=None, end=None):
+        """
+        Args:
+            vessel_ids: vessels, in row order
+            landings: rows with vessel_id, a date column and MEASURES (daily
+                landings, or the weekly harvest table dated by week ending)
+            start, end: calendar to cover (default: the landings' date range)
+        """
+        dates = pd.to_datetime(landings[date_column])
+        self.vessel_ids = np.asarray(vessel_ids)
+        self._rows = pd.Index(self.vessel_ids)
+        self.start = pd.Timestamp(start if start is not None else dates.min()).normalize()
+        self.end = pd.Timestamp(end if end is not None else dates.max()).normalize()
+        self.days = (self.end - self.start).days + 1
+
+        # Column 0 is the total before the first day, column d + 1 the total
+        # at the end of day d
+        self.cumulative = {measure: np.zeros((len(self.vessel_ids), self.days + 1)) for measure in MEASURES}
+        self.landing_days = np.zeros(self.days, dtype=bool)
+        self._post(landings, dates, from_day=0)
+
+    def _day(self, dates):
+        """0-based day offsets (ValueError outside the calendar)"""
+        offsets = (pd.to_datetime(pd.Series(dates)).dt.normalize() - self.start).dt.days.to_numpy()
+        if len(offsets) and (offsets.min() < 0 or offsets.max() >= self.days):
+            raise ValueError(f"Date outside the series ({self.start:%Y-%m-%d} to {self.end:%Y-%m-%d})")
+        return offsets
+
+    def _index(self, dates):
+        """Running-total column at the end of each date (clamped: no landings outside the calendar)"""
+        offsets = (pd.to_datetime(pd.Series(dates)).dt.normalize() - self.start).dt.days.to_numpy()
+        return np.clip(offsets + 1, 0, self.days)
+
+    def _vessel_rows(self, vessel_ids):
+        if vessel_ids is None:
+            return slice(None)
+        rows = self._rows.get_indexer(pd.Index(vessel_ids))
+        if (rows < 0).any():
+            unknown = pd.Index(vessel_ids)[rows < 0]
+            raise ValueError(f"Unknown vessel ID: {unknown[0]}")
+        return rows
+
+    def _post(self, landings, dates, from_day):
+        """Add landings' daily values and rebuild running totals from from_day"""
+        days = self._day(dates)
+        rows = self._vessel_rows(landings['vessel_id'])
+        self.landing_days[days] = True
+        for measure in MEASURES:
+            cumulative = self.cumulative[measure]
+            daily = np.diff(cumulative[:, from_day:], axis=1)
+            np.add.at(daily, (rows, days - from_day), landings[measure].to_numpy(dtype=float))
+            cumulative[:, from_day + 1:] = cumulative[:, [from_day]] + np.cumsum(daily, axis=1)
+
+    def append(self, landings, date_column='week_ending'):
+        """
+        New series with more landings posted (running totals are copied and
+        rewritten only from the earliest new date)
+        """
+        dates = pd.to_datetime(landings[date_column])
+        series = object.__new__(HarvestSeries)
+        series.__dict__.update(self.__dict__)
+        series.cumulative = {measure: values.copy() for measure, values in self.cumulative.items()}
+        series.landing_days = self.landing_days.copy()
+        if len(landings):
+            series._post(landings, dates, from_day=int(series._day(dates).min()))
+        return series
+
+    def between(self, start, end, measure='harvest_mt', vessel_ids=None):
+        """
+        Per-vessel totals from start through end (inclusive), one subtraction
+        per vessel
+
+        Returns:
+            Series indexed by vessel_id
+        """
+        before, last = self._index([pd.Timestamp(start) - pd.Timedelta(days=1), end])
+        rows = self._vessel_rows(vessel_ids)
+        cumulative = self.cumulative[measure][rows]
+        return pd.Series(cumulative[:, last] - cumulative[:, before], index=self.vessel_ids[rows], name=measure)
+
+    def totals(self, period_ends, measure='harvest_mt', vessel_ids=None, fleet=False):
+        """
+        Totals for the periods ending on each date (each period starts the
+        day after the previous end; the first starts with the series)
+
+        Returns:
+            DataFrame (vessels x periods), or a Series over periods if fleet
+        """
+        period_ends = pd.DatetimeIndex(period_ends)
+        edges = np.concatenate([[0], self._index(period_ends)])
+        cumulative = self.cumulative[measure][self._vessel_rows(vessel_ids)]
+        if fleet:
+            return pd.Series(np.diff(cumulative.sum(axis=0)[edges]), index=period_ends, name=measure)
+        values = np.diff(cumulative[:, edges], axis=1)
+        return pd.DataFrame(values, index=self.vessel_ids[self._vessel_rows(vessel_ids)], columns=period_ends)
+
+    def resample(self, freq='W-WED', measure='harvest_mt', vessel_ids=None, fleet=False):
+        """Daily -> weekly/monthly totals for a pandas frequency (e.g. 'D', 'W-WED', 'MS')"""
+        period_ends = pd.date_range(self.start, self.end, freq=freq)
+        if not len(period_ends) or period_ends[-1] < self.end:
+            period_ends = period_ends.append(pd.DatetimeIndex([self.end]))
+        return self.totals(period_ends, measure, vessel_ids, fleet)
+
+    def season_totals(self, seasons, measure='harvest_mt', vessel_ids=None):
+        """
+        Totals per season window
+
+        Args:
+            seasons: {name: (first date, last date)}
+
+        Returns:
+            DataFrame (vessels x seasons)
+        """
+        return pd.DataFrame({
+            name: self.between(first, last, measure, vessel_ids) for name, (first, last) in seasons.items()
+        })
+
+    def trend(self, measure='chinook_psc', vessel_ids=None, dates=None):
+        """
+        Fleet (or vessel subset) totals per landing date with the running total
+
+        Args:
+            dates: period ends to report (default: every day with landings)
+
+        Returns:
+            DataFrame with week_ending, <measure> (period total) and cumulative
+        """
+        if dates is None:
+            dates = self.start + pd.to_timedelta(np.flatnonzero(self.landing_days), unit='D')
+        dates = pd.DatetimeIndex(dates)
+        cumulative = self.cumulative[measure][self._vessel_rows(vessel_ids)].sum(axis=0)[self._index(dates)]
+        return pd.DataFrame({
+            'week_ending': dates,
+            measure: np.diff(cumulative, prepend=0),
+            'cumulative': cumulative
+        })
+
+
+@timed()
+def build_harvest_series(vessels_df, weekly_df):
+    """Time series of a data version's weekly harvest (dated by week ending)"""
+    return HarvestSeries(vessels_df['vessel_id'], weekly_df)
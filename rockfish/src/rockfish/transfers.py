@@ -0,0 +1,285 @@
+"""
+Batch quota transfer validation and netting
+
+A batch is a table of transfers (from_vessel_id, to_vessel_id, amount_mt,
+transfer_date, optional notes). `validate_transfers` checks every row in one
+vectorized pass:
+
+    - both vessels exist and differ, amount is positive, date is in season
+    - no sender is left with a negative balance on the transfer date once the
+      whole (netted) batch is posted
+    - no cooperative sends more than INTER_COOP_CAP_PCT of its allocation to
+      other cooperatives over the season
+
+`net_transfers` collapses offsetting transfers between the same two vessels
+on the same day into one transfer (or none), so the batch is posted to the
+ledger with as few legs as possible.
+
+`recommend_transfers` proposes a batch that clears projected overages:
+vessels short of quota at season end are matched to vessels with spare
+balance, within their own cooperative first, then across cooperatives up to
+the inter-cooperative cap. Both rounds match the largest shortfalls to the
+largest donors by intersecting their cumulative sums (one sorted merge, so
+thousands of vessels take milliseconds and every vessel appears in at most a
+few legs). The batch goes through the same validation as any other.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+# Net quota a cooperative may transfer out to other cooperatives per season,
+# as a percentage of its total allocation
+INTER_COOP_CAP_PCT = 15
+
+BATCH_COLUMNS = ['from_vessel_id', 'to_vessel_id', 'amount_mt', 'transfer_date']
+
+
+def coop_net_outflow(flows, vessels_df):
+    """
+    Net quota each cooperative has sent to other cooperatives
+
+    Args:
+        flows: transfers with from_vessel_id, to_vessel_id and amount_mt
+
+    Returns:
+        Series indexed by cooperative_id (every cooperative, 0 if none)
+    """
+    coop_of = vessels_df.set_index('vessel_id')['cooperative_id']
+    allocation = vessels_df.groupby('cooperative_id')['cq_allocation_mt'].sum()
+    from_coop = flows['from_vessel_id'].map(coop_of)
+    to_coop = flows['to_vessel_id'].map(coop_of)
+    inter = flows[from_coop != to_coop]
+    return (inter.groupby(from_coop[from_coop != to_coop])['amount_mt'].sum()
+            .sub(inter.groupby(to_coop[from_coop != to_coop])['amount_mt'].sum(), fill_value=0)
+            .reindex(allocation.index, fill_value=0))
+
+
+def net_transfers(batch):
+    """
+    Net offsetting transfers per vessel pair and date
+
+    Returns:
+        DataFrame with from_vessel_id, to_vessel_id, amount_mt,
+        transfer_date, notes and source_rows (batch index labels netted in)
+    """
+    if batch.empty:
+        return pd.DataFrame(columns=BATCH_COLUMNS + ['notes', 'source_rows'])
+
+    from_ids = batch['from_vessel_id'].to_numpy()
+    to_ids = batch['to_vessel_id'].to_numpy()
+    first = np.where(from_ids < to_ids, from_ids, to_ids)
+    second = np.where(from_ids < to_ids, to_ids, from_ids)
+    signed = np.where(from_ids == first, 1.0, -1.0) * batch['amount_mt'].to_numpy(dtype=float)
+
+    keyed = pd.DataFrame({
+        'first': first,
+        'second': second,
+        'transfer_date': pd.to_datetime(batch['transfer_date']).to_numpy(),
+        'signed_mt': signed,
+        'notes': batch['notes'].to_numpy() if 'notes' in batch else '',
+        'source_row': batch.index.to_numpy()
+    })
+    netted = keyed.groupby(['first', 'second', 'transfer_date'], sort=False).agg(
+        signed_mt=('signed_mt', 'sum'),
+        notes=('notes', lambda notes: notes.iloc[0] if len(notes) == 1 else 'Netted batch transfer'),
+        source_rows=('source_row', list)
+    ).reset_index()
+    netted['signed_mt'] = netted['signed_mt'].round(1)
+    netted = netted[netted['signed_mt'] != 0]
+
+    forward = netted['signed_mt'] > 0
+    return pd.DataFrame({
+        'from_vessel_id': netted['first'].where(forward, netted['second']),
+        'to_vessel_id': netted['second'].where(forward, netted['first']),
+        'amount_mt': netted['signed_mt'].abs(),
+        'transfer_date': netted['transfer_date'],
+        'notes': netted['notes'],
+        'source_rows': netted['source_rows']
+    }).reset_index(drop=True)
+
+
+@timed()
+def validate_transfers(batch, vessels_df, ledger, existing_transfers, cap_pct=INTER_COOP_CAP_PCT):
+    """
+    Validate a batch of transfers against current balances and cooperatives
+
+    Returns:
+        (report, netted): report is the batch with an `error` column (empty
+        string when the row is valid); netted is the netted batch of the rows
+        that passed the row-level checks
+    """
+    report = batch.copy()
+    errors = pd.Series('', index=batch.index, dtype=object)
+
+    def flag(mask, message):
+        mask = np.asarray(mask) & (errors == '').to_numpy()
+        errors[mask] = message
+
+    known = vessels_df['vessel_id']
+    amounts = pd.to_numeric(batch['amount_mt'], errors='coerce')
+    dates = pd.to_datetime(batch['transfer_date'], errors='coerce')
+
+    flag(~batch['from_vessel_id'].isin(known), 'Unrecognized From vessel ID')
+    flag(~batch['to_vessel_id'].isin(known), 'Unrecognized To vessel ID')
+    flag(batch['from_vessel_id'] == batch['to_vessel_id'], 'Self-transfer')
+    flag(~(amounts > 0), 'Amount must be positive')
+    flag(~dates.between(ledger.start, ledger.end), f"Date outside the season ({ledger.start:%Y-%m-%d} to {ledger.end:%Y-%m-%d})")
+
+    # Select the columns row by row too: assigning full-length columns to an
+    # empty selection would bring back the rejected rows as all-NaN rows
+    ok = (errors == '').to_numpy()
+    valid = report[ok].assign(amount_mt=amounts[ok], transfer_date=dates[ok])
+    netted = net_transfers(valid)
+
+    if len(netted):
+        # No negative balances: post the netted batch, then check every sender
+        # on its transfer date
+        after = ledger.apply_transfers(netted.assign(transfer_id='batch'))
+        balances = after.balances_at(netted['from_vessel_id'], netted['transfer_date'])
+        short = netted[balances < -0.05]
+        for (_, transfer), balance in zip(short.iterrows(), balances[balances < -0.05]):
+            flag(batch.index.isin(transfer['source_rows']),
+                 f"Leaves {transfer['from_vessel_id']} at {balance:,.1f} mt on {transfer['transfer_date']:%Y-%m-%d}")
+
+        # Inter-cooperative cap: season net outflow per cooperative
+        coop_of = vessels_df.set_index('vessel_id')['cooperative_id']
+        allocation = vessels_df.groupby('cooperative_id')['cq_allocation_mt'].sum()
+        net_out = coop_net_outflow(pd.concat([
+            existing_transfers[['from_vessel_id', 'to_vessel_id', 'amount_mt']],
+            netted[['from_vessel_id', 'to_vessel_id', 'amount_mt']]
+        ], ignore_index=True), vessels_df)
+        over = net_out[net_out > allocation * cap_pct / 100]
+
+        netted_from_coop = netted['from_vessel_id'].map(coop_of)
+        netted_to_coop = netted['to_vessel_id'].map(coop_of)
+        for coop_id, out_mt in over.items():
+            rows = netted[(netted_from_coop == coop_id) & (netted_to_coop != coop_id)]['source_rows']
+            flag(batch.index.isin([row for source in rows for row in source]),
+                 f"{coop_id} inter-cooperative transfers ({out_mt:,.0f} mt net) exceed the "
+                 f"{cap_pct}% cap ({allocation[coop_id] * cap_pct / 100:,.0f} mt)")
+
+    report['error'] = errors
+    return report, netted
+
+
+def _match(need, spare):
+    """
+    Match shortfalls to donors, largest first (amounts in integer tenths of mt)
+
+    Shortfalls and donors are each sorted largest first and laid end to end;
+    every overlap of a shortfall's interval with a donor's interval is one
+    leg. At most len(need) + len(spare) - 1 legs are produced.
+
+    Returns:
+        (need_positions, spare_positions, amounts) of the legs
+    """
+    need_order = np.argsort(-need, kind='stable')
+    spare_order = np.argsort(-spare, kind='stable')
+    need_edges = np.cumsum(need[need_order])
+    spare_edges = np.cumsum(spare[spare_order])
+    total = min(need_edges[-1], spare_edges[-1]) if len(need) and len(spare) else 0
+    if total <= 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0, dtype=np.int64)
+
+    edges = np.union1d(need_edges[need_edges < total], spare_edges[spare_edges < total])
+    edges = np.append(edges, total)
+    amounts = np.diff(edges, prepend=0)
+    return (need_order[np.searchsorted(need_edges, edges)],
+            spare_order[np.searchsorted(spare_edges, edges)],
+            amounts)
+
+
+@timed()
+def recommend_transfers(vessels_df, ledger, existing_transfers, transfer_date,
+                        buffer_pct=0, cap_pct=INTER_COOP_CAP_PCT):
+    """
+    Suggest transfers that bring every vessel to a non-negative projected
+    (season-end) balance
+
+    Shortfalls are filled from donors in the same cooperative first; what
+    is left is filled from other cooperatives, each sending no more than
+    its remaining inter-cooperative cap. Donors keep the same buffer they
+    would need themselves, and never give more than their balance on the
+    transfer date.
+
+    Args:
+        transfer_date: date of the suggested transfers (inside the season)
+        buffer_pct: target balance as a percentage of the quota each
+            vessel holds after the transfers (allocation plus net
+            transfers, as in ingest.quota_status). 0 clears overages only;
+            100 - NEAR_OVERAGE_PCT (5) also clears Near Overage
+
+    Returns:
+        (batch, shortfall): batch has BATCH_COLUMNS, notes and scope
+        ('Within cooperative' / 'Inter-cooperative'); shortfall is the
+        projected balance still missing per vessel (Series indexed by
+        vessel_id, only vessels that could not be fully covered)
+    """
+    transfer_date = pd.Timestamp(transfer_date)
+    if not ledger.start <= transfer_date <= ledger.end:
+        raise ValueError(f"Date outside the season ({ledger.start:%Y-%m-%d} to {ledger.end:%Y-%m-%d})")
+    if not 0 <= buffer_pct < 100:
+        raise ValueError(f"Buffer must be at least 0% and below 100%: {buffer_pct}")
+
+    vessels = vessels_df.set_index('vessel_id')
+    positions = ledger.fleet_balances(ledger.end).set_index('vessel_id').reindex(vessels.index)
+    on_date = ledger.fleet_balances(transfer_date).set_index('vessel_id')['balance_mt']
+    projected = positions['balance_mt'].to_numpy()
+    quota = (positions['allocation_mt'] + positions['net_transfers_mt']).to_numpy()
+
+    # The target is a share of the quota held, and a transfer moves quota and
+    # balance together: receiving x leaves (balance + x) vs. share * (quota + x),
+    # so a vessel's surplus over its target is (balance - share * quota) / (1 - share)
+    share = buffer_pct / 100
+    surplus = (projected - share * quota) / (1 - share)
+    available = np.minimum(surplus, on_date.reindex(vessels.index).to_numpy())
+
+    # Whole tenths of a mt, like posted transfers: shortfalls round up, spare rounds down
+    need = np.ceil(np.round(-surplus * 10, 6)).clip(min=0).astype(np.int64)
+    spare = np.floor(np.round(available * 10, 6)).clip(min=0).astype(np.int64)
+    coops = vessels['cooperative_id'].to_numpy()
+
+    legs = []
+    for coop in np.unique(coops):
+        members = np.flatnonzero(coops == coop)
+        to_rows, from_rows, amounts = _match(need[members], spare[members])
+        to_rows, from_rows = members[to_rows], members[from_rows]
+        np.subtract.at(need, to_rows, amounts)
+        np.subtract.at(spare, from_rows, amounts)
+        legs.append((from_rows, to_rows, amounts, 'Within cooperative'))
+
+    # Inter-cooperative round: each donor cooperative's spare is cut off at
+    # its remaining cap (its largest donors give first)
+    allocation = vessels.groupby('cooperative_id')['cq_allocation_mt'].sum()
+    headroom = (allocation * cap_pct / 100 - coop_net_outflow(existing_transfers, vessels_df)).clip(lower=0)
+    headroom = np.floor(np.round(headroom.reindex(coops).to_numpy() * 10, 6)).astype(np.int64)
+    order = np.lexsort((-spare, coops))
+    coop_sorted = coops[order]
+    group_start = np.searchsorted(coop_sorted, coop_sorted)
+    running = np.cumsum(spare[order])
+    before = running - spare[order]
+    offset = np.where(group_start > 0, running[group_start - 1], 0)
+    capped = np.clip(headroom[order] - (before - offset), 0, spare[order])
+    inter_spare = np.zeros_like(spare)
+    inter_spare[order] = capped
+
+    needy = np.flatnonzero(need > 0)
+    donors = np.flatnonzero(inter_spare > 0)
+    to_rows, from_rows, amounts = _match(need[needy], inter_spare[donors])
+    to_rows, from_rows = needy[to_rows], donors[from_rows]
+    np.subtract.at(need, to_rows, amounts)
+    legs.append((from_rows, to_rows, amounts, 'Inter-cooperative'))
+
+    ids = vessels.index.to_numpy()
+    batch = pd.DataFrame({
+        'from_vessel_id': np.concatenate([ids[leg[0]] for leg in legs]),
+        'to_vessel_id': np.concatenate([ids[leg[1]] for leg in legs]),
+        'amount_mt': np.concatenate([leg[2] for leg in legs]) / 10,
+        'transfer_date': transfer_date,
+        'notes': 'Recommended to clear projected overage',
+        'scope': np.concatenate([np.full(len(leg[2]), leg[3], dtype=object) for leg in legs])
+    })
+    shortfall = pd.Series(need / 10, index=vessels.index, name='shortfall_mt')
+    return batch, shortfall[shortfall > 0]
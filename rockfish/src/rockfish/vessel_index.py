@@ -0,0 +1,142 @@
+"""
+Filter, sort and page index for the Vessels page
+
+Built once per data version (see demo_data.get_vessel_index). Cooperative
+and status are stored as categorical codes, and every row carries one bit per
+dimension (1 << code), so a filter selection is a single bitmask per
+dimension and filtering is two AND operations over integer arrays. Each
+sortable column has precomputed stable ascending and descending sort orders
+(ties stay in table order both ways); a query walks the order and keeps the
+rows passing the filter, so sorting never re-sorts the table.
+Only the requested page is sliced out of the table and styled.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Status categories, in display order (see demo_data.quota_status)
+STATUSES = ['In Compliance', 'Near Overage', 'Overage']
+
+DISPLAY_COLUMNS = {
+    'vessel_name': 'Vessel', 'cooperative_name': 'Cooperative', 'cq_allocation_mt': 'CQ Allocation',
+    'harvest_to_date_mt': 'Harvest-to-Date', 'quota_balance_mt': 'Quota Balance',
+    'chinook_psc_count': 'Chinook PSC', 'halibut_psc_count': 'Halibut PSC', 'status': 'Status'
+}
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+STATUS_STYLES = {
+    'Overage': 'background-color: #FEE2E2; color: #991B1B; font-weight: 600',
+    'Near Overage': 'background-color: #FED7AA; color: #9A3412; font-weight: 600',
+    'In Compliance': 'background-color: #D1FAE5; color: #065F46; font-weight: 600'
+}
+NEGATIVE_BALANCE_STYLE = 'color: #DC2626; font-weight: 600'
+
+
+def _bits(categorical):
+    """Per-row bit (1 << category code) for a Categorical of at most 64 categories"""
+    if len(categorical.categories) > 64:
+        raise ValueError(f"Too many categories for a bitmask filter: {len(categorical.categories)}")
+    return np.left_shift(np.uint64(1), categorical.codes.astype(np.uint64))
+
+
+def _descending_order(values):
+    """
+    Stable descending sort order: largest first, ties in table order
+
+    Reversing the stable ascending order would also reverse ties, so the
+    reversed column is sorted instead and its positions mapped back.
+    """
+    n = len(values)
+    return (n - 1 - np.argsort(values[::-1], kind='stable'))[::-1]
+
+
+class VesselIndex:
+    """Categorical bitmasks and sort orders over one version of the vessels table"""
+
+    def __init__(self, vessels_df):
+        self.table = vessels_df[list(DISPLAY_COLUMNS)].reset_index(drop=True)
+
+        coops = pd.Categorical(self.table['cooperative_name'])
+        statuses = pd.Categorical(self.table['status'],
+                                  categories=STATUSES + sorted(set(self.table['status']) - set(STATUSES)))
+        self.cooperatives = list(coops.categories)
+        self.statuses = [status for status in statuses.categories if status in set(self.table['status'])]
+        self._status_categories = list(statuses.categories)
+        self._coop_bits = _bits(coops)
+        self._status_bits = _bits(statuses)
+        self._status_codes = statuses.codes
+
+        self._chinook = self.table['chinook_psc_count'].to_numpy()
+        self._orders = {column: np.argsort(self.table[column].to_numpy(), kind='stable')
+                        for column in DISPLAY_COLUMNS}
+        self._descending_orders = {column: _descending_order(self.table[column].to_numpy())
+                                   for column in DISPLAY_COLUMNS}
+
+    @staticmethod
+    def _mask(categories, selected):
+        """Bitmask of the selected categories (unknown values are ignored)"""
+        mask = np.uint64(0)
+        for code, category in enumerate(categories):
+            if category in selected:
+                mask |= np.uint64(1) << np.uint64(code)
+        return mask
+
+    def filter(self, cooperatives, statuses):
+        """Boolean row mask for the selected cooperatives and statuses"""
+        coop_mask = self._mask(self.cooperatives, set(cooperatives))
+        status_mask = self._mask(self._status_categories, set(statuses))
+        return ((self._coop_bits & coop_mask) != 0) & ((self._status_bits & status_mask) != 0)
+
+    def summary(self, keep):
+        """Vessel, status and Chinook totals for the filtered rows"""
+        counts = np.bincount(self._status_codes[keep], minlength=len(self._status_categories))
+        by_status = dict(zip(self._status_categories, counts.tolist()))
+        return {
+            'vessels': int(keep.sum()),
+            'in_compliance': by_status.get('In Compliance', 0),
+            'overage': by_status.get('Overage', 0),
+            'chinook_psc': int(self._chinook[keep].sum())
+        }
+
+    def query(self, cooperatives, statuses, sort_by='vessel_name', ascending=True, page=0, page_size=PAGE_SIZES[0]):
+        """
+        One sorted page of the filtered vessels
+
+        Args:
+            cooperatives, statuses: selected category values
+            sort_by: a DISPLAY_COLUMNS key
+            page: 0-based page number (clamped to the last page)
+            page_size: rows per page
+
+        Returns:
+            (page DataFrame with display column names, total matching rows,
+            summary dict for all matching rows)
+        """
+        if sort_by not in self._orders:
+            raise ValueError(f"Unknown sort column: {sort_by}")
+
+        keep = self.filter(cooperatives, statuses)
+        order = (self._orders if ascending else self._descending_orders)[sort_by]
+        rows = order[keep[order]]
+
+        last_page = max((len(rows) - 1) // page_size, 0)
+        start = min(max(page, 0), last_page) * page_size
+        page_df = self.table.iloc[rows[start:start + page_size]].rename(columns=DISPLAY_COLUMNS)
+        return page_df, len(rows), self.summary(keep)
+
+
+def style_page(page_df):
+    """
+    Status and negative-balance highlighting for one page, computed as whole
+    style columns rather than per-cell callbacks
+    """
+    def status_styles(column):
+        return column.map(STATUS_STYLES).fillna(STATUS_STYLES['In Compliance'])
+
+    def balance_styles(column):
+        return np.where(column < 0, NEGATIVE_BALANCE_STYLE, '')
+
+    return (page_df.style
+            .apply(status_styles, subset=['Status'])
+            .apply(balance_styles, subset=['Quota Balance']))
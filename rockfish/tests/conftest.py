@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(__file__)
+
+# The rockfish package lives in src/ (it puts the repo root, for dashboard_common, on sys.path itself)
+SRC_DIR = os.path.abspath(os.path.join(TESTS_DIR, '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import rockfish  # noqa: E402,F401  (so tests can import dashboard_common before any rockfish module)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """A fresh demo data store, so tests that post data do not share versions"""
+    from dashboard_common.snapshot import SnapshotStore
+    from rockfish import demo_data
+
+    store = SnapshotStore(demo_data.load_demo_data)
+    monkeypatch.setattr(demo_data, 'DATA_STORE', store)
+    return store
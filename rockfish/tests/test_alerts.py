@@ -0,0 +1,107 @@
+"""
+Fleet-wide alert rules must match evaluating each vessel's rules one by one
+"""
+
+import html
+
+import pandas as pd
+import pytest
+
+from rockfish.alerts import (LATE_SUBMISSION_DAYS, PSC_WARNING_PCT, SEVERITIES, alert_cards_html, combine_alerts,
+                             generate_alerts)
+from rockfish.demo_data import forecast_as_of, load_demo_data
+from rockfish.forecast import PSC_CAPS, PSC_LABELS
+
+
+@pytest.fixture(scope='module')
+def data():
+    return load_demo_data(scale=3)
+
+
+def reference_alerts(vessels, weekly, as_of):
+    """alert_id -> severity, vessel by vessel (most severe alert per rule)"""
+    alerts = {}
+    total_allocation = vessels['cq_allocation_mt'].sum()
+    for vessel in vessels.itertuples():
+        if vessel.status == 'Overage':
+            alerts[f'quota-{vessel.vessel_id}'] = 'high'
+        elif vessel.status == 'Near Overage':
+            alerts[f'quota-{vessel.vessel_id}'] = 'medium'
+
+        for species, cap in PSC_CAPS.items():
+            used_pct = getattr(vessel, species.replace('_psc', '_psc_count')) / (
+                vessel.cq_allocation_mt / total_allocation * cap) * 100
+            rule = PSC_LABELS[species].lower()
+            if used_pct >= 100:
+                alerts[f'{rule}-{vessel.vessel_id}'] = 'high'
+            elif used_pct >= PSC_WARNING_PCT:
+                alerts[f'{rule}-{vessel.vessel_id}'] = 'medium'
+
+        for week in weekly[weekly['vessel_id'] == vessel.vessel_id].itertuples():
+            if week.week_ending > as_of:
+                continue
+            received = week.submitted_date if week.submitted_date <= as_of else as_of
+            if (received - week.week_ending).days > LATE_SUBMISSION_DAYS:
+                alerts[f'late-{vessel.vessel_id}'] = 'low'
+    return alerts
+
+
+def test_rules_match_vessel_by_vessel(data):
+    as_of = forecast_as_of(data['weekly_harvest'])
+    alerts = generate_alerts(data['vessels'], data['weekly_harvest'], as_of)
+    expected = reference_alerts(data['vessels'], data['weekly_harvest'], as_of)
+
+    assert alerts['alert_id'].is_unique
+    assert dict(zip(alerts['alert_id'], alerts['severity'])) == expected
+    # Most severe first
+    order = alerts['severity'].map(SEVERITIES.index)
+    assert order.is_monotonic_increasing
+
+
+def test_alert_moves_severity_in_place(data):
+    as_of = forecast_as_of(data['weekly_harvest'])
+    vessels = data['vessels'].copy()
+    vessel_id = vessels['vessel_id'].iloc[0]
+
+    for status, severity in [('Near Overage', 'medium'), ('Overage', 'high')]:
+        vessels.loc[0, 'status'] = status
+        alerts = generate_alerts(vessels, data['weekly_harvest'], as_of).set_index('alert_id')
+        assert alerts.loc[f'quota-{vessel_id}', 'severity'] == severity
+
+
+def test_missing_tickets_are_late(data):
+    weekly = data['weekly_harvest'].copy()
+    as_of = forecast_as_of(weekly)
+    # The vessel's last week that is already overdue (later weeks cannot be late yet)
+    vessel_id = weekly['vessel_id'].iloc[0]
+    due = weekly[(weekly['vessel_id'] == vessel_id)
+                 & (weekly['week_ending'] <= as_of - pd.Timedelta(days=LATE_SUBMISSION_DAYS + 1))]
+    weekly.loc[due['week_ending'].idxmax(), 'submitted_date'] = pd.NaT
+
+    late = generate_alerts(data['vessels'], weekly, as_of).set_index('alert_id').loc[f'late-{vessel_id}']
+    assert late['severity'] == 'low'
+    assert late['message'].startswith('Fish ticket for week ending')
+    assert 'not yet submitted' in late['message']
+
+
+def test_combine_keeps_the_more_severe_alert(data):
+    as_of = forecast_as_of(data['weekly_harvest'])
+    alerts = generate_alerts(data['vessels'], data['weekly_harvest'], as_of)
+    rule_alert = alerts[alerts['rule'] == 'chinook'].iloc[0]
+    forecast = pd.DataFrame({
+        'species': ['chinook_psc'], 'group_id': [rule_alert['vessel_id']], 'group_name': [rule_alert['vessel_name']],
+        'level': ['Vessel'], 'status': ['at risk'], 'cumulative': [10.0], 'cap': [20.0],
+        'hit_date': [pd.NaT], 'hit_date_early': [as_of], 'hit_date_late': [pd.NaT]
+    })
+
+    combined = combine_alerts(alerts, forecast)
+    matches = combined[(combined['rule'] == 'chinook') & (combined['vessel_id'] == rule_alert['vessel_id'])]
+    assert matches['alert_id'].tolist() == [rule_alert['alert_id']]
+
+
+def test_cards_escape_names():
+    alerts = pd.DataFrame({'vessel_name': ['<b>Sea & Sky</b>'], 'message': ['1 > 0'], 'badge_color': ['red'],
+                           'alert_type': ['Overage']})
+    cards = alert_cards_html(alerts)
+    assert html.escape('<b>Sea & Sky</b>') in cards and '1 &gt; 0' in cards
+    assert alert_cards_html(alerts.iloc[:0]) == ''
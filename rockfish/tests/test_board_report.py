@@ -0,0 +1,63 @@
+"""
+Board Report KPIs must match the vessel table, and bundles are cached by the
+content of the data they were built from
+"""
+
+import os
+
+import pytest
+
+from dashboard_common.snapshot import SnapshotStore
+from rockfish import demo_data
+from rockfish.board_report import HTML_NAME, board_kpis, build_bundle, data_fingerprint, main
+from rockfish.forecast import PSC_CAPS
+
+
+def snapshot(seed=demo_data.DEMO_SEED):
+    return SnapshotStore(lambda: demo_data.load_demo_data(seed=seed)).latest()
+
+
+def test_kpis_match_vessel_table():
+    data = snapshot()
+    vessels = data['vessels']
+    kpis = board_kpis(demo_data.get_cube(data))
+
+    assert kpis['total_vessels'] == len(vessels)
+    assert kpis['total_quota'] == pytest.approx(vessels['cq_allocation_mt'].sum())
+    assert kpis['total_harvested'] == pytest.approx(vessels['harvest_to_date_mt'].sum())
+    assert kpis['overage_mt'] == pytest.approx((-vessels['quota_balance_mt']).clip(lower=0).sum())
+    assert kpis['total_chinook'] == vessels['chinook_psc_count'].sum()
+    assert kpis['chinook_pct'] == pytest.approx(vessels['chinook_psc_count'].sum() / PSC_CAPS['chinook_psc'] * 100)
+    assert kpis['vessels_in_compliance'] == (vessels['status'] == 'In Compliance').sum()
+    assert kpis['vessels_with_overages'] == (vessels['status'] == 'Overage').sum()
+
+
+def test_fingerprint_follows_content():
+    assert data_fingerprint(snapshot()) == data_fingerprint(snapshot())
+    assert data_fingerprint(snapshot()) != data_fingerprint(snapshot(seed=demo_data.DEMO_SEED + 1))
+
+
+def test_bundle_is_reused_for_unchanged_data(tmp_path):
+    data = snapshot()
+    html_path, xlsx_path, cached = build_bundle(data, tmp_path, jobs=1)
+    assert not cached
+    assert os.path.dirname(html_path) == os.path.join(tmp_path, data_fingerprint(data))
+    assert os.path.getsize(xlsx_path) > 0
+    with open(html_path) as f:
+        report = f.read()
+    for name in data['vessels']['cooperative_name'].unique():
+        assert name in report
+
+    modified = os.path.getmtime(html_path)
+    assert build_bundle(snapshot(), tmp_path, jobs=1) == (html_path, xlsx_path, True)
+    assert os.path.getmtime(html_path) == modified
+    assert build_bundle(data, tmp_path, jobs=1, force=True)[2] is False
+
+
+def test_main_writes_a_bundle_per_data_version(tmp_path, capsys):
+    assert main(['--out', str(tmp_path), '--jobs', '1']) == 0
+    assert main(['--out', str(tmp_path), '--jobs', '1', '--seed', '1']) == 0
+    bundles = sorted(os.listdir(tmp_path))
+    assert len(bundles) == 2
+    assert all(os.path.exists(os.path.join(tmp_path, bundle, HTML_NAME)) for bundle in bundles)
+    assert capsys.readouterr().out.count('Wrote') == 4
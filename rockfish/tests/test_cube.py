@@ -0,0 +1,54 @@
+"""
+Cubes patched with append_weeks / with_vessels must match a cube rebuilt from
+the amended tables
+"""
+
+import pandas as pd
+import pytest
+
+from rockfish import demo_data
+from rockfish.cube import _groupings, build_cube
+from rockfish.demo_data import load_demo_data
+
+
+@pytest.fixture(scope='module')
+def data():
+    return load_demo_data(scale=2)
+
+
+def assert_same_cube(cube, expected):
+    pd.testing.assert_series_equal(cube.fleet(), expected.fleet())
+    pd.testing.assert_frame_equal(cube.cooperatives(), expected.cooperatives())
+    for dims in _groupings():
+        pd.testing.assert_frame_equal(cube.weekly(*dims), expected.weekly(*dims), check_exact=False, atol=1e-6)
+
+
+@pytest.mark.parametrize('split', [0.3, 0.8])
+def test_append_weeks_matches_rebuild(data, split):
+    vessels, weekly = data['vessels'], data['weekly_harvest']
+    cutoff = weekly['week_ending'].quantile(split)
+    earlier, later = weekly[weekly['week_ending'] <= cutoff], weekly[weekly['week_ending'] > cutoff]
+
+    cube = build_cube(vessels, earlier)
+    assert_same_cube(cube.append_weeks(later), build_cube(vessels, weekly))
+    # The original cube is unchanged
+    assert_same_cube(cube, build_cube(vessels, earlier))
+
+
+def test_append_to_existing_cells_matches_rebuild(data):
+    vessels, weekly = data['vessels'], data['weekly_harvest']
+    extra = weekly.sample(60, random_state=40)
+    cube = build_cube(vessels, weekly).append_weeks(extra)
+    assert_same_cube(cube, build_cube(vessels, pd.concat([weekly, extra], ignore_index=True)))
+
+
+def test_published_cubes_match_rebuild(store):
+    demo_data.ingest_fish_tickets(demo_data.sample_fish_tickets(200, seed=40))
+    snapshot = store.latest()
+    assert_same_cube(demo_data.get_cube(snapshot), build_cube(snapshot['vessels'], snapshot['weekly_harvest']))
+
+    vessels = snapshot['vessels'].sort_values('quota_balance_mt', ascending=False)
+    demo_data.record_transfer(vessels['vessel_id'].iloc[0], vessels['vessel_id'].iloc[-1], 25.0,
+                              snapshot['weekly_harvest']['week_ending'].max())
+    snapshot = store.latest()
+    assert_same_cube(demo_data.get_cube(snapshot), build_cube(snapshot['vessels'], snapshot['weekly_harvest']))
@@ -0,0 +1,66 @@
+"""
+Demo data is drawn from one seeded Generator and one vessel frame: the same
+seed gives the same tables, and every table describes the same fleet
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rockfish.demo_data import COOP_ALLOCATIONS, COOP_VESSEL_COUNTS, COOPERATIVES, SEASON_START, load_demo_data
+
+
+def assert_same_data(data, other):
+    assert data.keys() == other.keys()
+    for name in data:
+        pd.testing.assert_frame_equal(data[name], other[name], obj=name)
+
+
+def test_same_seed_gives_same_data():
+    assert_same_data(load_demo_data(seed=7), load_demo_data(seed=7))
+    assert_same_data(load_demo_data(seed=7, scale=3, years=2), load_demo_data(seed=7, scale=3, years=2))
+
+
+def test_different_seeds_differ():
+    data, other = load_demo_data(seed=7), load_demo_data(seed=8)
+    for name in ('vessels', 'weekly_harvest', 'transfers'):
+        with pytest.raises(AssertionError):
+            pd.testing.assert_frame_equal(data[name], other[name])
+
+
+@pytest.mark.parametrize('scale', [1, 4])
+def test_scale_multiplies_the_fleet(scale):
+    data = load_demo_data(scale=scale)
+    vessels = data['vessels']
+    assert len(vessels) == sum(COOP_VESSEL_COUNTS) * scale
+    assert vessels['vessel_id'].is_unique
+
+    by_coop = vessels.groupby('cooperative_name')
+    expected = dict(zip(COOPERATIVES, COOP_VESSEL_COUNTS))
+    assert {name: count // scale for name, count in by_coop.size().items()} == expected
+    # Allocations are drawn to sum to the cooperative total, then rounded to 0.1 mt per vessel
+    allocations = by_coop['cq_allocation_mt'].sum().reindex(COOPERATIVES).to_numpy()
+    np.testing.assert_allclose(allocations, np.array(COOP_ALLOCATIONS) * scale, atol=0.05 * max(COOP_VESSEL_COUNTS) * scale)
+
+
+@pytest.mark.parametrize('years', [1, 2])
+def test_tables_describe_one_fleet(years):
+    data = load_demo_data(scale=2, years=years)
+    vessels = data['vessels'].set_index('vessel_id')
+    weekly = data['weekly_harvest']
+
+    # Weekly rows carry the names of the vessel frame
+    labels = vessels.loc[weekly['vessel_id'], ['vessel_name', 'cooperative_name']]
+    np.testing.assert_array_equal(labels['vessel_name'], weekly['vessel_name'])
+    np.testing.assert_array_equal(labels['cooperative_name'], weekly['cooperative_name'])
+    assert weekly['week_ending'].dt.year.nunique() == years
+
+    transfers = data['transfers']
+    assert set(transfers['from_vessel_id']) | set(transfers['to_vessel_id']) <= set(vessels.index)
+    np.testing.assert_array_equal(vessels.loc[transfers['to_vessel_id'], 'vessel_name'], transfers['to_vessel_name'])
+
+    # Harvest and PSC to date are the current season's landings
+    season = weekly[weekly['week_ending'].dt.year == SEASON_START.year]
+    totals = season.groupby('vessel_id')[['harvest_mt', 'chinook_psc']].sum().reindex(vessels.index, fill_value=0)
+    np.testing.assert_allclose(vessels['harvest_to_date_mt'], totals['harvest_mt'], atol=0.051)
+    np.testing.assert_array_equal(vessels['chinook_psc_count'], totals['chinook_psc'])
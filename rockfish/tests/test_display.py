@@ -0,0 +1,53 @@
+"""
+Display tables are built once per data version and filter values, and the
+per-version cache stays bounded
+"""
+
+import pandas as pd
+
+from dashboard_common import display
+from dashboard_common.display import DisplayCache
+from rockfish import demo_data
+
+
+def counting_build(calls, frame):
+    def build():
+        calls.append(1)
+        return frame
+    return build
+
+
+def test_table_is_built_once_per_version(store):
+    calls = []
+    frame = pd.DataFrame({'Vessel': ['A', 'B'], 'Harvest (mt)': ['1.0', '2.0']}, index=[5, 6])
+    build = counting_build(calls, frame)
+
+    snapshot = store.latest()
+    first = display.table(snapshot, 'vessels', build, 'all')
+    assert display.table(snapshot, 'vessels', build, 'all') is first
+    assert first.column_names == ['Vessel', 'Harvest (mt)']
+    assert len(calls) == 1
+
+    # Other filter values are separate tables
+    display.table(snapshot, 'vessels', build, 'Overage')
+    assert len(calls) == 2
+
+    # A new data version starts with an empty cache
+    demo_data.ingest_fish_tickets(demo_data.sample_fish_tickets(10, seed=50))
+    display.table(store.latest(), 'vessels', build, 'all')
+    assert len(calls) == 3
+
+
+def test_cache_evicts_least_recently_used():
+    calls = []
+    cache = DisplayCache(max_entries=2)
+    build = counting_build(calls, pd.DataFrame({'a': [1]}))
+
+    cache.get('x', build)
+    cache.get('y', build)
+    cache.get('x', build)
+    cache.get('z', build)
+    assert list(cache.tables) == ['x', 'z']
+
+    cache.get('x', build)
+    assert len(calls) == 3
@@ -0,0 +1,79 @@
+"""
+PSC forecast totals and rates per group must match a plain pandas groupby
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rockfish.demo_data import forecast_as_of, load_demo_data
+from rockfish.forecast import PSC_CAPS, RATE_WEEKS, PSCForecaster, forecast_psc, psc_groups
+
+
+@pytest.fixture(scope='module')
+def data():
+    return load_demo_data(scale=3)
+
+
+def reference(vessels, weekly, as_of):
+    """Cumulative PSC and recent weekly rate per (level, group_id, species)"""
+    weekly = weekly[weekly['week_ending'] <= as_of].merge(vessels[['vessel_id', 'cooperative_id']], on='vessel_id')
+    weeks = np.sort(weekly['week_ending'].unique())[-RATE_WEEKS:]
+
+    rows = []
+    for level, key in (('Fleet', None), ('Cooperative', 'cooperative_id'), ('Vessel', 'vessel_id')):
+        by_week = weekly.assign(group_id='FLEET' if key is None else weekly[key])
+        by_week = by_week.groupby(['group_id', 'week_ending'])[list(PSC_CAPS)].sum()
+        for species in PSC_CAPS:
+            per_week = by_week[species].unstack(fill_value=0).reindex(columns=weeks, fill_value=0)
+            rows.append(pd.DataFrame({
+                'level': level,
+                'group_id': per_week.index,
+                'species': species,
+                'cumulative': by_week[species].groupby(level='group_id').sum().reindex(per_week.index).to_numpy(),
+                'weekly_rate': per_week.mean(axis=1).to_numpy()
+            }))
+    return pd.concat(rows, ignore_index=True)
+
+
+def test_psc_groups_cap_shares(data):
+    vessels = data['vessels']
+    groups, group_index = psc_groups(vessels)
+
+    assert len(groups) == 1 + vessels['cooperative_id'].nunique() + len(vessels)
+    shares = groups.set_index('group_id')['cap_share']
+    expected = vessels.groupby('cooperative_id')['cq_allocation_mt'].sum() / vessels['cq_allocation_mt'].sum()
+    np.testing.assert_allclose(shares[expected.index], expected)
+    assert shares['FLEET'] == pytest.approx(1.0)
+    assert all(len(index) == len(vessels) for index in group_index)
+
+
+@pytest.mark.parametrize('weeks_in', [0, 1, 3, None])
+def test_totals_and_rates_match_groupby(data, weeks_in):
+    vessels, weekly = data['vessels'], data['weekly_harvest']
+    weeks = np.sort(weekly['week_ending'].unique())
+    if weeks_in is None:
+        as_of = forecast_as_of(weekly)
+    elif weeks_in == 0:
+        as_of = pd.Timestamp(weeks[0]) - pd.Timedelta(days=1)
+    else:
+        as_of = pd.Timestamp(weeks[weeks_in - 1])
+
+    result = forecast_psc(vessels, weekly, as_of)
+    expected = reference(vessels, weekly, as_of)
+
+    merged = result.merge(expected, on=['level', 'group_id', 'species'], how='left', suffixes=('', '_expected'))
+    merged = merged.fillna({'cumulative_expected': 0, 'weekly_rate_expected': 0})
+    np.testing.assert_allclose(merged['cumulative'], merged['cumulative_expected'])
+    np.testing.assert_allclose(merged['weekly_rate'], merged['weekly_rate_expected'])
+
+
+def test_vessels_missing_from_weekly_count_as_zero(data):
+    vessels, weekly = data['vessels'], data['weekly_harvest']
+    idle = vessels['vessel_id'].iloc[0]
+    as_of = forecast_as_of(weekly)
+
+    forecaster = PSCForecaster(vessels, weekly[weekly['vessel_id'] != idle], as_of)
+    vessel_rows = (forecaster.groups['group_id'] == idle).to_numpy()
+    assert (forecaster.cumulative[:, vessel_rows] == 0).all()
+    assert forecaster.as_of == pd.Timestamp(weekly.loc[weekly['week_ending'] <= as_of, 'week_ending'].max())
@@ -0,0 +1,86 @@
+"""
+HarvestTotals folded up ticket by ticket must match totals summed again from
+the season's landings
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rockfish.demo_data import load_demo_data, sample_fish_tickets
+from rockfish.ingest import (TOTAL_COLUMNS, build_harvest_totals, empty_tickets, harvest_to_date, normalize_tickets,
+                             quota_status, season_weeks, weekly_rows)
+
+
+@pytest.fixture(scope='module')
+def data():
+    return load_demo_data(scale=2)
+
+
+def tickets(data, count, seed):
+    raw = sample_fish_tickets(count, seed=seed, snapshot=data)
+    return normalize_tickets(raw, data['vessels'], season_weeks(data['weekly_harvest']))
+
+
+def recomputed(data, accepted):
+    """Vessel totals summed from the weekly landings plus the accepted tickets"""
+    weekly = pd.concat([data['weekly_harvest'], weekly_rows(accepted)], ignore_index=True)
+    return harvest_to_date(data['vessels'], weekly)
+
+
+def assert_matches_recompute(totals, vessels):
+    actual = totals.vessels()
+    for column in TOTAL_COLUMNS.values():
+        np.testing.assert_allclose(actual[column].to_numpy(dtype=float), vessels[column].to_numpy(dtype=float),
+                                   atol=0.051)
+    quota = (vessels['cq_allocation_mt'] + vessels['net_transfers_mt']).to_numpy()
+    np.testing.assert_array_equal(actual['status'].to_numpy(), quota_status(vessels['harvest_to_date_mt'].to_numpy(), quota))
+
+    coops = totals.cooperatives().set_index('cooperative_name')
+    expected = vessels.groupby('cooperative_name')[list(TOTAL_COLUMNS.values())].sum()
+    for column in TOTAL_COLUMNS.values():
+        np.testing.assert_allclose(coops[column].to_numpy(dtype=float),
+                                   expected[column].reindex(coops.index).to_numpy(dtype=float), atol=0.051)
+
+
+def test_batches_match_recompute(data):
+    totals = build_harvest_totals(data['vessels'], empty_tickets())
+    first, second = tickets(data, 300, seed=1), tickets(data, 200, seed=2)
+
+    totals, accepted_first = totals.apply(first)
+    totals, accepted_second = totals.apply(second)
+    assert len(accepted_first) == len(first) and len(accepted_second) == len(second)
+    assert_matches_recompute(totals, recomputed(data, pd.concat([first, second])))
+
+
+def test_repeated_tickets_are_skipped(data):
+    batch = tickets(data, 150, seed=3)
+    totals, _ = build_harvest_totals(data['vessels'], empty_tickets()).apply(batch)
+
+    # Re-sent tickets, and repeats within one batch, are not counted again
+    resent = pd.concat([batch.iloc[:50], tickets(data, 20, seed=4)], ignore_index=True)
+    resent = pd.concat([resent, resent.iloc[-5:]], ignore_index=True)
+    totals, accepted = totals.apply(resent)
+
+    assert len(accepted) == 20
+    assert_matches_recompute(totals, recomputed(data, pd.concat([batch, accepted])))
+
+
+def test_apply_leaves_the_original_unchanged(data):
+    totals = build_harvest_totals(data['vessels'], empty_tickets())
+    before = totals.vessels()
+    totals.apply(tickets(data, 100, seed=5))
+    pd.testing.assert_frame_equal(totals.vessels(), before)
+    assert not totals.ticket_ids
+
+
+def test_with_quota_refreshes_status_only(data):
+    totals, _ = build_harvest_totals(data['vessels'], empty_tickets()).apply(tickets(data, 100, seed=6))
+    vessels = data['vessels'].assign(net_transfers_mt=data['vessels']['net_transfers_mt'] - 50)
+
+    refreshed = totals.with_quota(vessels)
+    for column in TOTAL_COLUMNS.values():
+        pd.testing.assert_series_equal(refreshed.vessels()[column], totals.vessels()[column])
+    harvest = totals.vessels()['harvest_to_date_mt'].to_numpy()
+    quota = (vessels['cq_allocation_mt'] + vessels['net_transfers_mt']).to_numpy()
+    np.testing.assert_array_equal(refreshed.vessels()['status'].to_numpy(), quota_status(harvest, quota))
@@ -0,0 +1,141 @@
+"""
+QuotaLedger as-of balances must match a cumulative sum over the posted
+events, and patched ledgers must match ledgers built from all events
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rockfish.demo_data import load_demo_data
+from rockfish.ledger import KINDS, QuotaLedger, build_ledger
+
+START = pd.Timestamp('2026-01-01')
+DAYS = 90
+VESSELS = [f'V-{n:03d}' for n in range(1, 8)]
+
+
+def random_events(rng, n):
+    return pd.DataFrame({
+        'vessel_id': rng.choice(VESSELS, n),
+        'date': START + pd.to_timedelta(rng.integers(0, DAYS, n), unit='D'),
+        'kind': rng.choice(KINDS, n),
+        'amount_mt': rng.normal(0, 50, n).round(1),
+        'ref': 'random'
+    })
+
+
+def reference(events):
+    """(kinds, vessels, days) running totals: a plain cumulative sum per day"""
+    daily = np.zeros((len(KINDS), len(VESSELS), DAYS))
+    np.add.at(daily, (events['kind'].map(KINDS.index).to_numpy(),
+                      events['vessel_id'].map(VESSELS.index).to_numpy(),
+                      (events['date'] - START).dt.days.to_numpy()),
+              events['amount_mt'].to_numpy())
+    return daily.cumsum(axis=2)
+
+
+@pytest.fixture
+def events():
+    return random_events(np.random.default_rng(37), 400)
+
+
+def assert_matches(ledger, events):
+    expected = reference(events)
+    for day in range(DAYS):
+        balances = ledger.fleet_balances(START + pd.Timedelta(days=day))
+        np.testing.assert_allclose(balances['allocation_mt'], expected[0, :, day], atol=1e-9)
+        np.testing.assert_allclose(balances['net_transfers_mt'], expected[1, :, day], atol=1e-9)
+        np.testing.assert_allclose(balances['harvest_mt'], -expected[2, :, day], atol=1e-9)
+        np.testing.assert_allclose(balances['balance_mt'], expected[:, :, day].sum(axis=0), atol=1e-9)
+
+
+def test_fleet_balances_match_cumsum(events):
+    assert_matches(QuotaLedger(VESSELS, events, START, DAYS), events)
+
+
+def test_point_balances_match_cumsum(events):
+    ledger = QuotaLedger(VESSELS, events, START, DAYS)
+    expected = reference(events).sum(axis=0)
+
+    rng = np.random.default_rng(0)
+    rows, days = rng.integers(0, len(VESSELS), 200), rng.integers(0, DAYS, 200)
+    vessel_ids = [VESSELS[row] for row in rows]
+    dates = START + pd.to_timedelta(days, unit='D')
+
+    np.testing.assert_allclose(ledger.balances_at(vessel_ids, dates), expected[rows, days], atol=1e-9)
+    for vessel_id, date, row, day in list(zip(vessel_ids, dates, rows, days))[:20]:
+        assert ledger.balance(vessel_id, date) == pytest.approx(expected[row, day])
+
+
+def test_apply_transfers_matches_rebuild(events):
+    ledger = QuotaLedger(VESSELS, events, START, DAYS)
+    transfers = pd.DataFrame({
+        'transfer_id': ['T-1', 'T-2', 'T-3'],
+        'from_vessel_id': ['V-001', 'V-002', 'V-001'],
+        'to_vessel_id': ['V-003', 'V-001', 'V-007'],
+        'amount_mt': [12.5, 40.0, 3.1],
+        'transfer_date': START + pd.to_timedelta([0, 45, DAYS - 1], unit='D')
+    })
+    patched = ledger.apply_transfers(transfers)
+
+    legs = pd.DataFrame({
+        'vessel_id': np.concatenate([transfers['from_vessel_id'], transfers['to_vessel_id']]),
+        'date': pd.concat([transfers['transfer_date']] * 2, ignore_index=True),
+        'kind': 'transfer',
+        'amount_mt': np.concatenate([-transfers['amount_mt'], transfers['amount_mt']]),
+        'ref': np.concatenate([transfers['transfer_id']] * 2)
+    })
+    all_events = pd.concat([events, legs], ignore_index=True)
+    assert_matches(patched, all_events)
+    np.testing.assert_allclose(patched._tree, QuotaLedger(VESSELS, all_events, START, DAYS)._tree, atol=1e-9)
+    assert len(patched.events) == len(all_events)
+
+    # The original ledger is unchanged
+    assert_matches(ledger, events)
+
+
+def test_apply_harvest_matches_rebuild(events):
+    ledger = QuotaLedger(VESSELS, events, START, DAYS)
+    landings = pd.DataFrame({
+        'ticket_id': ['FT-1', 'FT-2'],
+        'vessel_id': ['V-004', 'V-004'],
+        'harvest_mt': [20.0, 7.5],
+        'week_ending': START + pd.to_timedelta([6, 13], unit='D')
+    })
+    patched = ledger.apply_harvest(landings)
+
+    harvest = pd.DataFrame({
+        'vessel_id': landings['vessel_id'],
+        'date': landings['week_ending'],
+        'kind': 'harvest',
+        'amount_mt': -landings['harvest_mt'],
+        'ref': landings['ticket_id']
+    })
+    assert_matches(patched, pd.concat([events, harvest], ignore_index=True))
+
+
+def test_rejects_unknown_vessels_and_dates(events):
+    ledger = QuotaLedger(VESSELS, events, START, DAYS)
+    with pytest.raises(ValueError, match='Unknown vessel ID'):
+        ledger.balance('V-999', START)
+    with pytest.raises(ValueError, match='outside the ledger season'):
+        ledger.fleet_balances(START + pd.Timedelta(days=DAYS))
+    with pytest.raises(ValueError, match='outside the ledger season'):
+        ledger.balances_at(['V-001'], [START - pd.Timedelta(days=1)])
+
+
+def test_demo_ledger_end_position():
+    data = load_demo_data()
+    ledger = build_ledger(data['vessels'], data['weekly_harvest'], data['transfers'])
+    position = ledger.fleet_balances(ledger.end).set_index('vessel_id')
+
+    transfers = data['transfers']
+    net = (transfers.groupby('to_vessel_id')['amount_mt'].sum()
+           .sub(transfers.groupby('from_vessel_id')['amount_mt'].sum(), fill_value=0))
+    harvest = data['weekly_harvest'].groupby('vessel_id')['harvest_mt'].sum()
+    vessel_ids = data['vessels']['vessel_id']
+
+    np.testing.assert_allclose(position['net_transfers_mt'], net.reindex(vessel_ids, fill_value=0), atol=1e-6)
+    np.testing.assert_allclose(position['harvest_mt'], harvest.reindex(vessel_ids, fill_value=0), atol=1e-6)
+    np.testing.assert_allclose(position['balance_mt'], data['vessels']['quota_balance_mt'], atol=0.051)
@@ -0,0 +1,80 @@
+"""
+PscRates window sums, rankings and hotspots must match the same figures
+computed with pandas groupby / rolling from the weekly landings
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rockfish.demo_data import load_demo_data
+from rockfish.psc import HOTSPOT_MIN_HARVEST_MT, RATE_WINDOWS, build_psc_rates
+
+
+@pytest.fixture(scope='module')
+def data():
+    return load_demo_data(scale=2)
+
+
+@pytest.fixture(scope='module')
+def rates(data):
+    return build_psc_rates(data['vessels'], data['weekly_harvest'])
+
+
+def rolling_sums(data, measure, window, key='vessel_id'):
+    """(rows x weeks) window sums, rows in vessel (or cooperative) order"""
+    weekly = data['weekly_harvest']
+    grid = weekly.pivot_table(index=key, columns='week_ending', values=measure, aggfunc='sum', fill_value=0)
+    rows = data['vessels']['vessel_id'] if key == 'vessel_id' else np.unique(data['vessels']['cooperative_name'])
+    grid = grid.reindex(index=rows, columns=np.sort(weekly['week_ending'].unique()), fill_value=0).astype(float)
+    return grid.T.rolling(window, min_periods=1).sum().T
+
+
+def reference_rates(psc, harvest):
+    return (psc / harvest * 1000).where(harvest > 0).to_numpy()
+
+
+@pytest.mark.parametrize('window', (1, *RATE_WINDOWS))
+@pytest.mark.parametrize('level, key', [('vessel', 'vessel_id'), ('cooperative', 'cooperative_name')])
+@pytest.mark.parametrize('species', ['chinook_psc', 'halibut_psc'])
+def test_weekly_rates_match_rolling(data, rates, species, level, key, window):
+    expected = reference_rates(rolling_sums(data, species, window, key), rolling_sums(data, 'harvest_mt', window, key))
+    np.testing.assert_allclose(rates.weekly_rates(species, window, level), expected, rtol=1e-9)
+
+
+def test_ranking_matches_groupby(data, rates):
+    ranking = rates.ranking('chinook_psc')
+    totals = data['weekly_harvest'].groupby('vessel_id')[['harvest_mt', 'chinook_psc']].sum()
+    totals = totals.reindex(ranking['vessel_id'], fill_value=0)
+
+    np.testing.assert_allclose(ranking['harvest_mt'], totals['harvest_mt'].round(1))
+    np.testing.assert_array_equal(ranking['psc'], totals['chinook_psc'])
+    np.testing.assert_allclose(ranking['rate'], reference_rates(totals['chinook_psc'], totals['harvest_mt']), rtol=1e-9)
+    # Highest season rate first
+    season_rates = ranking['rate'].dropna().to_numpy()
+    assert (np.diff(season_rates) <= 0).all()
+    assert ranking['rank'].iloc[0] == 1
+
+    coops = rates.ranking('chinook_psc', 'cooperative')
+    assert coops['psc'].sum() == ranking['psc'].sum()
+
+
+@pytest.mark.parametrize('window', (1, *RATE_WINDOWS))
+def test_hotspots_match_nlargest(data, rates, window):
+    psc = rolling_sums(data, 'chinook_psc', window).stack()
+    harvest = rolling_sums(data, 'harvest_mt', window).stack()
+    candidates = pd.DataFrame({'harvest_mt': harvest, 'psc': psc})
+    candidates = candidates[candidates['harvest_mt'] >= HOTSPOT_MIN_HARVEST_MT]
+    candidates['rate'] = candidates['psc'] / candidates['harvest_mt'] * 1000
+    expected = candidates.nlargest(10, 'rate')
+
+    hotspots = rates.hotspots('chinook_psc', window, n=10)
+    np.testing.assert_allclose(hotspots['rate'], expected['rate'], rtol=1e-9)
+    # Each hotspot's figures are those of its own vessel-week
+    found = candidates.loc[list(zip(hotspots['vessel_id'], hotspots['week_ending']))]
+    np.testing.assert_allclose(hotspots['rate'], found['rate'], rtol=1e-9)
+    np.testing.assert_array_equal(hotspots['psc'], found['psc'])
+
+
+def test_no_hotspots_above_the_harvest_floor(rates):
+    assert rates.hotspots(min_harvest_mt=1e9).empty
@@ -0,0 +1,83 @@
+"""
+HarvestSeries appends must match a series built from all landings, and its
+range queries must match summing the landings with pandas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rockfish.demo_data import load_demo_data
+from rockfish.timeseries import MEASURES, HarvestSeries
+
+
+@pytest.fixture(scope='module')
+def data():
+    return load_demo_data(scale=2)
+
+
+def calendar(weekly):
+    return weekly['week_ending'].min(), weekly['week_ending'].max()
+
+
+def assert_same_series(series, expected):
+    for measure in MEASURES:
+        np.testing.assert_allclose(series.cumulative[measure], expected.cumulative[measure], atol=1e-6)
+    np.testing.assert_array_equal(series.landing_days, expected.landing_days)
+
+
+@pytest.mark.parametrize('split', [0.5, 0.9])
+def test_append_matches_rebuild(data, split):
+    vessel_ids, weekly = data['vessels']['vessel_id'], data['weekly_harvest']
+    start, end = calendar(weekly)
+    cutoff = weekly['week_ending'].quantile(split)
+    earlier, later = weekly[weekly['week_ending'] <= cutoff], weekly[weekly['week_ending'] > cutoff]
+
+    series = HarvestSeries(vessel_ids, earlier, start=start, end=end)
+    appended = series.append(later)
+
+    assert_same_series(appended, HarvestSeries(vessel_ids, weekly, start=start, end=end))
+    # The original series is unchanged
+    assert_same_series(series, HarvestSeries(vessel_ids, earlier, start=start, end=end))
+
+
+def test_backdated_append_matches_rebuild(data):
+    vessel_ids, weekly = data['vessels']['vessel_id'], data['weekly_harvest']
+    start, end = calendar(weekly)
+    rng = np.random.default_rng(46)
+    late = weekly.sample(40, random_state=46).assign(
+        harvest_mt=rng.uniform(1, 30, 40).round(1), chinook_psc=rng.integers(0, 5, 40), halibut_psc=rng.integers(0, 5, 40)
+    )
+
+    series = HarvestSeries(vessel_ids, weekly).append(late).append(late.iloc[:0])
+    assert_same_series(series, HarvestSeries(vessel_ids, pd.concat([weekly, late]), start=start, end=end))
+
+
+def test_range_queries_match_pandas(data):
+    vessel_ids, weekly = data['vessels']['vessel_id'], data['weekly_harvest']
+    series = HarvestSeries(vessel_ids, weekly)
+    weeks = np.sort(weekly['week_ending'].unique())
+    first, last = pd.Timestamp(weeks[3]), pd.Timestamp(weeks[10])
+
+    in_range = weekly[weekly['week_ending'].between(first, last)]
+    for measure in MEASURES:
+        expected = in_range.groupby('vessel_id')[measure].sum().reindex(vessel_ids, fill_value=0)
+        np.testing.assert_allclose(series.between(first, last, measure).to_numpy(), expected.to_numpy(), atol=1e-6)
+
+    monthly = series.resample('MS', fleet=True)
+    assert monthly.sum() == pytest.approx(weekly['harvest_mt'].sum())
+
+    trend = series.trend('chinook_psc')
+    expected = weekly.groupby('week_ending')['chinook_psc'].sum()
+    np.testing.assert_allclose(trend['chinook_psc'], expected.to_numpy())
+    np.testing.assert_allclose(trend['cumulative'], expected.cumsum().to_numpy())
+
+
+def test_rejects_landings_outside_the_calendar(data):
+    vessel_ids, weekly = data['vessels']['vessel_id'], data['weekly_harvest']
+    series = HarvestSeries(vessel_ids, weekly)
+    late = weekly.iloc[:1].assign(week_ending=series.end + pd.Timedelta(days=7))
+    with pytest.raises(ValueError, match='outside the series'):
+        series.append(late)
+    with pytest.raises(ValueError, match='Unknown vessel ID'):
+        series.append(weekly.iloc[:1].assign(vessel_id='V-999'))
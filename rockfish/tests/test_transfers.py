@@ -0,0 +1,126 @@
+"""
+Batch transfers: row checks and netting, and posting a batch all or nothing
+"""
+
+import pandas as pd
+import pytest
+
+from rockfish import demo_data
+from rockfish.ingest import NEAR_OVERAGE_PCT
+from rockfish.transfers import net_transfers, validate_transfers
+
+DATE = pd.Timestamp('2026-06-01')
+
+
+def batch(*rows):
+    return pd.DataFrame([
+        {'from_vessel_id': from_id, 'to_vessel_id': to_id, 'amount_mt': amount, 'transfer_date': date}
+        for from_id, to_id, amount, date in rows
+    ])
+
+
+def validate(store, rows):
+    snapshot = store.latest()
+    return validate_transfers(rows, snapshot['vessels'], demo_data.get_ledger(snapshot), snapshot['transfers'])
+
+
+def test_net_transfers_offsets_pairs_per_day():
+    netted = net_transfers(batch(
+        ('V-001', 'V-002', 50.0, DATE),
+        ('V-002', 'V-001', 20.0, DATE),
+        ('V-001', 'V-002', 5.0, DATE),
+        ('V-003', 'V-004', 10.0, DATE),
+        ('V-004', 'V-003', 10.0, DATE),
+        ('V-002', 'V-001', 30.0, DATE + pd.Timedelta(days=1))
+    ))
+
+    rows = {(row.from_vessel_id, row.to_vessel_id, row.transfer_date): row for row in netted.itertuples()}
+    assert set(rows) == {('V-001', 'V-002', DATE), ('V-002', 'V-001', DATE + pd.Timedelta(days=1))}
+    assert rows['V-001', 'V-002', DATE].amount_mt == pytest.approx(35.0)
+    assert rows['V-001', 'V-002', DATE].source_rows == [0, 1, 2]
+    assert rows['V-001', 'V-002', DATE].notes == 'Netted batch transfer'
+
+
+def test_validate_reports_row_errors(store):
+    report, netted = validate(store, batch(
+        ('V-001', 'V-002', 10.0, DATE),
+        ('V-999', 'V-002', 10.0, DATE),
+        ('V-001', 'V-001', 10.0, DATE),
+        ('V-001', 'V-002', 0.0, DATE),
+        ('V-001', 'V-002', 10.0, pd.Timestamp('2027-02-01'))
+    ))
+
+    assert report['error'].tolist()[:4] == ['', 'Unrecognized From vessel ID', 'Self-transfer', 'Amount must be positive']
+    assert report['error'].iloc[4].startswith('Date outside the season')
+    assert netted['source_rows'].tolist() == [[0]]
+
+
+def test_validate_rejects_negative_balance(store):
+    vessels = store.latest()['vessels'].set_index('vessel_id')
+    balance = demo_data.get_ledger(store.latest()).balance('V-003', DATE)
+    assert balance < vessels.loc['V-003', 'cq_allocation_mt']
+
+    report, _ = validate(store, batch(('V-003', 'V-001', round(balance + 50, 1), DATE)))
+    assert report['error'].iloc[0].startswith('Leaves V-003 at')
+
+
+def test_record_transfers_is_all_or_nothing(store):
+    before = store.latest()
+    snapshot, report, _ = demo_data.record_transfers(batch(
+        ('V-003', 'V-004', 40.0, DATE),
+        ('V-003', 'V-999', 10.0, DATE)
+    ))
+
+    assert snapshot is None
+    assert (report['error'] != '').sum() == 1
+    assert store.latest() is before
+
+
+def test_record_transfers_posts_netted_batch(store):
+    before = store.latest()
+    ledger = demo_data.get_ledger(before)
+    snapshot, _, netted = demo_data.record_transfers(batch(
+        ('V-003', 'V-004', 40.0, DATE),
+        ('V-004', 'V-003', 15.0, DATE)
+    ))
+
+    assert snapshot.version == before.version + 1
+    assert len(netted) == 1
+    assert len(snapshot['transfers']) == len(before['transfers']) + 1
+
+    posted = snapshot['transfers'].iloc[-1]
+    assert (posted['from_vessel_id'], posted['to_vessel_id'], posted['amount_mt']) == ('V-003', 'V-004', 25.0)
+
+    after = demo_data.get_ledger(snapshot)
+    assert after.balance('V-003', DATE) == pytest.approx(ledger.balance('V-003', DATE) - 25.0)
+    assert after.balance('V-004', DATE) == pytest.approx(ledger.balance('V-004', DATE) + 25.0)
+
+
+def test_record_transfer_raises_validation_error(store):
+    with pytest.raises(ValueError, match='Self-transfer'):
+        demo_data.record_transfer('V-001', 'V-001', 10.0, DATE)
+
+
+def test_record_transfer_rounding_to_zero_raises(store):
+    before = store.latest()
+    with pytest.raises(ValueError, match='nets to zero'):
+        demo_data.record_transfer('V-003', 'V-004', 0.04, DATE)
+    assert store.latest() is before
+
+
+@pytest.mark.parametrize('buffer_pct, cleared', [
+    (0, ['Overage']),
+    (100 - NEAR_OVERAGE_PCT, ['Overage', 'Near Overage']),
+    (10, ['Overage', 'Near Overage'])
+])
+def test_posted_recommendations_clear_statuses(store, buffer_pct, cleared):
+    before = store.latest()
+    assert before['vessels']['status'].isin(cleared).any()
+
+    _, recommended, shortfall = demo_data.get_transfer_recommendations(buffer_pct, before)
+    snapshot, report, _ = demo_data.record_transfers(recommended.drop(columns='scope'))
+
+    assert snapshot is not None, report[report['error'] != '']
+    assert shortfall.empty
+    still = snapshot['vessels'][snapshot['vessels']['status'].isin(cleared)]
+    assert still.empty, still[['vessel_id', 'status', 'quota_balance_mt']]
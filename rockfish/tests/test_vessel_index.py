@@ -0,0 +1,75 @@
+"""
+VesselIndex queries must match filtering and stable-sorting the table with pandas
+"""
+
+import itertools
+
+import pandas as pd
+import pytest
+
+from rockfish.demo_data import load_demo_data
+from rockfish.vessel_index import DISPLAY_COLUMNS, VesselIndex
+
+
+@pytest.fixture(scope='module')
+def index():
+    return VesselIndex(load_demo_data(scale=10)['vessels'])
+
+
+def reference(index, cooperatives, statuses, sort_by, ascending):
+    table = index.table
+    rows = table[table['cooperative_name'].isin(cooperatives) & table['status'].isin(statuses)]
+    return rows.sort_values(sort_by, ascending=ascending, kind='stable').rename(columns=DISPLAY_COLUMNS)
+
+
+@pytest.mark.parametrize('sort_by, ascending', list(itertools.product(DISPLAY_COLUMNS, (True, False))))
+def test_sorted_pages_match_pandas(index, sort_by, ascending):
+    cooperatives = index.cooperatives[:3]
+    statuses = index.statuses
+    expected = reference(index, cooperatives, statuses, sort_by, ascending)
+
+    for page in range(3):
+        page_df, total, _ = index.query(cooperatives, statuses, sort_by, ascending, page=page, page_size=25)
+        assert total == len(expected)
+        pd.testing.assert_frame_equal(page_df, expected.iloc[page * 25:(page + 1) * 25])
+
+
+def test_descending_ties_keep_table_order(index):
+    page_df, total, _ = index.query(index.cooperatives, index.statuses, 'cooperative_name', ascending=False,
+                                    page_size=len(index.table))
+    assert total == len(index.table)
+    for _, rows in page_df.groupby('Cooperative', sort=False):
+        assert rows.index.is_monotonic_increasing
+
+
+def test_filters_and_summary(index):
+    statuses = [status for status in index.statuses if status != 'In Compliance']
+    cooperatives = index.cooperatives[1:]
+    page_df, total, summary = index.query(cooperatives, statuses, page_size=250)
+
+    expected = reference(index, cooperatives, statuses, 'vessel_name', True)
+    assert total == len(expected) == summary['vessels']
+    assert summary['in_compliance'] == 0
+    assert summary['overage'] == int((expected['Status'] == 'Overage').sum())
+    assert summary['chinook_psc'] == int(expected['Chinook PSC'].sum())
+    assert set(page_df['Status']) <= set(statuses)
+
+
+def test_page_is_clamped(index):
+    everything = (index.cooperatives, index.statuses)
+    _, total, _ = index.query(*everything)
+    last_page = (total - 1) // 25
+
+    first, _, _ = index.query(*everything, page=-3)
+    pd.testing.assert_frame_equal(first, index.query(*everything, page=0)[0])
+    beyond, _, _ = index.query(*everything, page=last_page + 10)
+    pd.testing.assert_frame_equal(beyond, index.query(*everything, page=last_page)[0])
+    assert 0 < len(beyond) <= 25
+
+
+def test_empty_selection_and_unknown_column(index):
+    page_df, total, summary = index.query([], index.statuses)
+    assert page_df.empty and total == 0 and summary['vessels'] == 0
+
+    with pytest.raises(ValueError, match='Unknown sort column'):
+        index.query(index.cooperatives, index.statuses, sort_by='nope')
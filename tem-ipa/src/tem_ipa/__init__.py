@@ -0,0 +1,19 @@
+"""
+TEM IPA Manager Dashboard
+
+    app        - the Streamlit dashboard (main() runs one script run)
+    demo_data  - demo trips and the process-wide trip store
+    trip_store - versioned trips with incrementally maintained metrics
+    rules      - trip-limit and MRA rules
+    anomalies  - per-vessel catch anomaly detection
+    simulation - Monte Carlo season outlook
+    thresholds - trip limits and the pollock index
+"""
+
+import os
+import sys
+
+# dashboard_common (shared with the other app) lives at the repository root
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
@@ -0,0 +1,119 @@
+"""
+Rolling anomaly detection on trip weights and species mix
+
+A trip is compared against the same vessel's previous ANOMALY_WINDOW trips
+rather than a fixed line, so a jump like a 340k trip from a vessel that
+usually lands 270k (or an abrupt change in its Pacific cod share) is flagged
+even when no limit is crossed. The baseline is the median of the prior trips
+and the spread is their MAD, so one earlier outlier does not hide the next.
+
+`detect_anomalies` runs on the per-trip metrics from rules.py: the prior
+trips are gathered with per-vessel shifts into one (trips x window) array and
+every trip and signal is scored in a single vectorized pass. It only looks at
+each vessel's own history, so after an amendment or import just the affected
+vessels need re-scoring (see trip_store.py).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+ANOMALY_WINDOW = 6          # Prior trips in the baseline
+ANOMALY_MIN_TRIPS = 3       # Prior trips needed before a trip is scored
+ANOMALY_THRESHOLD = 3.5     # Robust z-score cut-off (Iglewicz & Hoaglin)
+
+# MAD -> standard deviation for normally distributed data
+MAD_SCALE = 1.4826
+
+ANOMALY_COLUMNS = [
+    'vessel_id', 'vessel_name', 'trip_id', 'delivery_date', 'signal', 'label',
+    'value', 'baseline', 'robust_z', 'zscore', 'direction', 'unit'
+]
+
+
+@dataclass(frozen=True)
+class AnomalySignal:
+    """A per-trip metric column to score against the vessel's history"""
+    column: str
+    label: str
+    unit: str
+    min_spread: float       # Spread floor, so perfectly steady vessels aren't flagged on noise
+    relative: bool = False  # min_spread is a fraction of the baseline
+
+
+SIGNALS = (
+    AnomalySignal('pollock_lbs', 'Pollock Weight', 'lbs', 0.02, relative=True),
+    AnomalySignal('MRA_PCOD_pct', 'Pacific Cod Share', '%', 1.0),
+    AnomalySignal('MRA_OTHER_pct', 'Other Species Share', '%', 0.25),
+)
+
+
+def _prior_trips(values, vessel_ids, window):
+    """(trips x window) array of each trip's previous `window` values (NaN-padded)"""
+    by_vessel = values.groupby(vessel_ids, sort=False)
+    return np.column_stack([by_vessel.shift(lag).to_numpy(dtype=float) for lag in range(1, window + 1)])
+
+
+@timed()
+def detect_anomalies(metrics, signals=SIGNALS, window=ANOMALY_WINDOW,
+                     min_trips=ANOMALY_MIN_TRIPS, threshold=ANOMALY_THRESHOLD):
+    """
+    Score every trip against its vessel's previous `window` trips
+
+    Args:
+        metrics: per-trip metrics (rules.compute_trip_metrics), sorted by
+            vessel and date
+
+    Returns:
+        DataFrame with one row per anomalous trip and signal (ANOMALY_COLUMNS)
+    """
+    frames = []
+    vessel_ids = metrics['vessel_id']
+
+    for signal in signals:
+        values = metrics[signal.column].astype(float)
+        prior = _prior_trips(values, vessel_ids, window)
+        counts = np.sum(~np.isnan(prior), axis=1)
+        scored = counts >= min_trips
+        if not scored.any():
+            continue
+
+        prior = prior[scored]
+        current = values.to_numpy()[scored]
+        with np.errstate(invalid='ignore'):
+            baseline = np.nanmedian(prior, axis=1)
+            mad = np.nanmedian(np.abs(prior - baseline[:, None]), axis=1)
+            mean = np.nanmean(prior, axis=1)
+            std = np.nanstd(prior, axis=1, ddof=1)
+
+        floor = signal.min_spread * np.abs(baseline) if signal.relative else signal.min_spread
+        spread = np.maximum(MAD_SCALE * mad, floor)
+        robust_z = (current - baseline) / spread
+        zscore = (current - mean) / np.maximum(std, floor)
+
+        hits = np.abs(robust_z) > threshold
+        if not hits.any():
+            continue
+
+        rows = metrics[scored][hits]
+        frames.append(pd.DataFrame({
+            'vessel_id': rows['vessel_id'],
+            'vessel_name': rows['vessel_name'],
+            'trip_id': rows['trip_id'],
+            'delivery_date': rows['delivery_date'],
+            'signal': signal.column,
+            'label': signal.label,
+            'value': current[hits],
+            'baseline': baseline[hits],
+            'robust_z': robust_z[hits],
+            'zscore': zscore[hits],
+            'direction': np.where(robust_z[hits] > 0, 'high', 'low'),
+            'unit': signal.unit,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[ANOMALY_COLUMNS]
@@ -0,0 +1,828 @@
+"""
+TEM IPA Manager Dashboard - Demo Version
+2026 A Season Vessel Trip Limit Support
+
+Features:
+- Real-time 4-trip rolling average monitoring
+- Color-coded compliance status
+- Next Trip Calculator (proactive vessel support)
+- Violation reports
+- Data upload interface
+
+main() runs the dashboard for one script run; src/app.py runs it
+standalone and the portal hosts it as a page.
+"""
+
+import streamlit as st
+
+from dashboard_common import metrics, profiling
+
+# ============================================================================
+# AUTHENTICATION
+# ============================================================================
+# Demo credentials for interview committee
+# In production, this would use database with proper password hashing
+
+# Demo user credentials
+DEMO_USERS = {
+    'demo': {'password': 'demo123', 'name': 'Demo User'},
+    'ipa_manager': {'password': 'demo2026', 'name': 'IPA Manager'},
+    'fishermen_first': {'password': 'ff2026', 'name': 'Fishermen First'}
+}
+
+# Users who may profile reruns from the sidebar
+ADMIN_USERS = {'fishermen_first'}
+
+# Login function
+def login(username, password):
+    if username in DEMO_USERS and DEMO_USERS[username]['password'] == password:
+        st.session_state.authenticated = True
+        st.session_state.user_name = DEMO_USERS[username]['name']
+        st.session_state.username = username
+        return True
+    return False
+
+# Logout function
+def logout():
+    st.session_state.authenticated = False
+    st.session_state.user_name = None
+    st.session_state.username = None
+
+# Login page, shown until the session is authenticated
+def login_page():
+    st.title("🐟 TEM IPA Manager Dashboard")
+    st.markdown("**2026 A Season - Vessel Trip Limit Support**")
+    st.markdown("---")
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+
+    with col2:
+        st.subheader("🔐 Login")
+
+        with st.form("login_form"):
+            username = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            submit = st.form_submit_button("Login", type="primary", use_container_width=True)
+
+            if submit:
+                if login(username, password):
+                    st.success("Login successful!")
+                    st.rerun()
+                else:
+                    st.error("Invalid username or password")
+
+# Sidebar and the selected page, once logged in
+def render_dashboard():
+    # Heavy imports are deferred until after login so the login page renders fast
+    # (plotly is imported by the Vessel Details page only)
+    import pandas as pd
+    from dashboard_common import display
+    from tem_ipa.demo_data import (
+        VESSELS, TRIP_STORE,
+        calculate_trip_limit_status,
+        calculate_next_trip_projection,
+        get_all_mra_violations,
+        get_anomalies,
+        get_summary_stats,
+        get_vessel_status,
+        get_vessel_trips,
+        get_violations,
+        get_pollock_index,
+        get_season_outlook,
+        get_trips_df,
+        check_trips,
+        import_trips,
+        amend_trip,
+        get_audit_log
+    )
+    from tem_ipa.thresholds import THRESHOLDS, format_k
+    from tem_ipa.simulation import A_SEASON_END, DEFAULT_RUNS
+    from tem_ipa.anomalies import ANOMALY_THRESHOLD, ANOMALY_WINDOW
+
+    # Read one consistent data version for this whole rerun (shared by all sessions)
+    pinned = TRIP_STORE.pin()
+
+    # Demo banner
+    st.markdown("""
+<div style="background-color: #fff4e6; padding: 15px; border-radius: 5px; border-left: 5px solid #ff9800; margin-bottom: 20px;">
+    <strong>⚠️ DEMONSTRATION VERSION</strong><br/>
+    This is a proof-of-concept with test data. Production system will include live eLandings integration,
+    secure authentication, database persistence, and complete MRA compliance checking.
+</div>
+""", unsafe_allow_html=True)
+
+    # Header
+    st.title("🐟 TEM IPA Manager Dashboard")
+    st.markdown("**2026 A Season - Vessel Trip Limit Support**")
+
+    # Sidebar navigation
+    with st.sidebar:
+        # User info and logout
+        st.markdown(f"### Welcome, {st.session_state.user_name}!")
+        if st.button("🚪 Logout", use_container_width=True):
+            logout()
+            st.rerun()
+
+        if st.session_state.username in ADMIN_USERS:
+            st.toggle("🔬 Profile reruns", key="profile_reruns",
+                      help="Profile each rerun with cProfile + tracemalloc (results at the bottom of the page)")
+
+        st.markdown("---")
+        st.header("📍 Navigation")
+        page = st.radio(
+            "Select Page",
+            ["Fleet Overview", "Vessel Details", "Violation Reports", "Upload Data"],
+            index=0
+        )
+
+        # Summary stats in sidebar
+        st.markdown("---")
+        st.subheader("📊 Fleet Summary")
+        stats = get_summary_stats()
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Vessels", stats['total_vessels'])
+            st.metric("Trips", stats['total_trips'])
+        with col2:
+            st.metric("Violations", stats['violation'])
+            st.metric("Warnings", stats['warning'])
+
+
+    # Time the selected page branch (no-op unless DASHBOARD_METRICS_FILE is set)
+    metrics.start_page(page)
+
+    # ============================================================================
+    # PAGE 1: FLEET OVERVIEW
+    # ============================================================================
+    if page == "Fleet Overview":
+        st.header("📋 Fleet Overview - All Vessels")
+        st.markdown("**Current compliance status** of all vessels in the 2026 A Season (based on latest 4-trip rolling average)")
+
+        # Build summary table from the per-vessel status table
+        def fleet_overview_table():
+            status_df = get_vessel_status()
+            status_display = {
+                'VIOLATION': '❌ VIOLATION',
+                'WARNING': '⚠️ WARNING',
+                'COMPLIANT': '✅ COMPLIANT',
+                'INSUFFICIENT_DATA': 'Need More Data'
+            }
+            sort_order = {'VIOLATION': 1, 'WARNING': 2, 'COMPLIANT': 3, 'INSUFFICIENT_DATA': 4}
+
+            summary_df = pd.DataFrame({
+                'Vessel Name': status_df['vessel_name'],
+                'Vessel ID': status_df['vessel_id'],
+                'Current Status': status_df['status'].map(status_display),
+                'Current 4-Trip Avg': [
+                    f"Need {needed} more trips" if status == 'INSUFFICIENT_DATA' else f"{avg:,.0f} lbs"
+                    for status, avg, needed in zip(status_df['status'], status_df['avg'], status_df['trips_needed'])
+                ],
+                'Total Trips': status_df['total_trips'],
+                'Sort': status_df['status'].map(sort_order)
+            })
+
+            # Sort by status (violations first)
+            summary_df = summary_df.sort_values('Sort', kind='stable')
+            return summary_df.drop('Sort', axis=1)
+
+        # Display table (Arrow table cached per data version)
+        st.dataframe(
+            display.table(pinned, 'fleet_overview', fleet_overview_table),
+            use_container_width=True,
+            hide_index=True,
+            height=400
+        )
+
+        # Key metrics
+        st.markdown("---")
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric(
+                "✅ Compliant",
+                stats['compliant'],
+                help=f"Vessels with <{format_k(THRESHOLDS.warning_lbs)} lbs 4-trip average"
+            )
+
+        with col2:
+            st.metric(
+                "⚠️ Warnings",
+                stats['warning'],
+                help=f"Vessels with {format_k(THRESHOLDS.warning_lbs)}-{format_k(THRESHOLDS.trip_limit_lbs)} lbs 4-trip average"
+            )
+
+        with col3:
+            st.metric(
+                "❌ Violations",
+                stats['violation'],
+                help=f"Vessels with >{format_k(THRESHOLDS.trip_limit_lbs)} lbs 4-trip average"
+            )
+
+        with col4:
+            st.metric(
+                "🚨 Egregious",
+                stats['egregious_violations'],
+                help=f"Single trips >{format_k(THRESHOLDS.egregious_lbs)} lbs"
+            )
+
+
+    # ============================================================================
+    # PAGE 2: VESSEL DETAILS (with Next Trip Calculator)
+    # ============================================================================
+    elif page == "Vessel Details":
+        st.header("🔍 Vessel Details")
+
+        # Vessel selector
+        vessel_options = {v['vessel_name']: v for v in VESSELS}
+        selected_vessel_name = st.selectbox("Select Vessel", list(vessel_options.keys()))
+        selected_vessel = vessel_options[selected_vessel_name]
+
+        st.markdown(f"**Vessel ID:** {selected_vessel['vessel_id']}")
+
+        # Get status
+        status_info = calculate_trip_limit_status(selected_vessel['vessel_id'])
+
+        # Status display
+        st.markdown("### Current Status")
+
+        if status_info['status'] == 'INSUFFICIENT_DATA':
+            st.info(f"ℹ️ **Need {status_info['trips_needed']} more trips** to calculate 4-trip average")
+            st.markdown(f"**Trips completed:** {len(status_info['all_trips'])}")
+
+        else:
+            limit = THRESHOLDS.trip_limit_lbs
+
+            # Status badge with color
+            if status_info['status'] == 'VIOLATION':
+                st.error(f"❌ **VIOLATION** - 4-Trip Average: **{status_info['avg']:,.0f} lbs** (Limit: {limit:,} lbs)")
+                st.markdown(f"**Overage:** {status_info['avg'] - limit:,.0f} lbs over limit")
+            elif status_info['status'] == 'WARNING':
+                st.warning(f"⚠️ **WARNING** - 4-Trip Average: **{status_info['avg']:,.0f} lbs** (Limit: {limit:,} lbs)")
+                remaining = limit - status_info['avg']
+                st.markdown(f"**Buffer remaining:** {remaining:,.0f} lbs before violation")
+            else:
+                st.success(f"✅ **COMPLIANT** - 4-Trip Average: **{status_info['avg']:,.0f} lbs** (Limit: {limit:,} lbs)")
+                remaining = limit - status_info['avg']
+                st.markdown(f"**Buffer remaining:** {remaining:,.0f} lbs before warning threshold")
+
+            # Metrics row
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.metric("4-Trip Average", f"{status_info['avg']:,.0f} lbs")
+
+            with col2:
+                pct_used = (status_info['avg'] / limit) * 100
+                st.metric("% of Limit", f"{pct_used:.1f}%")
+
+            with col3:
+                st.metric("Total Trips", len(status_info['all_trips']))
+
+            # Last 4 trips table
+            st.markdown("---")
+            st.markdown("### Last 4 Trips (Current Rolling Window)")
+
+            def window_trips_table():
+                trips_df = pd.DataFrame(status_info['trips'])
+                trips_df['delivery_date'] = pd.to_datetime(trips_df['delivery_date']).dt.strftime('%b %d, %Y')
+                trips_display = trips_df[['trip_id', 'delivery_date', 'pollock_lbs']].copy()
+                trips_display.columns = ['Trip ID', 'Delivery Date', 'Pollock (lbs)']
+                trips_display['Pollock (lbs)'] = trips_display['Pollock (lbs)'].apply(lambda x: f"{x:,}")
+                return trips_display
+
+            st.dataframe(display.table(pinned, 'window_trips', window_trips_table, selected_vessel['vessel_id']),
+                         use_container_width=True, hide_index=True)
+
+            # ===== KILLER FEATURE: NEXT TRIP CALCULATOR =====
+            st.markdown("---")
+            st.markdown("### 📊 Next Trip Calculator")
+            st.markdown("**Proactive vessel support:** Calculate what the new 4-trip average would be based on the next trip amount")
+
+            # Preset projections
+            projections = calculate_next_trip_projection(selected_vessel['vessel_id'])
+
+            if projections:
+                st.markdown("**Projected scenarios:**")
+
+                proj_data = []
+                for proj in projections:
+                    if proj['status'] == 'VIOLATION':
+                        status_icon = '❌'
+                    elif proj['status'] == 'WARNING':
+                        status_icon = '⚠️'
+                    else:
+                        status_icon = '✅'
+
+                    proj_data.append({
+                        'Next Trip Amount': f"{proj['amount']:,} lbs",
+                        'New 4-Trip Avg': f"{proj['new_avg']:,.0f} lbs",
+                        'Result': f"{status_icon} {proj['status']}"
+                    })
+
+                proj_df = pd.DataFrame(proj_data)
+                st.dataframe(proj_df, use_container_width=True, hide_index=True)
+
+                # Custom calculator
+                st.markdown("**Calculate custom amount:**")
+                col1, col2 = st.columns([3, 1])
+
+                with col1:
+                    custom_amount = st.number_input(
+                        "Next trip amount (lbs)",
+                        min_value=0,
+                        max_value=500000,
+                        value=280000,
+                        step=5000,
+                        help="Enter expected catch amount for next trip"
+                    )
+
+                with col2:
+                    st.write("")  # Spacing
+                    st.write("")  # Spacing
+                    calculate_btn = st.button("Calculate", type="primary")
+
+                if calculate_btn or custom_amount:
+                    custom_proj = calculate_next_trip_projection(
+                        selected_vessel['vessel_id'],
+                        [custom_amount]
+                    )[0]
+
+                    if custom_proj['status'] == 'VIOLATION':
+                        st.error(f"❌ New average would be **{custom_proj['new_avg']:,.0f} lbs** - VIOLATION")
+                    elif custom_proj['status'] == 'WARNING':
+                        st.warning(f"⚠️ New average would be **{custom_proj['new_avg']:,.0f} lbs** - WARNING")
+                    else:
+                        st.success(f"✅ New average would be **{custom_proj['new_avg']:,.0f} lbs** - COMPLIANT")
+
+        # Season outlook (Monte Carlo)
+        st.markdown("---")
+        st.markdown("### 🎲 Season Outlook")
+
+        outlook = get_season_outlook()
+        vessel_outlook = outlook[outlook['vessel_id'] == selected_vessel['vessel_id']]
+
+        if vessel_outlook.empty or vessel_outlook.iloc[0]['trips_remaining'] == 0:
+            st.info("ℹ️ No trips remaining in the A season to simulate")
+        else:
+            row = vessel_outlook.iloc[0]
+            st.markdown(
+                f"Based on {DEFAULT_RUNS:,} simulated seasons of **{int(row['trips_remaining'])} more trips** "
+                f"drawn from this vessel's catch history (season ends {A_SEASON_END.strftime('%b %d')})"
+            )
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Ends Season in Violation", f"{row['p_violation']:.0%}")
+            with col2:
+                st.metric("Any Violation Before Close", f"{row['p_any_violation']:.0%}")
+            with col3:
+                st.metric("Egregious Trip Risk", f"{row['p_egregious']:.0%}")
+            with col4:
+                st.metric("Expected Overage", f"{row['expected_overage_lbs']:,.0f} lbs")
+
+            if pd.notna(row['final_avg_p50']):
+                st.caption(
+                    f"Final 4-trip average: {row['final_avg_p50']:,.0f} lbs median "
+                    f"(80% range {row['final_avg_p10']:,.0f} - {row['final_avg_p90']:,.0f} lbs)"
+                )
+
+        # Trip history chart
+        st.markdown("---")
+        st.markdown("### 📈 Trip History")
+
+        all_trips = get_vessel_trips(selected_vessel['vessel_id'])
+
+        if len(all_trips) > 0:
+            import plotly.graph_objects as go
+
+            # Calculate rolling 4-trip averages
+            all_trips['rolling_avg'] = all_trips['pollock_lbs'].rolling(window=4, min_periods=4).mean()
+
+            # Create custom hover text with rolling averages
+            hover_text = []
+            for idx, row in all_trips.iterrows():
+                if pd.isna(row['rolling_avg']):
+                    # First 3 trips don't have a 4-trip average yet
+                    hover_text.append(
+                        f"<b>{pd.to_datetime(row['delivery_date']).strftime('%b %d, %Y')}</b><br>"
+                        f"Trip: {row['pollock_lbs']:,.0f} lbs<br>"
+                        f"<i>Need {4 - (idx + 1)} more trips for 4-trip avg</i>"
+                    )
+                else:
+                    # Show rolling average for trip 4 onwards
+                    hover_text.append(
+                        f"<b>{pd.to_datetime(row['delivery_date']).strftime('%b %d, %Y')}</b><br>"
+                        f"Trip: {row['pollock_lbs']:,.0f} lbs<br>"
+                        f"4-Trip Avg: {row['rolling_avg']:,.0f} lbs"
+                    )
+
+            # Create chart
+            fig = go.Figure()
+
+            # Add trip points with rolling average in tooltip
+            fig.add_trace(go.Scatter(
+                x=all_trips['delivery_date'],
+                y=all_trips['pollock_lbs'],
+                mode='lines+markers',
+                name='Pollock Catch',
+                line=dict(color='#1f77b4', width=3),
+                marker=dict(size=10),
+                hovertemplate='%{text}<extra></extra>',
+                text=hover_text
+            ))
+
+            # Add 4-trip average limit line (without annotation)
+            fig.add_hline(
+                y=THRESHOLDS.trip_limit_lbs,
+                line_dash="dash",
+                line_color="orange",
+                line_width=2,
+                annotation_text="",
+            )
+
+            # Add egregious limit line (without annotation)
+            fig.add_hline(
+                y=THRESHOLDS.egregious_lbs,
+                line_dash="dash",
+                line_color="red",
+                line_width=2,
+                annotation_text="",
+            )
+
+            # Add invisible traces for legend entries
+            fig.add_trace(go.Scatter(
+                x=[None], y=[None],
+                mode='lines',
+                name=f'4-Trip Limit ({format_k(THRESHOLDS.trip_limit_lbs)})',
+                line=dict(color='orange', width=2, dash='dash'),
+                showlegend=True,
+                hoverinfo='skip'
+            ))
+
+            fig.add_trace(go.Scatter(
+                x=[None], y=[None],
+                mode='lines',
+                name=f'Egregious ({format_k(THRESHOLDS.egregious_lbs)})',
+                line=dict(color='red', width=2, dash='dash'),
+                showlegend=True,
+                hoverinfo='skip'
+            ))
+
+            # Highlight current 4-trip window with red circles
+            if status_info['status'] != 'INSUFFICIENT_DATA':
+                last_4_trips = pd.DataFrame(status_info['trips'])
+                fig.add_trace(go.Scatter(
+                    x=last_4_trips['delivery_date'],
+                    y=last_4_trips['pollock_lbs'],
+                    mode='markers',
+                    name=f'Current Window (Avg: {status_info["avg"]:,.0f} lbs)',
+                    marker=dict(size=14, color='#ff4444', symbol='circle-open', line=dict(width=3)),
+                    hoverinfo='skip'  # Skip hover since main line already shows the data
+                ))
+
+            fig.update_layout(
+                title={
+                    'text': f"{selected_vessel_name} - Pollock Catch per Trip",
+                    'font': {'size': 20}
+                },
+                xaxis_title="Delivery Date",
+                yaxis_title="Pollock (lbs)",
+                hovermode='closest',
+                height=650,
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=-0.25,
+                    xanchor="center",
+                    x=0.5,
+                    font=dict(size=12)
+                ),
+                margin=dict(l=80, r=40, t=80, b=100),
+                font=dict(size=13)
+            )
+
+            # Format y-axis with commas
+            fig.update_yaxes(tickformat=',')
+
+            st.plotly_chart(fig, use_container_width=True)
+
+
+    # ============================================================================
+    # PAGE 3: VIOLATION REPORTS
+    # ============================================================================
+    elif page == "Violation Reports":
+        st.header("⚠️ Violation Reports")
+
+        # All sections read from the unified violations table (see rules.py)
+        violations = get_violations()
+
+        # Trip Limit Violations
+        st.subheader(f"Trip Limit Violations (>{format_k(THRESHOLDS.trip_limit_lbs)} lbs average)")
+        trip_violations = violations[(violations['rule_id'] == 'TRIP_LIMIT') & (violations['severity'] == 'violation')]
+
+        if len(trip_violations) > 0:
+            def trip_violations_table():
+                return pd.DataFrame({
+                    'Vessel Name': trip_violations['vessel_name'],
+                    'Vessel ID': trip_violations['vessel_id'],
+                    '4-Trip Average': trip_violations['value'].map(lambda x: f"{x:,.0f} lbs"),
+                    'Overage': trip_violations['overage'].map(lambda x: f"{x:,.0f} lbs"),
+                    'Trips in Window': trip_violations['evidence']
+                })
+
+            st.dataframe(display.table(pinned, 'trip_violations', trip_violations_table),
+                         use_container_width=True, hide_index=True)
+            st.markdown(f"**Total vessels in violation:** {len(trip_violations)}")
+        else:
+            st.success("✅ No trip limit violations detected")
+
+        # Egregious Violations
+        st.markdown("---")
+        st.subheader(f"Egregious Violations (>{format_k(THRESHOLDS.egregious_lbs)} lbs single trip)")
+        egregious = violations[violations['rule_id'] == 'EGREGIOUS']
+
+        if len(egregious) > 0:
+            def egregious_table():
+                return pd.DataFrame({
+                    'Trip ID': egregious['trip_id'],
+                    'Vessel Name': egregious['vessel_name'],
+                    'Delivery Date': pd.to_datetime(egregious['delivery_date']).dt.strftime('%b %d, %Y'),
+                    'Pollock (lbs)': egregious['value'].map(lambda x: f"{x:,.0f}"),
+                    'Overage': egregious['overage'].map(lambda x: f"{x:,.0f} lbs over")
+                })
+
+            st.dataframe(display.table(pinned, 'egregious', egregious_table), use_container_width=True, hide_index=True)
+            st.markdown(f"**Total egregious violations:** {len(egregious)}")
+        else:
+            st.success("✅ No egregious violations detected")
+
+        # Trips near threshold (range query on the sorted pollock index)
+        st.markdown("---")
+        st.subheader("Trips Near Threshold")
+        pollock_index = get_pollock_index()
+
+        slider_min = min(pollock_index.min_lbs, THRESHOLDS.warning_lbs) // 5000 * 5000
+        slider_max = (max(pollock_index.max_lbs, THRESHOLDS.egregious_lbs) // 5000 + 1) * 5000
+        low, high = st.slider(
+            "Single-trip pollock range (lbs)",
+            min_value=slider_min,
+            max_value=slider_max,
+            value=(THRESHOLDS.trip_limit_lbs, slider_max),
+            step=5000,
+            help=f"Limit: {THRESHOLDS.trip_limit_lbs:,} lbs (4-trip average) | Egregious: {THRESHOLDS.egregious_lbs:,} lbs (single trip)"
+        )
+        near = pollock_index.between(low, high)
+
+        if len(near) > 0:
+            def near_table():
+                near_display = near[['trip_id', 'vessel_name', 'delivery_date', 'pollock_lbs']].copy()
+                near_display['delivery_date'] = pd.to_datetime(near_display['delivery_date']).dt.strftime('%b %d, %Y')
+                near_display['To Egregious'] = (THRESHOLDS.egregious_lbs - near['pollock_lbs']).apply(
+                    lambda x: f"{x:,} lbs below" if x >= 0 else f"{-x:,} lbs over"
+                )
+                near_display['pollock_lbs'] = near_display['pollock_lbs'].apply(lambda x: f"{x:,}")
+                near_display.columns = ['Trip ID', 'Vessel Name', 'Delivery Date', 'Pollock (lbs)', 'To Egregious']
+                return near_display
+
+            st.dataframe(display.table(pinned, 'near_threshold', near_table, low, high),
+                         use_container_width=True, hide_index=True)
+            st.markdown(f"**Trips in range:** {len(near)} of {len(pollock_index)}")
+        else:
+            st.info("No trips in the selected range")
+
+        # MRA Violations
+        st.markdown("---")
+        st.subheader("MRA Violations (Species Mix)")
+        mra_violations = get_all_mra_violations()
+
+        if len(mra_violations) > 0:
+            def mra_table():
+                mra_display = mra_violations.copy()
+                mra_display['delivery_date'] = pd.to_datetime(mra_display['delivery_date']).dt.strftime('%b %d, %Y')
+                mra_display['actual_pct'] = mra_display['actual_pct'].apply(lambda x: f"{x:.1f}%")
+                mra_display['limit_pct'] = mra_display['limit_pct'].apply(lambda x: f"{x:.0f}%")
+                mra_display['overage_lbs'] = mra_display['overage_lbs'].apply(lambda x: f"{x:,} lbs")
+
+                mra_display.columns = ['Trip ID', 'Vessel Name', 'Delivery Date', 'Species', 'Actual %', 'Limit %', 'Overage']
+                return mra_display
+
+            st.dataframe(display.table(pinned, 'mra_violations', mra_table), use_container_width=True, hide_index=True)
+            st.markdown(f"**Total MRA violations:** {len(mra_violations)}")
+        else:
+            st.success("✅ No MRA violations detected")
+
+        # Anomalies (unusual for the vessel, whether or not a limit is crossed)
+        st.markdown("---")
+        st.subheader("🔎 Anomalies")
+        st.markdown(
+            f"Trips far outside the vessel's own last {ANOMALY_WINDOW} trips "
+            f"(robust z-score above {ANOMALY_THRESHOLD:g}), even if no limit is crossed"
+        )
+        anomalies = get_anomalies()
+
+        if len(anomalies) > 0:
+            def anomalies_table():
+                is_lbs = anomalies['unit'] == 'lbs'
+                return pd.DataFrame({
+                    'Trip ID': anomalies['trip_id'],
+                    'Vessel Name': anomalies['vessel_name'],
+                    'Delivery Date': pd.to_datetime(anomalies['delivery_date']).dt.strftime('%b %d, %Y'),
+                    'Signal': anomalies['label'],
+                    'Value': anomalies['value'].map('{:,.0f} lbs'.format).where(is_lbs, anomalies['value'].map('{:.1f}%'.format)),
+                    'Vessel Baseline': anomalies['baseline'].map('{:,.0f} lbs'.format).where(is_lbs, anomalies['baseline'].map('{:.1f}%'.format)),
+                    'Robust Z': anomalies['robust_z'].map('{:+.1f}'.format),
+                    'Direction': anomalies['direction'].map({'high': '⬆️ High', 'low': '⬇️ Low'})
+                })
+
+            st.dataframe(display.table(pinned, 'anomalies', anomalies_table), use_container_width=True, hide_index=True)
+            st.markdown(f"**Total anomalies:** {len(anomalies)}")
+        else:
+            st.success("✅ No unusual trips detected")
+
+        # Export button
+        st.markdown("---")
+        st.download_button(
+            "📥 Export All Violations to CSV",
+            data=violations.to_csv(index=False),
+            file_name="tem_ipa_violations.csv",
+            mime="text/csv"
+        )
+
+
+    # ============================================================================
+    # PAGE 4: UPLOAD DATA
+    # ============================================================================
+    elif page == "Upload Data":
+        st.header("📤 Upload Trip Data")
+        st.markdown("Upload eLandings CSV export to import new trip data into the system")
+
+        uploaded_file = st.file_uploader(
+            "Choose CSV or Excel file",
+            type=['csv', 'xlsx'],
+            help="Upload trip data from eLandings export"
+        )
+
+        if uploaded_file:
+            try:
+                # Read file
+                if uploaded_file.name.endswith('.csv'):
+                    df = pd.read_csv(uploaded_file)
+                else:
+                    df = pd.read_excel(uploaded_file)
+            except Exception as e:
+                df = None
+                st.error(f"❌ Error reading file: {str(e)}")
+                st.markdown("Please ensure file is in correct eLandings format")
+
+            if df is not None:
+                st.success(f"✅ File uploaded successfully: **{len(df)}** rows")
+
+                # Preview
+                st.subheader("📋 Data Preview (first 10 rows)")
+                st.dataframe(df.head(10), use_container_width=True)
+
+                # Validation against the fleet and the trips already imported
+                st.subheader("✔️ Validation Results")
+                checks = check_trips(df)
+
+                col1, col2 = st.columns(2)
+                for i, (check, problem) in enumerate(checks):
+                    with (col1 if i % 2 == 0 else col2):
+                        if problem:
+                            st.error(f"❌ {problem}")
+                        else:
+                            st.success(f"✅ {check}")
+
+                # Import button (only once every check passes)
+                st.markdown("---")
+                if any(problem for _, problem in checks):
+                    st.warning("⚠️ Fix the problems above and upload the file again to import it")
+                elif st.button("Import to Database", type="primary"):
+                    try:
+                        with st.spinner("Importing data..."):
+                            snapshot = import_trips(df, changed_by=st.session_state.user_name)
+                    except ValueError as e:
+                        st.error(f"❌ Import rejected: {e}")
+                    else:
+                        st.success(f"✅ Successfully imported {len(df)} trips (data version {snapshot.version})")
+                        st.info("ℹ️ All sessions now see the new trips. In production, data would also be persisted to PostgreSQL")
+
+        else:
+            st.info("📁 No file uploaded yet. Please select a CSV or Excel file above.")
+
+            # Show expected format
+            with st.expander("ℹ️ Expected File Format"):
+                st.markdown("""
+            **Required columns:**
+            - `vessel_id` - Vessel identifier (e.g., AK-7721)
+            - `delivery_date` - Date of delivery (YYYY-MM-DD)
+            - `pollock_lbs` - Pollock catch in pounds
+            - `season` - A or B season
+            - `fishing_year` - Year (e.g., 2026)
+
+            **Optional columns:**
+            - `pcod_lbs` - Pacific Cod catch in pounds
+            - `other_lbs` - Other species catch in pounds
+
+            **Example:**
+            """)
+
+                example_df = pd.DataFrame({
+                    'vessel_id': ['AK-7721', 'AK-8832'],
+                    'delivery_date': ['2026-01-20', '2026-01-22'],
+                    'pollock_lbs': [250000, 275000],
+                    'pcod_lbs': [35000, 40000],
+                    'other_lbs': [2500, 2800],
+                    'season': ['A', 'A'],
+                    'fishing_year': [2026, 2026]
+                })
+
+                st.dataframe(example_df, use_container_width=True, hide_index=True)
+
+        # Fish ticket amendments
+        st.markdown("---")
+        st.subheader("✏️ Amend Fish Ticket")
+        st.markdown("Correct a delivered trip. Only the affected vessel's 4-trip windows are recalculated.")
+
+        trips_df = get_trips_df().sort_values('trip_id')
+        trip_labels = {
+            row.trip_id: f"{row.trip_id} - {row.vessel_name} ({row.delivery_date.strftime('%Y-%m-%d')})"
+            for row in trips_df.itertuples()
+        }
+        amend_id = st.selectbox("Trip", list(trip_labels), format_func=trip_labels.get)
+        trip = trips_df[trips_df['trip_id'] == amend_id].iloc[0]
+
+        with st.form("amend_trip"):
+            col1, col2 = st.columns(2)
+            with col1:
+                delivery_date = st.date_input("Delivery Date", value=trip['delivery_date'].date())
+                pollock_lbs = st.number_input("Pollock (lbs)", min_value=0, value=int(trip['pollock_lbs']), step=1000)
+            with col2:
+                pcod_lbs = st.number_input("Pacific Cod (lbs)", min_value=0, value=int(trip['pcod_lbs']), step=100)
+                other_lbs = st.number_input("Other Species (lbs)", min_value=0, value=int(trip['other_lbs']), step=100)
+
+            if st.form_submit_button("Save Amendment", type="primary"):
+                try:
+                    snapshot = amend_trip(
+                        amend_id,
+                        changed_by=st.session_state.user_name,
+                        delivery_date=delivery_date,
+                        pollock_lbs=pollock_lbs,
+                        pcod_lbs=pcod_lbs,
+                        other_lbs=other_lbs
+                    )
+                    st.success(f"✅ {amend_id} saved (data version {snapshot.version})")
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+
+        audit_log = get_audit_log()
+        if not audit_log.empty:
+            with st.expander(f"📜 Audit Trail ({len(audit_log)} changes)"):
+                st.dataframe(audit_log.astype({'before': str, 'after': str}), use_container_width=True, hide_index=True)
+
+    # Footer
+    st.markdown("---")
+    st.markdown(
+        '<div style="text-align: center; color: #666; font-size: 0.9em;">'
+        '🐟 TEM IPA Manager Dashboard | <strong>fishermenfirst.org</strong> | Demo Version | 2026 A Season'
+        '</div>',
+        unsafe_allow_html=True
+    )
+
+
+def main():
+    """
+    One script run of the dashboard: the login page until the session is
+    authenticated, then the sidebar and selected page
+
+    The page runs inside try/finally, so the profiler is stopped and the page
+    timing recorded even when a page raises or ends the run early (st.rerun,
+    st.stop).
+    """
+    # Timings recorded by this script run are exported as tem_ipa_*
+    metrics.set_prefix('tem_ipa')
+
+    # Initialize session state
+    if 'authenticated' not in st.session_state:
+        st.session_state.authenticated = False
+        st.session_state.user_name = None
+        st.session_state.username = None
+
+    if not st.session_state.authenticated:
+        login_page()
+        return
+
+    # Profile this whole rerun if requested (?profile=1 or the admin sidebar toggle)
+    run_profiler = profiling.RunProfiler().start() if profiling.profiling_requested() else None
+    try:
+        render_dashboard()
+    finally:
+        metrics.end_page()
+        metrics.write_metrics_file()
+        if run_profiler:
+            run_profiler.stop()
+
+    if run_profiler:
+        run_profiler.render('tem-ipa')
+
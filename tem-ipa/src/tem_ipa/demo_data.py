@@ -6,6 +6,13 @@ Test data for TEM IPA Manager Dashboard Demo
 import pandas as pd
 from datetime import datetime, timedelta
 
+from dashboard_common.metrics import timed
+
+from tem_ipa.trip_store import DELIVERY_KEY, TripStore, already_imported, trip_metrics, violations, anomalies
+from tem_ipa.thresholds import THRESHOLDS, PollockIndex
+from tem_ipa.rules import CATCH_COLUMNS, vessel_status
+from tem_ipa.simulation import DEFAULT_RUNS, simulate_fleet
+
 # 8 test vessels with realistic Alaska fishing vessel names
 VESSELS = [
     {'vessel_id': 'AK-7721', 'vessel_name': 'Pacific Hunter', 'active': True},
@@ -19,6 +26,7 @@ VESSELS = [
 ]
 
 
+@timed()
 def generate_test_trips():
     """
     Generate realistic trip data for 8 vessels with different scenarios:
@@ -208,15 +216,174 @@ def generate_test_trips():
     return pd.DataFrame(trips)
 
 
-# Pre-generate all test data
-TRIPS_DF = generate_test_trips()
+# Process-wide trip store shared by all sessions. Test data is generated on
+# first use rather than at import time, so the login page renders without it
+TRIP_STORE = TripStore(lambda: {'trips': generate_test_trips()})
+
+
+def get_trips_df():
+    """All trips in the current data version (shared, read-only)"""
+    return TRIP_STORE.current()['trips']
+
+
+def __getattr__(name):
+    # Keeps `demo_data.TRIPS_DF` working without building it on import
+    if name == 'TRIPS_DF':
+        return get_trips_df()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+REQUIRED_TRIP_COLUMNS = ['vessel_id', 'delivery_date', 'pollock_lbs', 'season', 'fishing_year']
+SEASONS = ('A', 'B')
+
+
+def _catch(new_trips, column):
+    """Catch column as numbers (NaN where missing or not a number; optional columns default to 0)"""
+    if column not in new_trips.columns:
+        return pd.Series(0, index=new_trips.index)
+    values = pd.to_numeric(new_trips[column], errors='coerce')
+    return values if column == 'pollock_lbs' else values.where(new_trips[column].notna(), 0)
+
+
+def _normalize_trips(new_trips):
+    """Uploaded trips as trip table rows (assumes check_trips passed)"""
+    vessel_names = {v['vessel_id']: v['vessel_name'] for v in VESSELS}
+    return pd.DataFrame({
+        'vessel_id': new_trips['vessel_id'].to_numpy(),
+        'vessel_name': new_trips['vessel_id'].map(vessel_names).to_numpy(),
+        'delivery_date': pd.to_datetime(new_trips['delivery_date'], format='mixed').dt.normalize().to_numpy(),
+        **{column: _catch(new_trips, column).astype(int).to_numpy() for column in CATCH_COLUMNS},
+        'season': new_trips['season'].astype(str).str.strip().str.upper().to_numpy(),
+        'fishing_year': pd.to_numeric(new_trips['fishing_year']).astype(int).to_numpy()
+    })
+
+
+def check_trips(new_trips):
+    """
+    Validate uploaded eLandings trips against the fleet and the trips already
+    in the system
+
+    Args:
+        new_trips: DataFrame with REQUIRED_TRIP_COLUMNS and optionally
+            pcod_lbs, other_lbs
+
+    Returns:
+        list of (check, problem) in display order; problem is None when the
+        check passed. The duplicate check needs the others to pass first.
+    """
+    missing = [col for col in REQUIRED_TRIP_COLUMNS if col not in new_trips.columns]
+    checks = [('All required columns present', f"Missing required columns: {', '.join(missing)}" if missing else None)]
+    if missing:
+        return checks
+
+    vessel_ids = {v['vessel_id'] for v in VESSELS}
+    unknown = sorted(set(new_trips['vessel_id'].astype(str)) - vessel_ids)
+    checks.append(('All vessel IDs recognized', f"Unrecognized vessel IDs: {', '.join(unknown)}" if unknown else None))
+
+    dates = pd.to_datetime(new_trips['delivery_date'], errors='coerce', format='mixed')
+    bad_dates = int(dates.isna().sum())
+    checks.append(('All dates valid', f"{bad_dates} rows with a missing or invalid delivery_date" if bad_dates else None))
+
+    catch = pd.DataFrame({column: _catch(new_trips, column) for column in CATCH_COLUMNS})
+    bad_catch = int((catch.isna() | (catch < 0)).any(axis=1).sum())
+    checks.append(('All catch amounts valid',
+                   f"{bad_catch} rows with a missing, non-numeric or negative catch amount" if bad_catch else None))
+
+    seasons = new_trips['season'].astype(str).str.strip().str.upper()
+    years = pd.to_numeric(new_trips['fishing_year'], errors='coerce')
+    bad_season = int((~seasons.isin(SEASONS) | years.isna() | (years % 1 != 0)).sum())
+    checks.append(('Season/year data correct',
+                   f"{bad_season} rows with a season other than {' or '.join(SEASONS)} or an invalid fishing_year"
+                   if bad_season else None))
+
+    if all(problem is None for _, problem in checks):
+        normalized = _normalize_trips(new_trips)
+        in_file = int(normalized.duplicated(DELIVERY_KEY).sum())
+        imported = int(already_imported(get_trips_df(), normalized).sum())
+        problems = [f"{in_file} repeated within the file" if in_file else None,
+                    f"{imported} already imported" if imported else None]
+        problems = [problem for problem in problems if problem]
+        checks.append(('No duplicate trips detected',
+                       f"Duplicate trips: {', '.join(problems)}" if problems else None))
+    return checks
+
+
+def import_trips(new_trips, changed_by=None):
+    """
+    Append uploaded eLandings trips and publish them as a new data version
+
+    Args:
+        new_trips: DataFrame with REQUIRED_TRIP_COLUMNS and optionally
+            pcod_lbs, other_lbs
+
+    Returns:
+        The newly published snapshot
+
+    Raises:
+        ValueError: the first failed check_trips check (nothing is imported)
+    """
+    problems = [problem for _, problem in check_trips(new_trips) if problem]
+    if problems:
+        raise ValueError(problems[0])
+    return TRIP_STORE.append_trips(_normalize_trips(new_trips), changed_by=changed_by)
+
+
+def amend_trip(trip_id, changed_by=None, **fields):
+    """
+    Apply a fish ticket amendment to one trip (see TripStore.upsert)
+
+    Only the vessel's rolling windows that include the trip are recomputed.
+    """
+    if not (get_trips_df()['trip_id'] == trip_id).any():
+        raise ValueError(f"Unknown trip ID: {trip_id}")
+    return TRIP_STORE.upsert(dict(fields, trip_id=trip_id), changed_by=changed_by)
+
+
+def get_audit_log():
+    """Before/after values of every imported or amended trip"""
+    return TRIP_STORE.audit_log()
 
 
 def get_vessel_trips(vessel_id):
-    """Get all trips for a vessel, sorted by date"""
-    return TRIPS_DF[TRIPS_DF['vessel_id'] == vessel_id].sort_values('delivery_date').copy()
+    """Get all trips for a vessel, in trip order (by date, then trip_id, as in the rule windows)"""
+    trips_df = get_trips_df()
+    return trips_df[trips_df['vessel_id'] == vessel_id].sort_values(['delivery_date', 'trip_id'], kind='stable').copy()
+
+
+def _vessel_status(snapshot):
+    return snapshot.derive(
+        'vessel_status', lambda snap: vessel_status(trip_metrics(snap), violations(snap), VESSELS)
+    )
+
+
+def get_trip_metrics():
+    """Per-trip rolling averages and species ratios (one pass, cached per data version)"""
+    return trip_metrics(TRIP_STORE.current()).copy(deep=False)
+
+
+def get_violations():
+    """
+    Unified violations table for the current data version: one row per
+    finding with rule_id, severity and evidence (see rules.py)
+    """
+    return violations(TRIP_STORE.current()).copy(deep=False)
+
 
+def get_anomalies():
+    """
+    Trips that are unusual for their vessel (weight or species mix vs. the
+    vessel's recent trips), strongest first (see anomalies.py)
+    """
+    table = anomalies(TRIP_STORE.current())
+    return table.sort_values('robust_z', key=abs, ascending=False, kind='stable').reset_index(drop=True)
+
+
+def get_vessel_status():
+    """Current 4-trip status of every vessel, read from the violations table"""
+    return _vessel_status(TRIP_STORE.current()).copy(deep=False)
 
+
+@timed()
 def calculate_trip_limit_status(vessel_id):
     """
     Calculate 4-trip rolling average and compliance status
@@ -224,37 +391,27 @@ def calculate_trip_limit_status(vessel_id):
     Returns:
         dict with keys: status, color, avg, trips, all_trips, trips_needed
     """
+    status_df = _vessel_status(TRIP_STORE.current())
+    row = status_df[status_df['vessel_id'] == vessel_id].iloc[0]
     trips = get_vessel_trips(vessel_id)
 
-    if len(trips) < 4:
+    if row['status'] == 'INSUFFICIENT_DATA':
         return {
             'status': 'INSUFFICIENT_DATA',
             'color': 'gray',
-            'trips_needed': 4 - len(trips),
+            'trips_needed': int(row['trips_needed']),
             'avg': None,
             'trips': trips.to_dict('records'),
             'all_trips': trips.to_dict('records')
         }
 
     # Last 4 trips (rolling window)
-    last_4 = trips.tail(4)
-    avg = last_4['pollock_lbs'].mean()
-
-    # Determine status
-    if avg > 300000:
-        status = 'VIOLATION'
-        color = 'red'
-    elif avg > 285000:  # Within 15k of limit (5% buffer)
-        status = 'WARNING'
-        color = 'orange'
-    else:
-        status = 'COMPLIANT'
-        color = 'green'
+    last_4 = trips.tail(THRESHOLDS.window_trips)
 
     return {
-        'status': status,
-        'color': color,
-        'avg': avg,
+        'status': row['status'],
+        'color': row['color'],
+        'avg': row['avg'],
         'trips': last_4.to_dict('records'),
         'all_trips': trips.to_dict('records')
     }
@@ -292,15 +449,7 @@ def calculate_next_trip_projection(vessel_id, next_trip_amounts=None):
         new_avg = total / 4
 
         # Determine status
-        if new_avg > 300000:
-            status = 'VIOLATION'
-            color = 'red'
-        elif new_avg > 285000:
-            status = 'WARNING'
-            color = 'orange'
-        else:
-            status = 'COMPLIANT'
-            color = 'green'
+        status, color = THRESHOLDS.status_for_average(new_avg)
 
         projections.append({
             'amount': amount,
@@ -312,110 +461,57 @@ def calculate_next_trip_projection(vessel_id, next_trip_amounts=None):
     return projections
 
 
-def check_egregious_violations():
-    """Find all trips > 335k lbs (egregious threshold)"""
-    return TRIPS_DF[TRIPS_DF['pollock_lbs'] > 335000].copy()
-
-
-def calculate_mra_compliance(trip_id):
+def get_season_outlook(runs=DEFAULT_RUNS):
     """
-    Check MRA (Maximum Retainable Amounts) compliance for a trip
-    Based on CFR Table 10 percentages
-
-    Returns:
-        dict with: compliant (bool), violations (list)
+    Monte Carlo A season outlook for every vessel (see simulation.py),
+    simulated once per data version and run count
     """
-    trip = TRIPS_DF[TRIPS_DF['trip_id'] == trip_id].iloc[0]
-
-    total_catch = trip['pollock_lbs'] + trip['pcod_lbs'] + trip['other_lbs']
-    pcod_pct = (trip['pcod_lbs'] / total_catch) * 100
-    other_pct = (trip['other_lbs'] / total_catch) * 100
-
-    violations = []
-
-    # CFR Table 10 limits
-    if pcod_pct > 20:
-        violations.append({
-            'species': 'Pacific Cod',
-            'actual_pct': pcod_pct,
-            'limit_pct': 20,
-            'overage_pct': pcod_pct - 20,
-            'actual_lbs': trip['pcod_lbs'],
-            'allowed_lbs': int(total_catch * 0.20)
-        })
+    return TRIP_STORE.current().derive(
+        f'season_outlook_{runs}', lambda snap: simulate_fleet(snap['trips'], runs=runs)
+    ).copy(deep=False)
 
-    if other_pct > 2:
-        violations.append({
-            'species': 'Other Species',
-            'actual_pct': other_pct,
-            'limit_pct': 2,
-            'overage_pct': other_pct - 2,
-            'actual_lbs': trip['other_lbs'],
-            'allowed_lbs': int(total_catch * 0.02)
-        })
 
-    return {
-        'compliant': len(violations) == 0,
-        'violations': violations,
-        'pcod_pct': pcod_pct,
-        'other_pct': other_pct
-    }
+def get_pollock_index():
+    """Sorted pollock index for the current data version (built once per version)"""
+    return TRIP_STORE.current().derive('pollock_index', lambda snap: PollockIndex(snap['trips']))
 
 
+@timed()
 def get_all_mra_violations():
     """Get all trips with MRA violations"""
-    mra_violations = []
+    violation_rows = get_violations()
+    mra = violation_rows[violation_rows['rule_id'].str.startswith('MRA_')].sort_values('trip_id', kind='stable')
 
-    for _, trip in TRIPS_DF.iterrows():
-        compliance = calculate_mra_compliance(trip['trip_id'])
-        if not compliance['compliant']:
-            for violation in compliance['violations']:
-                mra_violations.append({
-                    'trip_id': trip['trip_id'],
-                    'vessel_name': trip['vessel_name'],
-                    'delivery_date': trip['delivery_date'],
-                    'species': violation['species'],
-                    'actual_pct': violation['actual_pct'],
-                    'limit_pct': violation['limit_pct'],
-                    'overage_lbs': violation['actual_lbs'] - violation['allowed_lbs']
-                })
+    if mra.empty:
+        return pd.DataFrame()
 
-    return pd.DataFrame(mra_violations) if mra_violations else pd.DataFrame()
+    return pd.DataFrame({
+        'trip_id': mra['trip_id'],
+        'vessel_name': mra['vessel_name'],
+        'delivery_date': mra['delivery_date'],
+        'species': mra['rule'],
+        'actual_pct': mra['value'],
+        'limit_pct': mra['limit'],
+        'overage_lbs': mra['overage_lbs'].astype(int)
+    }).reset_index(drop=True)
 
 
 # Summary statistics
+@timed()
 def get_summary_stats():
     """Get overall fleet statistics"""
-    total_vessels = len(VESSELS)
-    total_trips = len(TRIPS_DF)
-
-    # Count by status
-    compliant = 0
-    warning = 0
-    violation = 0
-    insufficient = 0
-
-    for vessel in VESSELS:
-        status = calculate_trip_limit_status(vessel['vessel_id'])
-        if status['status'] == 'COMPLIANT':
-            compliant += 1
-        elif status['status'] == 'WARNING':
-            warning += 1
-        elif status['status'] == 'VIOLATION':
-            violation += 1
-        else:
-            insufficient += 1
-
-    egregious = len(check_egregious_violations())
-    mra_violations = len(get_all_mra_violations())
+    snapshot = TRIP_STORE.current()
+    snapshot_violations = violations(snapshot)
+    status_counts = _vessel_status(snapshot)['status'].value_counts()
+    rule_counts = snapshot_violations['rule_id'].value_counts()
 
     return {
-        'total_vessels': total_vessels,
-        'total_trips': total_trips,
-        'compliant': compliant,
-        'warning': warning,
-        'violation': violation,
-        'insufficient_data': insufficient,
-        'egregious_violations': egregious,
-        'mra_violations': mra_violations
+        'total_vessels': len(VESSELS),
+        'total_trips': len(snapshot['trips']),
+        'compliant': int(status_counts.get('COMPLIANT', 0)),
+        'warning': int(status_counts.get('WARNING', 0)),
+        'violation': int(status_counts.get('VIOLATION', 0)),
+        'insufficient_data': int(status_counts.get('INSUFFICIENT_DATA', 0)),
+        'egregious_violations': int(rule_counts.get('EGREGIOUS', 0)),
+        'mra_violations': int(rule_counts.get('MRA_PCOD', 0) + rule_counts.get('MRA_OTHER', 0))
     }
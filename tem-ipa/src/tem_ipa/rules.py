@@ -0,0 +1,222 @@
+"""
+Single-pass compliance rule engine for the TEM IPA
+
+Each rule is declared once in RULES. `compute_trip_metrics` makes one
+columnar pass over the trip table (sorted once by vessel and date) to build
+every rolling average and species ratio the rules need, and
+`evaluate_rules` turns those metrics into one normalized violations table:
+
+    rule_id | rule | severity | vessel_id | vessel_name | trip_id |
+    delivery_date | value | limit | overage | unit | overage_lbs | evidence
+
+Trip limit status, egregious trips and MRA violations are all read from this
+table, so the pages and the sidebar never rescan the trips.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+
+from tem_ipa.thresholds import THRESHOLDS
+
+# Columns that make up a trip's total catch (denominator for MRA ratios)
+CATCH_COLUMNS = ['pollock_lbs', 'pcod_lbs', 'other_lbs']
+
+# Trip order within a vessel; trip_id breaks ties between same-day deliveries
+TRIP_ORDER = ['vessel_id', 'delivery_date', 'trip_id']
+
+VIOLATION_COLUMNS = [
+    'rule_id', 'rule', 'severity', 'vessel_id', 'vessel_name', 'trip_id',
+    'delivery_date', 'value', 'limit', 'overage', 'unit', 'overage_lbs', 'evidence'
+]
+
+
+@dataclass(frozen=True)
+class RollingWindowRule:
+    """Average of `column` over a vessel's latest `window` trips"""
+    rule_id: str
+    label: str
+    column: str
+    window: int
+    limit: float
+    warning: float = None
+
+
+@dataclass(frozen=True)
+class TripThresholdRule:
+    """Single-trip `column` above `limit`"""
+    rule_id: str
+    label: str
+    column: str
+    limit: float
+
+
+@dataclass(frozen=True)
+class RatioRule:
+    """`column` as a percentage of total catch above `limit_pct`"""
+    rule_id: str
+    label: str
+    column: str
+    limit_pct: float
+
+
+RULES = (
+    RollingWindowRule('TRIP_LIMIT', f'{THRESHOLDS.window_trips}-Trip Average', 'pollock_lbs',
+                      THRESHOLDS.window_trips, THRESHOLDS.trip_limit_lbs, THRESHOLDS.warning_lbs),
+    TripThresholdRule('EGREGIOUS', 'Egregious Trip', 'pollock_lbs', THRESHOLDS.egregious_lbs),
+    RatioRule('MRA_PCOD', 'Pacific Cod', 'pcod_lbs', THRESHOLDS.pcod_mra_pct),
+    RatioRule('MRA_OTHER', 'Other Species', 'other_lbs', THRESHOLDS.other_mra_pct),
+)
+
+
+@timed()
+def compute_trip_metrics(trips_df, rules=RULES):
+    """
+    One pass over the trip table: sort once, then add per-vessel sequence
+    numbers, rolling window sums/averages and species percentages
+
+    Returns:
+        DataFrame sorted by TRIP_ORDER with one row per trip; species
+        percentages are NaN for a trip with no catch
+    """
+    metrics = trips_df.sort_values(TRIP_ORDER, kind='stable').reset_index(drop=True)
+    by_vessel = metrics.groupby('vessel_id', sort=False)
+
+    metrics['trip_seq'] = by_vessel.cumcount()
+    metrics['trip_count'] = by_vessel['trip_id'].transform('size')
+    metrics['is_latest'] = metrics['trip_seq'] == metrics['trip_count'] - 1
+    metrics['total_catch'] = metrics[CATCH_COLUMNS].sum(axis=1)
+
+    for rule in rules:
+        if isinstance(rule, RollingWindowRule):
+            # Window sum = cumulative sum minus the cumulative sum `window` trips back
+            cumulative = by_vessel[rule.column].cumsum()
+            lagged = cumulative.groupby(metrics['vessel_id'], sort=False).shift(rule.window).fillna(0)
+            window_sum = (cumulative - lagged).where(metrics['trip_seq'] >= rule.window - 1)
+            metrics[f'{rule.rule_id}_sum'] = window_sum
+            metrics[f'{rule.rule_id}_avg'] = window_sum / rule.window
+        elif isinstance(rule, RatioRule):
+            total_catch = metrics['total_catch']
+            metrics[f'{rule.rule_id}_pct'] = metrics[rule.column] / total_catch.where(total_catch > 0) * 100
+
+    return metrics
+
+
+def window_trip_ids(metrics, window):
+    """Comma-joined trip ids of the `window` trips ending at each row"""
+    trip_ids = metrics['trip_id'].astype(str)
+    by_vessel = trip_ids.groupby(metrics['vessel_id'], sort=False)
+    parts = [by_vessel.shift(lag).fillna('') for lag in range(window - 1, 0, -1)] + [trip_ids]
+    joined = parts[0]
+    for part in parts[1:]:
+        joined = joined + ', ' + part
+    return joined.str.lstrip(', ')
+
+
+@timed()
+def evaluate_rules(metrics, rules=RULES):
+    """Evaluate every rule against the trip metrics; one row per finding"""
+    frames = []
+
+    for rule in rules:
+        if isinstance(rule, RollingWindowRule):
+            avg = metrics[f'{rule.rule_id}_avg']
+            floor = rule.warning if rule.warning is not None else rule.limit
+            hits = metrics[metrics['is_latest'] & (avg > floor)]
+            if hits.empty:
+                continue
+            value = hits[f'{rule.rule_id}_avg']
+            frames.append(pd.DataFrame({
+                'rule_id': rule.rule_id,
+                'rule': rule.label,
+                'severity': np.where(value > rule.limit, 'violation', 'warning'),
+                'vessel_id': hits['vessel_id'],
+                'vessel_name': hits['vessel_name'],
+                'trip_id': hits['trip_id'],
+                'delivery_date': hits['delivery_date'],
+                'value': value,
+                'limit': float(rule.limit),
+                'overage': value - rule.limit,
+                'unit': 'lbs',
+                'overage_lbs': (value - rule.limit).clip(lower=0),
+                'evidence': window_trip_ids(metrics, rule.window).loc[hits.index],
+            }))
+
+        elif isinstance(rule, TripThresholdRule):
+            hits = metrics[metrics[rule.column] > rule.limit]
+            if hits.empty:
+                continue
+            value = hits[rule.column].astype(float)
+            frames.append(pd.DataFrame({
+                'rule_id': rule.rule_id,
+                'rule': rule.label,
+                'severity': 'violation',
+                'vessel_id': hits['vessel_id'],
+                'vessel_name': hits['vessel_name'],
+                'trip_id': hits['trip_id'],
+                'delivery_date': hits['delivery_date'],
+                'value': value,
+                'limit': float(rule.limit),
+                'overage': value - rule.limit,
+                'unit': 'lbs',
+                'overage_lbs': value - rule.limit,
+                'evidence': hits[rule.column].map('{:,} lbs single trip'.format),
+            }))
+
+        elif isinstance(rule, RatioRule):
+            pct = metrics[f'{rule.rule_id}_pct']
+            hits = metrics[pct > rule.limit_pct]
+            if hits.empty:
+                continue
+            value = hits[f'{rule.rule_id}_pct']
+            allowed_lbs = (hits['total_catch'] * rule.limit_pct / 100).astype(int)
+            frames.append(pd.DataFrame({
+                'rule_id': rule.rule_id,
+                'rule': rule.label,
+                'severity': 'violation',
+                'vessel_id': hits['vessel_id'],
+                'vessel_name': hits['vessel_name'],
+                'trip_id': hits['trip_id'],
+                'delivery_date': hits['delivery_date'],
+                'value': value,
+                'limit': float(rule.limit_pct),
+                'overage': value - rule.limit_pct,
+                'unit': '%',
+                'overage_lbs': (hits[rule.column] - allowed_lbs).astype(float),
+                'evidence': hits[rule.column].map('{:,}'.format) + ' of ' + hits['total_catch'].map('{:,}'.format) + ' lbs',
+            }))
+
+    if not frames:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[VIOLATION_COLUMNS]
+
+
+def vessel_status(metrics, violations, vessels, rule=RULES[0]):
+    """
+    Current rolling-window status for every vessel, read from the metrics'
+    latest rows and the violations table
+
+    Returns:
+        DataFrame with vessel_id, vessel_name, status, color, avg, total_trips, trips_needed
+    """
+    latest = metrics[metrics['is_latest']].set_index('vessel_id')
+    status = pd.DataFrame(vessels)[['vessel_id', 'vessel_name']].set_index('vessel_id')
+
+    status['total_trips'] = latest['trip_count'].reindex(status.index).fillna(0).astype(int)
+    status['avg'] = latest[f'{rule.rule_id}_avg'].reindex(status.index)
+    status['trips_needed'] = (rule.window - status['total_trips']).clip(lower=0)
+
+    flagged = violations[violations['rule_id'] == rule.rule_id].set_index('vessel_id')['severity']
+    severity = flagged.reindex(status.index)
+    status['status'] = np.select(
+        [status['trips_needed'] > 0, severity == 'violation', severity == 'warning'],
+        ['INSUFFICIENT_DATA', 'VIOLATION', 'WARNING'],
+        default='COMPLIANT'
+    )
+    status['color'] = status['status'].map({
+        'INSUFFICIENT_DATA': 'gray', 'VIOLATION': 'red', 'WARNING': 'orange', 'COMPLIANT': 'green'
+    })
+    return status.reset_index()
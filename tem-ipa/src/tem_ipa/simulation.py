@@ -0,0 +1,175 @@
+"""
+Monte Carlo season-outcome simulator for the 4-trip rolling limit
+
+Each vessel's remaining A season is modelled from its own trip history: trip
+weights are drawn from a normal distribution fitted to its pollock deliveries
+and trips continue at its usual delivery interval until the season closes.
+`simulate_vessel` samples every future trip sequence at once as a
+(runs x trips) array and applies the rolling-window rule to all of them with
+a strided window sum, so a vessel's thousands of seasons are a handful of
+NumPy operations. `simulate_fleet` spreads the vessels over a process pool.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from dashboard_common.metrics import timed
+
+from tem_ipa.thresholds import THRESHOLDS
+
+A_SEASON_END = pd.Timestamp('2026-03-10')
+DEFAULT_RUNS = 5000
+
+# Delivery interval assumed for vessels with a single trip
+DEFAULT_GAP_DAYS = 3
+
+# Below this many sampled trips the fleet runs in-process; a pool only pays
+# for itself on large runs
+PARALLEL_MIN_SAMPLES = 2_000_000
+
+OUTLOOK_COLUMNS = [
+    'vessel_id', 'trips_remaining', 'p_violation', 'p_warning', 'p_any_violation',
+    'p_egregious', 'expected_overage_lbs', 'final_avg_p10', 'final_avg_p50', 'final_avg_p90'
+]
+
+
+@dataclass(frozen=True)
+class TripModel:
+    """Fitted trip distribution and season horizon for one vessel"""
+    vessel_id: str
+    history: tuple          # last `window` trip weights, oldest first
+    mean_lbs: float
+    std_lbs: float
+    trips_remaining: int
+
+
+def fit_vessel(vessel_trips, season_end=A_SEASON_END, thresholds=THRESHOLDS):
+    """
+    Fit a TripModel from one vessel's trips
+
+    The weight distribution is the mean/std of the vessel's pollock deliveries
+    (std floored at 2% of the mean so steady vessels still vary a little), and
+    the number of remaining trips is the days left in the season divided by
+    the vessel's median delivery interval.
+    """
+    trips = vessel_trips.sort_values('delivery_date')
+    weights = trips['pollock_lbs'].to_numpy(dtype=float)
+    dates = pd.to_datetime(trips['delivery_date'])
+
+    mean = weights.mean()
+    std = weights.std(ddof=1) if len(weights) > 1 else 0.0
+    std = max(std, 0.02 * mean)
+
+    gaps = dates.diff().dt.days.dropna()
+    gap = max(int(gaps.median()), 1) if len(gaps) else DEFAULT_GAP_DAYS
+    days_left = (season_end - dates.iloc[-1]).days
+
+    return TripModel(
+        vessel_id=trips['vessel_id'].iloc[0],
+        history=tuple(weights[-thresholds.window_trips:]),
+        mean_lbs=float(mean),
+        std_lbs=float(std),
+        trips_remaining=max(days_left // gap, 0)
+    )
+
+
+def simulate_vessel(model, runs=DEFAULT_RUNS, seed=None, thresholds=THRESHOLDS):
+    """
+    Sample `runs` rest-of-season trip sequences for one vessel
+
+    Returns:
+        dict with the vessel's probability of ending the season in violation
+        or warning, of any violating window or egregious trip along the way,
+        the expected final overage and final-average percentiles
+    """
+    window = thresholds.window_trips
+    rng = np.random.default_rng(seed)
+
+    future = rng.normal(model.mean_lbs, model.std_lbs, size=(runs, model.trips_remaining))
+    np.maximum(future, 0, out=future)
+    history = np.broadcast_to(np.asarray(model.history, dtype=float), (runs, len(model.history)))
+    sequences = np.concatenate([history, future], axis=1)
+
+    result = {'vessel_id': model.vessel_id, 'trips_remaining': model.trips_remaining}
+
+    if sequences.shape[1] < window:
+        # Not enough trips for a rolling average even by the end of the season
+        avgs = np.full((runs, 1), np.nan)
+    else:
+        # Every window ending on a future trip (or the current window if the
+        # season has no trips left), for every run at once
+        avgs = sliding_window_view(sequences, window, axis=1).sum(axis=2) / window
+        avgs = avgs[:, -max(min(model.trips_remaining, avgs.shape[1]), 1):]
+    final_avg = avgs[:, -1]
+
+    overage = np.nan_to_num(final_avg - thresholds.trip_limit_lbs, nan=0.0).clip(min=0)
+    finite = final_avg[~np.isnan(final_avg)]
+    p10, p50, p90 = np.percentile(finite, [10, 50, 90]) if len(finite) else (np.nan,) * 3
+
+    result.update({
+        'p_violation': float(np.mean(final_avg > thresholds.trip_limit_lbs)),
+        'p_warning': float(np.mean((final_avg > thresholds.warning_lbs) & (final_avg <= thresholds.trip_limit_lbs))),
+        'p_any_violation': float(np.mean((avgs > thresholds.trip_limit_lbs).any(axis=1))),
+        'p_egregious': float(np.mean((future > thresholds.egregious_lbs).any(axis=1))),
+        'expected_overage_lbs': float(overage.mean()),
+        'final_avg_p10': float(p10),
+        'final_avg_p50': float(p50),
+        'final_avg_p90': float(p90)
+    })
+    return result
+
+
+def _simulate_task(args):
+    model, runs, seed = args
+    return simulate_vessel(model, runs, seed)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(processes):
+    """Process pool shared by all sessions (spawned so Streamlit's threads are not forked)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=processes, mp_context=get_context('spawn'))
+        return _pool
+
+
+@timed()
+def simulate_fleet(trips_df, runs=DEFAULT_RUNS, seed=42, season_end=A_SEASON_END, processes=None):
+    """
+    Simulate every vessel's remaining season
+
+    Args:
+        trips_df: trip table (all vessels)
+        runs: simulated seasons per vessel
+        seed: base seed; each vessel gets an independent child stream
+        season_end: last delivery date of the season
+        processes: worker processes (default: CPU count for large runs,
+            in-process below PARALLEL_MIN_SAMPLES; 1 always runs in-process)
+
+    Returns:
+        DataFrame with one row per vessel (see OUTLOOK_COLUMNS)
+    """
+    models = [fit_vessel(trips, season_end) for _, trips in trips_df.groupby('vessel_id', sort=False)]
+    seeds = np.random.SeedSequence(seed).spawn(len(models))
+    tasks = [(model, runs, child) for model, child in zip(models, seeds)]
+
+    samples = runs * sum(model.trips_remaining for model in models)
+    if processes is None:
+        processes = (os.cpu_count() or 1) if samples >= PARALLEL_MIN_SAMPLES else 1
+    if processes == 1 or len(tasks) < 2:
+        results = [_simulate_task(task) for task in tasks]
+    else:
+        results = list(_get_pool(processes).map(_simulate_task, tasks))
+
+    return pd.DataFrame(results, columns=OUTLOOK_COLUMNS)
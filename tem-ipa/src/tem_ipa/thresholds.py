@@ -0,0 +1,76 @@
+"""
+Compliance thresholds for the 2026 A Season and a sorted index over trip
+pollock weights
+
+All limits live in THRESHOLDS so pages and calculations never repeat the
+literals. PollockIndex answers "all trips above X" (or between X and Y) with a
+binary search plus a slice instead of a scan over every trip.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    """Trip limit and MRA thresholds"""
+    trip_limit_lbs: int = 300000    # 4-trip rolling average limit
+    warning_lbs: int = 285000       # Within 15k of limit (5% buffer)
+    egregious_lbs: int = 335000     # Single-trip egregious threshold
+    window_trips: int = 4           # Trips in the rolling window
+    pcod_mra_pct: float = 20        # CFR Table 10 - Pacific Cod
+    other_mra_pct: float = 2        # CFR Table 10 - Other Species
+
+    def status_for_average(self, avg):
+        """Map a rolling average to (status, color)"""
+        if avg > self.trip_limit_lbs:
+            return 'VIOLATION', 'red'
+        elif avg > self.warning_lbs:
+            return 'WARNING', 'orange'
+        return 'COMPLIANT', 'green'
+
+
+THRESHOLDS = Thresholds()
+
+
+def format_k(lbs):
+    """300000 -> '300k' for labels"""
+    return f"{lbs / 1000:,.0f}k"
+
+
+class PollockIndex:
+    """Trips sorted by pollock_lbs for range queries on arbitrary thresholds"""
+
+    def __init__(self, trips_df):
+        weights = trips_df['pollock_lbs'].to_numpy()
+        order = np.argsort(weights, kind='stable')
+        self._weights = weights[order]
+        # Original index labels are kept so results can be put back in trip order
+        self._trips = trips_df.iloc[order]
+
+    def __len__(self):
+        return len(self._weights)
+
+    @property
+    def min_lbs(self):
+        return int(self._weights[0]) if len(self._weights) else 0
+
+    @property
+    def max_lbs(self):
+        return int(self._weights[-1]) if len(self._weights) else 0
+
+    def count_above(self, lbs):
+        """Number of trips with pollock strictly above lbs"""
+        return len(self._weights) - int(np.searchsorted(self._weights, lbs, side='right'))
+
+    def above(self, lbs):
+        """Trips with pollock strictly above lbs, in trip order"""
+        start = np.searchsorted(self._weights, lbs, side='right')
+        return self._trips.iloc[start:].sort_index()
+
+    def between(self, low, high):
+        """Trips with low <= pollock <= high, heaviest first"""
+        start = np.searchsorted(self._weights, low, side='left')
+        stop = np.searchsorted(self._weights, high, side='right')
+        return self._trips.iloc[start:stop].iloc[::-1]
@@ -0,0 +1,265 @@
+"""
+Trip store with fish ticket upserts and incremental recompute
+
+Amending a ticket only changes the amended vessel's rolling windows from
+that trip onward. `TripStore.upsert` locates the trip's position in the
+vessel's date-sorted history, recomputes just the windows that include it,
+patches the trip's MRA ratios, re-evaluates that vessel's rules and
+publishes a new data version with the patched metrics and violations
+carried over (so nothing is rebuilt from scratch). Trip anomalies are
+re-scored only for the vessels an amendment or import touches. Every change is
+recorded in an audit trail with before/after values.
+"""
+
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dashboard_common.metrics import timed
+from dashboard_common.snapshot import SnapshotStore
+
+from tem_ipa.anomalies import detect_anomalies
+from tem_ipa.rules import RULES, CATCH_COLUMNS, RollingWindowRule, RatioRule, compute_trip_metrics, evaluate_rules
+
+# Fields a fish ticket amendment may change
+AMENDABLE_FIELDS = ['delivery_date', 'pollock_lbs', 'pcod_lbs', 'other_lbs', 'season', 'fishing_year']
+
+# Trip IDs are assigned on import, so an uploaded delivery is recognized by
+# its vessel, date and catch
+DELIVERY_KEY = ['vessel_id', 'delivery_date', *CATCH_COLUMNS]
+
+
+def trip_metrics(snapshot):
+    """Per-trip rule metrics for a snapshot (built once per version)"""
+    return snapshot.derive('trip_metrics', lambda snap: compute_trip_metrics(snap['trips']))
+
+
+def violations(snapshot):
+    """Unified violations table for a snapshot (built once per version)"""
+    return snapshot.derive('violations', lambda snap: evaluate_rules(trip_metrics(snap)))
+
+
+def anomalies(snapshot):
+    """Trip anomalies for a snapshot (built once per version)"""
+    return snapshot.derive('anomalies', lambda snap: detect_anomalies(trip_metrics(snap)))
+
+
+def already_imported(trips, new_trips):
+    """Boolean array: which new_trips match a delivery in trips (DELIVERY_KEY)"""
+    existing = pd.MultiIndex.from_frame(trips[DELIVERY_KEY])
+    return pd.MultiIndex.from_frame(new_trips[DELIVERY_KEY]).isin(existing)
+
+
+def _replace_vessels(table, vessel_ids, fresh):
+    """Rows of table for other vessels, plus the fresh rows for vessel_ids"""
+    parts = [table[~table['vessel_id'].isin(vessel_ids)], fresh]
+    return pd.concat([part for part in parts if not part.empty] or parts[:1], ignore_index=True)
+
+
+def _rule_order(violations_df):
+    order = {rule.rule_id: i for i, rule in enumerate(RULES)}
+    return violations_df['rule_id'].map(order)
+
+
+class TripStore(SnapshotStore):
+    """SnapshotStore for the trip table, with append/upsert and an audit trail"""
+
+    def __init__(self, loader):
+        super().__init__(loader)
+        # Serializes read-modify-write updates; readers are never blocked
+        self._write_lock = threading.RLock()
+        self._audit = []
+
+    def next_trip_id(self, trips_df=None):
+        trips_df = self.latest()['trips'] if trips_df is None else trips_df
+        return f"T{int(trips_df['trip_id'].str[1:].astype(int).max()) + 1:03d}"
+
+    def append_trips(self, new_trips, changed_by=None):
+        """
+        Append fully-formed trip rows and publish. Rule metrics are rebuilt on
+        the next read; anomalies are re-scored for the imported vessels only.
+
+        Raises:
+            ValueError: a trip repeats one already in the store or in the batch
+                (checked under the write lock, so concurrent imports of the
+                same file cannot both land)
+        """
+        with self._write_lock:
+            snapshot = self.latest()
+            current = snapshot['trips']
+            duplicates = already_imported(current, new_trips) | new_trips.duplicated(DELIVERY_KEY).to_numpy()
+            if duplicates.any():
+                first = new_trips[duplicates].iloc[0]
+                raise ValueError(f"{int(duplicates.sum())} trips already imported "
+                                 f"(e.g. {first['vessel_id']} on {pd.Timestamp(first['delivery_date']):%Y-%m-%d})")
+            first = int(self.next_trip_id(current)[1:])
+            new_trips = new_trips.assign(
+                trip_id=[f'T{n:03d}' for n in range(first, first + len(new_trips))]
+            )
+            trips = pd.concat([current, new_trips], ignore_index=True)
+
+            vessel_ids = new_trips['vessel_id'].unique()
+            touched = compute_trip_metrics(trips[trips['vessel_id'].isin(vessel_ids)])
+            new_anomalies = _replace_vessels(anomalies(snapshot), vessel_ids, detect_anomalies(touched))
+
+            snapshot = self.publish({'trips': trips}, derived={'anomalies': new_anomalies})
+            for trip in new_trips.to_dict('records'):
+                self._record(snapshot.version, 'import', trip, None, trip, changed_by)
+            return snapshot
+
+    @timed()
+    def upsert(self, trip, changed_by=None):
+        """
+        Amend an existing trip (matched on trip_id) or insert a new one
+
+        Args:
+            trip: dict with vessel_id, vessel_name and trip fields; include
+                trip_id to amend, omit it to insert
+            changed_by: user recorded in the audit trail
+
+        Returns:
+            The newly published snapshot
+        """
+        with self._write_lock:
+            snapshot = self.latest()
+            trips = snapshot['trips']
+            metrics = trip_metrics(snapshot)
+            old_violations = violations(snapshot)
+            old_anomalies = anomalies(snapshot)
+
+            trip = dict(trip)
+            trip_id = trip.get('trip_id')
+            matches = np.flatnonzero((trips['trip_id'] == trip_id).to_numpy()) if trip_id else []
+
+            if len(matches):
+                row = matches[0]
+                before = trips.iloc[row].to_dict()
+                after = dict(before)
+                after.update({k: v for k, v in trip.items() if k in AMENDABLE_FIELDS})
+                after['delivery_date'] = pd.Timestamp(after['delivery_date'])
+                if all(before[f] == after[f] for f in AMENDABLE_FIELDS):
+                    return snapshot
+
+                new_trips = trips.copy()
+                for field in AMENDABLE_FIELDS:
+                    new_trips.loc[new_trips.index[row], field] = after[field]
+                action = 'amend'
+            else:
+                missing = [col for col in ('vessel_id', 'vessel_name', 'delivery_date') if col not in trip]
+                if missing:
+                    raise ValueError(f"New trip is missing: {', '.join(missing)}")
+                before = None
+                after = {col: trip.get(col, 0) for col in trips.columns}
+                after['trip_id'] = self.next_trip_id(trips)
+                after['delivery_date'] = pd.Timestamp(after['delivery_date'])
+                new_trips = pd.concat([trips, pd.DataFrame([after])], ignore_index=True)
+                action = 'insert'
+
+            new_metrics = self._patch_metrics(metrics, before, after)
+            vessel_id = after['vessel_id']
+            block = new_metrics[new_metrics['vessel_id'] == vessel_id]
+            new_violations = _replace_vessels(old_violations, [vessel_id], evaluate_rules(block))
+            new_violations = new_violations.iloc[np.argsort(_rule_order(new_violations).to_numpy(), kind='stable')]
+            new_violations = new_violations.reset_index(drop=True)
+
+            published = self.publish(
+                {'trips': new_trips},
+                derived={
+                    'trip_metrics': new_metrics,
+                    'violations': new_violations,
+                    'anomalies': _replace_vessels(old_anomalies, [vessel_id], detect_anomalies(block))
+                }
+            )
+            self._record(published.version, action, after, before, after, changed_by)
+            return published
+
+    def _patch_metrics(self, metrics, before, after, rules=RULES):
+        """Recompute only the amended vessel's windows that include the trip"""
+        vessel_ids = metrics['vessel_id'].to_numpy()
+        vessel_id = after['vessel_id']
+        start = int(np.searchsorted(vessel_ids, vessel_id, side='left'))
+        stop = int(np.searchsorted(vessel_ids, vessel_id, side='right'))
+        block = metrics.iloc[start:stop]
+
+        # Replace (or add) the trip's row and restore date order within the vessel
+        # Sequence and window columns are placeholders, recomputed below
+        trip_row = {col: after.get(col, 0) for col in metrics.columns}
+        total_catch = sum(int(after[col]) for col in CATCH_COLUMNS)
+        trip_row['total_catch'] = total_catch
+        for rule in rules:
+            if isinstance(rule, RatioRule):
+                # NaN for a trip with no catch, as in compute_trip_metrics
+                trip_row[f'{rule.rule_id}_pct'] = (
+                    int(after[rule.column]) / total_catch * 100 if total_catch > 0 else np.nan
+                )
+
+        if before is not None:
+            old_pos = int(np.flatnonzero((block['trip_id'] == before['trip_id']).to_numpy())[0])
+            block = block.drop(block.index[old_pos])
+        else:
+            old_pos = len(block)
+
+        # Same position compute_trip_metrics gives the trip (TRIP_ORDER):
+        # after earlier dates, then by trip_id among same-day deliveries
+        dates = block['delivery_date'].to_numpy()
+        date = np.datetime64(after['delivery_date'])
+        lo = int(np.searchsorted(dates, date, side='left'))
+        hi = int(np.searchsorted(dates, date, side='right'))
+        new_pos = lo + int(np.searchsorted(block['trip_id'].to_numpy()[lo:hi], after['trip_id']))
+        parts = [block.iloc[:new_pos], pd.DataFrame([trip_row], columns=metrics.columns), block.iloc[new_pos:]]
+        block = pd.concat([part for part in parts if not part.empty], ignore_index=True)
+
+        block['trip_seq'] = np.arange(len(block))
+        block['trip_count'] = len(block)
+        block['is_latest'] = block['trip_seq'] == len(block) - 1
+
+        # Windows ending before the first moved position are unchanged
+        first = min(old_pos, new_pos)
+        last_moved = max(old_pos, new_pos) if before is not None else len(block) - 1
+        for rule in rules:
+            if not isinstance(rule, RollingWindowRule):
+                continue
+            values = block[rule.column].to_numpy(dtype=float)
+            sums = block[f'{rule.rule_id}_sum'].to_numpy(dtype=float, copy=True)
+            hi = min(last_moved + rule.window - 1, len(block) - 1)
+            for pos in range(first, hi + 1):
+                sums[pos] = values[pos - rule.window + 1:pos + 1].sum() if pos >= rule.window - 1 else np.nan
+            block[f'{rule.rule_id}_sum'] = sums
+            block[f'{rule.rule_id}_avg'] = sums / rule.window
+
+        parts = [metrics.iloc[:start], block, metrics.iloc[stop:]]
+        patched = pd.concat([part for part in parts if not part.empty], ignore_index=True)
+        return patched.astype(metrics.dtypes.to_dict())
+
+    def _record(self, version, action, trip, before, after, changed_by):
+        """Append one audit row per changed field (one row for a new trip)"""
+        if before is None:
+            date = pd.Timestamp(after['delivery_date']).strftime('%Y-%m-%d')
+            changes = [('trip', None, f"{date}, {int(after['pollock_lbs']):,} lbs pollock")]
+        else:
+            changes = [(f, before[f], after[f]) for f in AMENDABLE_FIELDS if before[f] != after[f]]
+
+        timestamp = datetime.now()
+        for field, old_value, new_value in changes:
+            self._audit.append({
+                'timestamp': timestamp,
+                'version': version,
+                'action': action,
+                'trip_id': trip['trip_id'],
+                'vessel_id': trip['vessel_id'],
+                'field': field,
+                'before': old_value,
+                'after': new_value,
+                'changed_by': changed_by
+            })
+
+    def audit_log(self):
+        """All recorded changes, newest first"""
+        with self._write_lock:
+            log = pd.DataFrame(list(self._audit), columns=[
+                'timestamp', 'version', 'action', 'trip_id', 'vessel_id',
+                'field', 'before', 'after', 'changed_by'
+            ])
+        return log.iloc[::-1].reset_index(drop=True)
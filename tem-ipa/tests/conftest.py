@@ -0,0 +1,9 @@
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(__file__)
+
+# The tem_ipa package lives in src/ (it puts the repo root, for dashboard_common, on sys.path itself)
+SRC_DIR = os.path.abspath(os.path.join(TESTS_DIR, '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
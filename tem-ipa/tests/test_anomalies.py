@@ -0,0 +1,80 @@
+"""
+Vectorized anomaly scoring must match scoring each trip against its
+vessel's prior trips one at a time
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tem_ipa.anomalies import (ANOMALY_MIN_TRIPS, ANOMALY_THRESHOLD, ANOMALY_WINDOW, MAD_SCALE, SIGNALS,
+                               detect_anomalies)
+from tem_ipa.demo_data import generate_test_trips
+from tem_ipa.rules import compute_trip_metrics
+
+
+@pytest.fixture(scope='module')
+def metrics():
+    return compute_trip_metrics(generate_test_trips())
+
+
+def reference_anomalies(metrics, window=ANOMALY_WINDOW, min_trips=ANOMALY_MIN_TRIPS, threshold=ANOMALY_THRESHOLD):
+    """(trip_id, signal) -> (baseline, robust_z) of every anomaly, trip by trip"""
+    found = {}
+    for signal in SIGNALS:
+        for _, trips in metrics.groupby('vessel_id', sort=False):
+            values = trips[signal.column].astype(float).to_numpy()
+            for i, trip_id in enumerate(trips['trip_id']):
+                prior = values[max(0, i - window):i]
+                prior = prior[~np.isnan(prior)]
+                if len(prior) < min_trips:
+                    continue
+                baseline = np.median(prior)
+                mad = np.median(np.abs(prior - baseline))
+                floor = signal.min_spread * abs(baseline) if signal.relative else signal.min_spread
+                robust_z = (values[i] - baseline) / max(MAD_SCALE * mad, floor)
+                if abs(robust_z) > threshold:
+                    found[(trip_id, signal.column)] = (baseline, robust_z)
+    return found
+
+
+def assert_matches_reference(metrics, **kwargs):
+    anomalies = detect_anomalies(metrics, **kwargs)
+    expected = reference_anomalies(metrics, **kwargs)
+    assert set(zip(anomalies['trip_id'], anomalies['signal'])) == set(expected)
+    for row in anomalies.itertuples():
+        baseline, robust_z = expected[(row.trip_id, row.signal)]
+        assert row.baseline == pytest.approx(baseline)
+        assert row.robust_z == pytest.approx(robust_z)
+        assert row.direction == ('high' if robust_z > 0 else 'low')
+    return anomalies
+
+
+def test_matches_trip_by_trip_scoring(metrics):
+    assert_matches_reference(metrics)
+
+
+@pytest.mark.parametrize('window, min_trips, threshold', [(3, 3, 3.5), (10, 5, 2.0)])
+def test_matches_with_other_settings(metrics, window, min_trips, threshold):
+    assert_matches_reference(metrics, window=window, min_trips=min_trips, threshold=threshold)
+
+
+def test_spike_is_flagged_after_an_earlier_outlier(metrics):
+    vessel_id = metrics['vessel_id'].value_counts().index[0]
+    rows = metrics.index[metrics['vessel_id'] == vessel_id]
+    spiked = metrics.copy()
+    baseline = spiked.loc[rows[:8], 'pollock_lbs'].median()
+    # One earlier outlier in the window must not hide the next one (median / MAD baseline)
+    spiked.loc[rows[6], 'pollock_lbs'] = baseline * 1.5
+    spiked.loc[rows[8], 'pollock_lbs'] = baseline * 1.5
+
+    anomalies = assert_matches_reference(spiked)
+    flagged = anomalies[anomalies['signal'] == 'pollock_lbs']['trip_id']
+    assert set(metrics.loc[[rows[6], rows[8]], 'trip_id']) <= set(flagged)
+
+
+def test_no_history_gives_no_anomalies(metrics):
+    firsts = metrics.groupby('vessel_id', sort=False).head(ANOMALY_MIN_TRIPS)
+    anomalies = detect_anomalies(firsts)
+    assert anomalies.empty
+    assert list(anomalies.columns) == list(detect_anomalies(metrics).columns)
@@ -0,0 +1,59 @@
+"""
+The season simulator must give the same outlook in-process and in the pool,
+and its strided window sums must match rolling the trips one run at a time
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tem_ipa.demo_data import generate_test_trips
+from tem_ipa.simulation import TripModel, simulate_fleet, simulate_vessel
+from tem_ipa.thresholds import THRESHOLDS
+
+
+@pytest.fixture(scope='module')
+def trips():
+    return generate_test_trips()
+
+
+def test_pool_matches_in_process(trips):
+    serial = simulate_fleet(trips, runs=500, seed=33, processes=1)
+    pooled = simulate_fleet(trips, runs=500, seed=33, processes=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert len(serial) == trips['vessel_id'].nunique()
+
+
+def test_seed_fixes_the_outlook(trips):
+    first = simulate_fleet(trips, runs=500, seed=33, processes=1)
+    pd.testing.assert_frame_equal(first, simulate_fleet(trips, runs=500, seed=33, processes=1))
+    with pytest.raises(AssertionError):
+        pd.testing.assert_frame_equal(first, simulate_fleet(trips, runs=500, seed=34, processes=1))
+
+
+@pytest.mark.parametrize('history, trips_remaining', [
+    ((250_000, 310_000, 280_000, 300_000), 6),
+    ((290_000, 305_000), 1),
+    ((260_000, 300_000, 295_000, 310_000), 0),
+])
+def test_window_sums_match_rolling_each_run(history, trips_remaining):
+    model = TripModel('V-TEST', history, 295_000.0, 20_000.0, trips_remaining)
+    runs, window = 200, THRESHOLDS.window_trips
+    result = simulate_vessel(model, runs=runs, seed=5)
+
+    # The same draws, rolled one season at a time
+    future = np.maximum(np.random.default_rng(5).normal(model.mean_lbs, model.std_lbs, (runs, trips_remaining)), 0)
+    final_avgs, any_violation = [], []
+    for run in range(runs):
+        season = pd.Series([*history, *future[run]], dtype=float)
+        avgs = season.rolling(window).mean().to_numpy()[-max(trips_remaining, 1):]
+        final_avgs.append(avgs[-1])
+        any_violation.append((avgs > THRESHOLDS.trip_limit_lbs).any())
+    final_avgs = np.array(final_avgs)
+
+    assert result['p_violation'] == pytest.approx(np.mean(final_avgs > THRESHOLDS.trip_limit_lbs))
+    assert result['p_any_violation'] == pytest.approx(np.mean(any_violation))
+    # Seasons too short for a full window have no final average
+    finite = final_avgs[~np.isnan(final_avgs)]
+    expected_p50 = np.percentile(finite, 50) if len(finite) else np.nan
+    assert result['final_avg_p50'] == pytest.approx(expected_p50, nan_ok=True)
@@ -0,0 +1,50 @@
+"""
+PollockIndex range queries must match filtering the trip table directly
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tem_ipa.demo_data import generate_test_trips
+from tem_ipa.thresholds import THRESHOLDS, PollockIndex
+
+
+@pytest.fixture(scope='module')
+def trips():
+    return generate_test_trips()
+
+
+def cut_points(trips):
+    # Existing weights (ties and boundaries), the limits and values outside the range
+    weights = trips['pollock_lbs']
+    return [*weights.sample(5, random_state=30), THRESHOLDS.warning_lbs, THRESHOLDS.trip_limit_lbs,
+            THRESHOLDS.egregious_lbs, weights.min() - 1, weights.max(), weights.max() + 1]
+
+
+def test_above_matches_filter(trips):
+    index = PollockIndex(trips)
+    for lbs in cut_points(trips):
+        expected = trips[trips['pollock_lbs'] > lbs]
+        pd.testing.assert_frame_equal(index.above(lbs), expected)
+        assert index.count_above(lbs) == len(expected)
+
+
+def test_between_matches_filter(trips):
+    index = PollockIndex(trips)
+    points = cut_points(trips)
+    for low, high in zip(points, points[1:]):
+        low, high = min(low, high), max(low, high)
+        result = index.between(low, high)
+        expected = trips[trips['pollock_lbs'].between(low, high)]
+        assert sorted(result.index) == sorted(expected.index)
+        # Heaviest first
+        assert (np.diff(result['pollock_lbs'].to_numpy()) <= 0).all()
+
+
+def test_empty_index():
+    index = PollockIndex(generate_test_trips().iloc[:0])
+    assert len(index) == 0
+    assert index.min_lbs == index.max_lbs == 0
+    assert index.count_above(0) == 0
+    assert index.above(0).empty and index.between(0, 10**6).empty
@@ -0,0 +1,87 @@
+"""
+Incremental upserts must give the same metrics and violations as rebuilding
+them from the amended trip table
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tem_ipa.demo_data import generate_test_trips
+from tem_ipa.rules import compute_trip_metrics, evaluate_rules
+from tem_ipa.trip_store import TripStore, trip_metrics, violations
+
+
+@pytest.fixture
+def store():
+    return TripStore(lambda: {'trips': generate_test_trips()})
+
+
+def assert_matches_rebuild(snapshot):
+    rebuilt = compute_trip_metrics(snapshot['trips'])
+    pd.testing.assert_frame_equal(trip_metrics(snapshot), rebuilt)
+
+    def ordered(df):
+        return df.sort_values(['rule_id', 'trip_id'], ignore_index=True)
+    pd.testing.assert_frame_equal(ordered(violations(snapshot)), ordered(evaluate_rules(rebuilt)))
+
+
+def vessel_trips(store, vessel_id):
+    trips = store.latest()['trips']
+    return trips[trips['vessel_id'] == vessel_id].sort_values(['delivery_date', 'trip_id'])
+
+
+def busiest_vessel(store):
+    return store.latest()['trips']['vessel_id'].value_counts().index[0]
+
+
+def test_amend_to_later_trip_date(store):
+    trips = vessel_trips(store, busiest_vessel(store))
+    first, third = trips.iloc[0], trips.iloc[2]
+    snapshot = store.upsert({'trip_id': first['trip_id'], 'delivery_date': third['delivery_date'],
+                             'pollock_lbs': 320000})
+    assert_matches_rebuild(snapshot)
+
+
+def test_amend_to_earlier_trip_date(store):
+    trips = vessel_trips(store, busiest_vessel(store))
+    second, last = trips.iloc[1], trips.iloc[-1]
+    snapshot = store.upsert({'trip_id': last['trip_id'], 'delivery_date': second['delivery_date'],
+                             'pollock_lbs': 150000})
+    assert_matches_rebuild(snapshot)
+
+
+def test_insert_on_existing_trip_date(store):
+    trips = vessel_trips(store, busiest_vessel(store))
+    trip = trips.iloc[3].to_dict()
+    del trip['trip_id']
+    snapshot = store.upsert(dict(trip, pollock_lbs=340000))
+    assert_matches_rebuild(snapshot)
+
+
+def test_amend_to_zero_catch(store):
+    trip_id = store.latest()['trips']['trip_id'].iloc[0]
+    snapshot = store.upsert({'trip_id': trip_id, 'pollock_lbs': 0, 'pcod_lbs': 0, 'other_lbs': 0})
+    assert_matches_rebuild(snapshot)
+
+    metrics = trip_metrics(snapshot)
+    row = metrics[metrics['trip_id'] == trip_id].iloc[0]
+    assert row['total_catch'] == 0
+    assert np.isnan(row['MRA_PCOD_pct'])
+
+
+def test_random_amendments(store):
+    rng = np.random.default_rng(7)
+    trips = store.latest()['trips']
+    # Dates of existing trips, so amendments often land on the same day as another trip
+    dates = trips['delivery_date'].unique()
+    for _ in range(25):
+        trip_id = rng.choice(store.latest()['trips']['trip_id'].to_numpy())
+        snapshot = store.upsert({
+            'trip_id': trip_id,
+            'delivery_date': pd.Timestamp(rng.choice(dates)),
+            'pollock_lbs': int(rng.integers(0, 350_000)),
+            'pcod_lbs': int(rng.integers(0, 90_000)),
+            'other_lbs': int(rng.integers(0, 9_000))
+        })
+        assert_matches_rebuild(snapshot)